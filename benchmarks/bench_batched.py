@@ -0,0 +1,105 @@
+"""
+Benchmark of batched ask/tell execution against plain `study.optimize`.
+
+Runs the quadratic objective from `simple_tune` with both execution paths
+on fresh studies in the same storage and prints trials per second as JSON.
+
+Usage:
+    python benchmarks/bench_batched.py --n_trials 500 --batch_size 64
+    python benchmarks/bench_batched.py --storage_url postgresql+psycopg2://user:pw@host/db
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import optuna
+
+from docktuna.batched import run_batched
+from docktuna.simple_tune import objective
+
+
+def _new_study(storage_url: str, label: str) -> optuna.Study:
+    """Creates a uniquely named, seeded study for one benchmark run."""
+    return optuna.create_study(
+        study_name=f"bench_{label}_{uuid.uuid4().hex[:8]}",
+        storage=storage_url,
+        sampler=optuna.samplers.RandomSampler(seed=0),
+    )
+
+
+def _time(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_benchmark(
+    storage_url: str, n_trials: int, batch_size: int
+) -> dict[str, float]:
+    """
+    Times both execution paths for the same number of trials.
+
+    Args:
+        storage_url: SQLAlchemy URL of the storage to benchmark.
+        n_trials: Number of trials per execution path.
+        batch_size: Batch size for the batched runner.
+
+    Returns:
+        Elapsed seconds and trials per second for each path.
+    """
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    plain_study = _new_study(storage_url, "plain")
+    plain_elapsed = _time(
+        lambda: plain_study.optimize(func=objective, n_trials=n_trials)
+    )
+
+    batched_study = _new_study(storage_url, "batched")
+    batched_elapsed = _time(
+        lambda: run_batched(
+            study=batched_study,
+            objective=objective,
+            n_trials=n_trials,
+            batch_size=batch_size,
+        )
+    )
+
+    return {
+        "n_trials": n_trials,
+        "batch_size": batch_size,
+        "plain_seconds": plain_elapsed,
+        "plain_trials_per_second": n_trials / plain_elapsed,
+        "batched_seconds": batched_elapsed,
+        "batched_trials_per_second": n_trials / batched_elapsed,
+        "speedup": plain_elapsed / batched_elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare batched ask/tell with study.optimize."
+    )
+    parser.add_argument(
+        "--storage_url",
+        type=str,
+        default=None,
+        help="Storage URL (defaults to a temporary SQLite file)",
+    )
+    parser.add_argument("--n_trials", type=int, default=200)
+    parser.add_argument("--batch_size", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage_url = (
+            args.storage_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        )
+        results = run_benchmark(
+            storage_url=storage_url,
+            n_trials=args.n_trials,
+            batch_size=args.batch_size,
+        )
+    print(json.dumps(results, indent=2))
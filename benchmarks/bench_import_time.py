@@ -0,0 +1,63 @@
+"""
+Cold-start benchmark for docktuna entry points.
+
+Measures, in fresh interpreters, how long it takes to import each module and
+to print `gpu_tune.py --help`, and prints the median times as JSON.
+
+Usage:
+    python benchmarks/bench_import_time.py --repeats 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+GPU_TUNE_SCRIPT = (
+    Path(__file__).resolve().parents[1] / "src" / "docktuna" / "gpu_tune.py"
+)
+
+COMMANDS = {
+    "import docktuna.simple_tune": ["-c", "import docktuna.simple_tune"],
+    "import docktuna.gpu_tune": ["-c", "import docktuna.gpu_tune"],
+    "import docktuna.gpu_training": ["-c", "import docktuna.gpu_training"],
+    "import docktuna.optuna_db": [
+        "-c",
+        "import docktuna.optuna_db.optuna_db",
+    ],
+    "gpu_tune.py --help": [str(GPU_TUNE_SCRIPT), "--help"],
+}
+
+
+def time_command(args: list[str], repeats: int) -> float:
+    """
+    Runs a Python command in fresh interpreters and returns the median
+    wall time in seconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start time of docktuna entry points."
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = time_command(["-c", "pass"], args.repeats)
+    results = {"interpreter_startup": baseline}
+    for name, command in COMMANDS.items():
+        results[name] = time_command(command, args.repeats)
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,283 @@
+"""
+Benchmark suite for OptunaDatabase operations at scale.
+
+Seeds a storage with a configurable number of studies, trials per study and
+parameters per trial, then times the OptunaDatabase hot paths and trial
+throughput. Results are printed (or written) as JSON. Passing a previous
+result file with `--baseline` exits non-zero if any operation got slower
+than `--tolerance` times its baseline median.
+
+Runs against a temporary SQLite file by default. `--backend` selects a
+journal file or in-memory storage instead, and `--storage_url` any
+SQLAlchemy URL (e.g. a local Postgres).
+
+Usage:
+    python benchmarks/bench_optuna_db.py --n_studies 50 --n_trials 200 --n_params 5
+    python benchmarks/bench_optuna_db.py --backend journal
+    python benchmarks/bench_optuna_db.py --output results.json
+    python benchmarks/bench_optuna_db.py --baseline results.json --tolerance 1.5
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import optuna
+import sqlalchemy
+from optuna.distributions import FloatDistribution
+
+from docktuna.optuna_db.backends import (
+    InMemoryBackend,
+    JournalFileBackend,
+    RDBUrlBackend,
+    SQLiteBackend,
+    StorageBackend,
+)
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+STUDY_PREFIX = "bench_study_"
+
+
+def make_backend(
+    name: str, tmp_dir: Path, storage_url: str | None
+) -> StorageBackend:
+    """
+    Builds the storage backend to benchmark.
+
+    Args:
+        name: One of "sqlite", "journal" or "inmemory".
+        tmp_dir: Directory for file-based storages.
+        storage_url: SQLAlchemy URL that overrides `name` when given.
+
+    Returns:
+        The backend.
+    """
+    if storage_url is not None:
+        return RDBUrlBackend(url=storage_url)
+    if name == "journal":
+        return JournalFileBackend(path=tmp_dir / "bench.log")
+    if name == "inmemory":
+        return InMemoryBackend()
+    return SQLiteBackend(path=tmp_dir / "bench.db")
+
+
+def seed_storage(
+    optuna_db: OptunaDatabase, n_studies: int, n_trials: int, n_params: int
+):
+    """
+    Creates studies filled with completed trials, skipping studies that
+    already hold the requested number of trials.
+
+    Args:
+        optuna_db: The database to seed.
+        n_studies: Number of studies.
+        n_trials: Completed trials per study.
+        n_params: Float parameters per trial.
+    """
+    distributions = {
+        f"p{index}": FloatDistribution(-10, 10) for index in range(n_params)
+    }
+    for study_index in range(n_studies):
+        study = optuna_db.get_study(study_name=f"{STUDY_PREFIX}{study_index}")
+        missing = n_trials - len(study.get_trials(deepcopy=False))
+        if missing <= 0:
+            continue
+        rng = random.Random(study_index)
+        trials = []
+        for _ in range(missing):
+            params = {name: rng.uniform(-10, 10) for name in distributions}
+            trials.append(
+                optuna.trial.create_trial(
+                    params=params,
+                    distributions=distributions,
+                    value=sum(value**2 for value in params.values()),
+                )
+            )
+        study.add_trials(trials)
+
+
+def time_operation(func: Callable, repeats: int) -> dict[str, float]:
+    """
+    Runs an operation several times.
+
+    Args:
+        func: The operation.
+        repeats: Number of timed runs.
+
+    Returns:
+        Median, minimum and maximum wall time in seconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+    }
+
+
+def run_benchmarks(
+    optuna_db: OptunaDatabase, repeats: int, throughput_trials: int
+) -> dict[str, dict[str, float]]:
+    """
+    Times the OptunaDatabase hot paths on a seeded storage.
+
+    Args:
+        optuna_db: The seeded database.
+        repeats: Number of timed runs per operation.
+        throughput_trials: Trials run for the throughput measurement.
+
+    Returns:
+        Timing statistics per operation.
+    """
+    study_name = f"{STUDY_PREFIX}0"
+    operations = {
+        "study_summaries": lambda: optuna_db.study_summaries,
+        "is_in_db": lambda: optuna_db.is_in_db(study_name=study_name),
+        "get_best_params": lambda: optuna_db.get_best_params(
+            study_name=study_name
+        ),
+        "get_study_summary": lambda: optuna_db.get_study_summary(
+            study_name=study_name
+        ),
+        "list_study_names": optuna_db.list_study_names,
+        "num_existing_studies": lambda: optuna_db.num_existing_studies,
+        "get_all_studies": optuna_db.get_all_studies,
+        "get_latest_study": optuna_db.get_latest_study,
+    }
+    results = {
+        name: time_operation(func, repeats)
+        for name, func in operations.items()
+    }
+
+    throughput_study = optuna_db.get_study(study_name="bench_throughput")
+
+    def run_trials():
+        throughput_study.optimize(
+            lambda trial: (trial.suggest_float("x", -10, 10) - 2) ** 2,
+            n_trials=throughput_trials,
+        )
+
+    throughput = time_operation(run_trials, 1)
+    throughput["trials_per_second"] = throughput_trials / throughput["median"]
+    results["trial_throughput"] = throughput
+    return results
+
+
+def find_regressions(
+    results: dict, baseline: dict, tolerance: float
+) -> list[str]:
+    """
+    Compares operation medians with a baseline result.
+
+    Args:
+        results: The current benchmark output.
+        baseline: A previous benchmark output.
+        tolerance: Allowed slowdown factor.
+
+    Returns:
+        Descriptions of operations slower than allowed.
+    """
+    regressions = []
+    for name, timing in results["operations"].items():
+        base = baseline["operations"].get(name)
+        if base is not None and timing["median"] > base["median"] * tolerance:
+            regressions.append(
+                f"{name}: {timing['median']:.4f} s vs baseline "
+                f"{base['median']:.4f} s"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark OptunaDatabase operations at scale."
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["sqlite", "journal", "inmemory"],
+        default="sqlite",
+        help="Temporary storage to benchmark",
+    )
+    parser.add_argument(
+        "--storage_url",
+        type=str,
+        default=None,
+        help="SQLAlchemy URL to benchmark instead of a temporary storage",
+    )
+    parser.add_argument("--n_studies", type=int, default=20)
+    parser.add_argument("--n_trials", type=int, default=100)
+    parser.add_argument("--n_params", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--throughput_trials", type=int, default=50)
+    parser.add_argument("--output", type=str, default=None)
+    parser.add_argument("--baseline", type=str, default=None)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backend = make_backend(
+            name=args.backend,
+            tmp_dir=Path(tmp_dir),
+            storage_url=args.storage_url,
+        )
+        with OptunaDatabase(backend=backend) as optuna_db:
+            seed_start = time.perf_counter()
+            seed_storage(
+                optuna_db,
+                n_studies=args.n_studies,
+                n_trials=args.n_trials,
+                n_params=args.n_params,
+            )
+            seed_seconds = time.perf_counter() - seed_start
+            operations = run_benchmarks(
+                optuna_db,
+                repeats=args.repeats,
+                throughput_trials=args.throughput_trials,
+            )
+
+    results = {
+        "config": {
+            "backend": (
+                args.backend
+                if args.storage_url is None
+                else sqlalchemy.engine.make_url(
+                    args.storage_url
+                ).get_backend_name()
+            ),
+            "n_studies": args.n_studies,
+            "n_trials": args.n_trials,
+            "n_params": args.n_params,
+            "repeats": args.repeats,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "optuna": optuna.__version__,
+            "sqlalchemy": sqlalchemy.__version__,
+        },
+        "seed_seconds": seed_seconds,
+        "operations": operations,
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
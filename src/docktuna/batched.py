@@ -0,0 +1,276 @@
+"""
+Batched ask/tell execution for Optuna studies with RDB storage.
+
+`study.optimize` writes every trial to the database in several round trips
+(create trial, one write per suggested parameter, values, state). For cheap
+objectives those round trips dominate the wall time. `BatchedRunner` instead
+asks trials from an in-memory shadow of the study, evaluates a whole batch,
+and then writes the finished trials of the batch to the database in a
+single transaction that carries their parameters, values, intermediate
+values, attributes and final states. Trials written by other processes are
+read back incrementally, after a trial-id cursor.
+
+Objectives can also be vectorized: `BatchedRunner.optimize_vectorized`
+samples a batch of parameter sets from a fixed search space and passes them
+to the objective as one array per parameter. The objective returns an array
+(NumPy, torch, or anything with `tolist()`) holding one value per parameter
+set, and each value is recorded as an individual trial.
+
+Usage:
+    from docktuna.batched import run_batched
+    run_batched(study=study, objective=objective, n_trials=1000, batch_size=64)
+"""
+
+from typing import Callable, Sequence
+
+import numpy as np
+import optuna
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial, TrialState
+
+from docktuna.optuna_db.bulk import insert_trials, trials_since
+
+
+class BatchedRunner:
+    """
+    Runs trials of a study in batches, sampling against an in-memory copy of
+    the study and flushing finished trials to the study's storage.
+    """
+
+    def __init__(self, study: optuna.Study, batch_size: int = 16):
+        """
+        Initializes the runner.
+
+        Args:
+            study: The study whose storage receives the finished trials.
+            batch_size: Number of trials asked before results are flushed.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._study = study
+        self._batch_size = batch_size
+        self._study_id = study._study_id
+        self._shadow = optuna.create_study(
+            directions=study.directions,
+            sampler=study.sampler,
+            pruner=study.pruner,
+        )
+        self._flushed_trial_ids: set[int] = set()
+        self._sync_cursor = -1
+        self._unfinished_trial_ids: set[int] = set()
+
+    @property
+    def shadow_study(self) -> optuna.Study:
+        """Returns the in-memory study that trials are sampled from."""
+        return self._shadow
+
+    def _sync(self):
+        """
+        Copies finished trials written by other processes into the shadow
+        study so the sampler sees them. Only trials created since the last
+        sync and trials that were unfinished then are read.
+        """
+        for trial in trials_since(
+            self._study._storage,
+            self._study_id,
+            after_trial_id=self._sync_cursor,
+            trial_ids=self._unfinished_trial_ids,
+        ):
+            trial_id = trial._trial_id
+            self._sync_cursor = max(self._sync_cursor, trial_id)
+            if not trial.state.is_finished():
+                self._unfinished_trial_ids.add(trial_id)
+                continue
+            self._unfinished_trial_ids.discard(trial_id)
+            if trial_id not in self._flushed_trial_ids:
+                self._shadow.add_trial(trial)
+
+    def _flush(self, trials: Sequence[FrozenTrial]):
+        """
+        Writes finished shadow trials to the study's storage in one
+        transaction.
+
+        Args:
+            trials: Finished trials from the shadow study.
+        """
+        self._flushed_trial_ids.update(
+            insert_trials(self._study._storage, self._study_id, trials)
+        )
+
+    def _tell_batch(
+        self,
+        trials: Sequence[optuna.Trial],
+        evaluate: Callable[[], Sequence[float | Sequence[float]]],
+    ):
+        """
+        Evaluates a batch of asked trials and flushes the results.
+
+        Args:
+            trials: Trials asked from the shadow study.
+            evaluate: Function returning one result per trial. A result may
+                be a value, a sequence of values, or an exception instance
+                (TrialPruned marks the trial pruned, anything else fails it).
+
+        Raises:
+            Exception: The first objective error, after the batch has been
+                flushed.
+        """
+        try:
+            results = evaluate()
+        except Exception as e:
+            results = [e] * len(trials)
+        if len(results) != len(trials):
+            raise ValueError(
+                f"Expected {len(trials)} results, got {len(results)}."
+            )
+        error = None
+        finished = []
+        for trial, result in zip(trials, results):
+            if isinstance(result, optuna.TrialPruned):
+                finished.append(
+                    self._shadow.tell(trial, state=TrialState.PRUNED)
+                )
+            elif isinstance(result, Exception):
+                finished.append(
+                    self._shadow.tell(trial, state=TrialState.FAIL)
+                )
+                error = error or result
+            else:
+                finished.append(self._shadow.tell(trial, result))
+        self._flush(finished)
+        if error is not None:
+            raise error
+
+    def _run(
+        self,
+        n_trials: int,
+        ask: Callable[[], optuna.Trial],
+        evaluate: Callable[[list[optuna.Trial]], Sequence],
+    ) -> int:
+        """
+        Asks, evaluates and flushes batches until `n_trials` trials ran.
+
+        Args:
+            n_trials: Total number of trials to run.
+            ask: Function asking one trial from the shadow study.
+            evaluate: Function evaluating a batch of asked trials.
+
+        Returns:
+            The number of trials written to the study.
+        """
+        n_done = 0
+        while n_done < n_trials:
+            self._sync()
+            batch = [
+                ask() for _ in range(min(self._batch_size, n_trials - n_done))
+            ]
+            self._tell_batch(batch, lambda: evaluate(batch))
+            n_done += len(batch)
+        return n_done
+
+    def optimize(
+        self, objective: Callable[[optuna.Trial], float], n_trials: int
+    ) -> int:
+        """
+        Runs a per-trial objective in batches.
+
+        Args:
+            objective: The objective function, called once per trial.
+            n_trials: Total number of trials to run.
+
+        Returns:
+            The number of trials written to the study.
+        """
+
+        def evaluate(trials: list[optuna.Trial]) -> list:
+            results = []
+            for trial in trials:
+                try:
+                    results.append(objective(trial))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        return self._run(
+            n_trials=n_trials, ask=self._shadow.ask, evaluate=evaluate
+        )
+
+    def optimize_batch(
+        self,
+        batch_objective: Callable[[list[optuna.Trial]], Sequence[float]],
+        n_trials: int,
+    ) -> int:
+        """
+        Runs an objective that evaluates a whole batch of trials at once.
+
+        Args:
+            batch_objective: Function receiving a list of trials and
+                returning one value per trial.
+            n_trials: Total number of trials to run.
+
+        Returns:
+            The number of trials written to the study.
+        """
+        return self._run(
+            n_trials=n_trials, ask=self._shadow.ask, evaluate=batch_objective
+        )
+
+    def optimize_vectorized(
+        self,
+        batch_objective: Callable[[dict[str, np.ndarray]], Sequence[float]],
+        search_space: dict[str, BaseDistribution],
+        n_trials: int,
+    ) -> int:
+        """
+        Runs an objective that evaluates a batch of parameter sets in one
+        array operation.
+
+        Args:
+            batch_objective: Function receiving a dictionary that maps each
+                parameter name to an array with one entry per trial, and
+                returning an array of objective values (shape `(batch,)`, or
+                `(batch, n_objectives)` for multi-objective studies).
+            search_space: Distributions of all parameters.
+            n_trials: Total number of trials to run.
+
+        Returns:
+            The number of trials written to the study.
+        """
+
+        def ask() -> optuna.Trial:
+            return self._shadow.ask(fixed_distributions=search_space)
+
+        def evaluate(trials: list[optuna.Trial]) -> list:
+            params = {
+                name: np.asarray([trial.params[name] for trial in trials])
+                for name in search_space
+            }
+            values = batch_objective(params)
+            return (
+                values.tolist() if hasattr(values, "tolist") else list(values)
+            )
+
+        return self._run(n_trials=n_trials, ask=ask, evaluate=evaluate)
+
+
+def run_batched(
+    study: optuna.Study,
+    objective: Callable[[optuna.Trial], float],
+    n_trials: int,
+    batch_size: int = 16,
+) -> int:
+    """
+    Runs a per-trial objective on a study in batches.
+
+    Args:
+        study: The study to optimize.
+        objective: The objective function.
+        n_trials: Total number of trials to run.
+        batch_size: Number of trials asked before results are flushed.
+
+    Returns:
+        The number of trials written to the study.
+    """
+    return BatchedRunner(study=study, batch_size=batch_size).optimize(
+        objective=objective, n_trials=n_trials
+    )
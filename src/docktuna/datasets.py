@@ -0,0 +1,176 @@
+"""
+Shared datasets for tuning objectives.
+
+A `DatasetProvider` creates a synthetic dataset (or loads one from a
+memory-mapped `.npy` or `.pt` file) once per process, transfers it to the
+target device through pinned host memory, and hands out zero-copy views of
+that single device-resident copy to every trial.
+
+Dataset files hold one 2-D array of shape `(n_samples, input_size +
+output_size)`, with features in the leading columns and targets in the
+trailing columns. `save_synthetic_dataset` writes such a file in chunks so
+datasets larger than memory can be created.
+
+Usage:
+    provider = DatasetProvider(n_samples=1_000_000, device=torch.device("cuda"))
+    X, y = provider.get()
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import torch
+
+
+class DatasetProvider:
+    """
+    Builds a dataset lazily and serves views of one device-resident copy.
+    """
+
+    def __init__(
+        self,
+        n_samples: int = 1000,
+        input_size: int = 10,
+        output_size: int = 1,
+        path: Path | str | None = None,
+        device: torch.device | None = None,
+        seed: int = 42,
+    ):
+        """
+        Initializes the provider without allocating any data.
+
+        Args:
+            n_samples: Number of synthetic samples. Ignored if `path` is given.
+            input_size: Number of feature columns.
+            output_size: Number of target columns.
+            path: Optional `.npy` or `.pt` file to load instead of
+                generating synthetic data.
+            device: Device holding the dataset. Defaults to CPU.
+            seed: Seed for synthetic data generation.
+        """
+        self._n_samples = n_samples
+        self._input_size = input_size
+        self._output_size = output_size
+        self._path = None if path is None else Path(path)
+        self._device = device or torch.device("cpu")
+        self._seed = seed
+        self._data = None
+        self._lock = threading.Lock()
+
+    @property
+    def device(self) -> torch.device:
+        """Returns the device holding the dataset."""
+        return self._device
+
+    def _load_host(self) -> torch.Tensor:
+        """
+        Loads or generates the dataset in host memory. Files are memory
+        mapped, so only pages that are transferred are read from disk.
+
+        Returns:
+            A tensor of shape (n_samples, input_size + output_size).
+        """
+        n_columns = self._input_size + self._output_size
+        if self._path is None:
+            generator = torch.Generator().manual_seed(self._seed)
+            return torch.randn(self._n_samples, n_columns, generator=generator)
+        if self._path.suffix == ".npy":
+            data = torch.from_numpy(np.load(self._path, mmap_mode="c"))
+        elif self._path.suffix == ".pt":
+            data = torch.load(self._path, mmap=True, weights_only=True)
+        else:
+            raise ValueError(f"Unsupported dataset file {self._path}")
+        if data.ndim != 2 or data.shape[1] != n_columns:
+            raise ValueError(
+                f"Expected dataset of shape (n, {n_columns}), "
+                f"got {tuple(data.shape)}"
+            )
+        return data
+
+    def _build(self) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Transfers the host dataset to the device and splits it into
+        contiguous feature and target tensors.
+
+        Returns:
+            Device-resident feature and target tensors.
+        """
+        data = self._load_host().float()
+        if self._device.type == "cuda":
+            data = data.pin_memory().to(self._device, non_blocking=True)
+        else:
+            data = data.to(self._device)
+        X = data[:, : self._input_size].contiguous()
+        y = data[:, self._input_size :].contiguous()
+        return X, y
+
+    def get(
+        self, n_samples: int | None = None
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Returns views of the shared dataset, building it on first use.
+
+        Args:
+            n_samples: Optional number of leading samples to return.
+
+        Returns:
+            Feature and target tensors. These are views, so trials must not
+            modify them in place.
+        """
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._build()
+                data = self._data
+        X, y = data
+        if n_samples is not None:
+            return X[:n_samples], y[:n_samples]
+        return X, y
+
+    def release(self):
+        """Drops the device-resident dataset."""
+        with self._lock:
+            self._data = None
+
+
+def save_synthetic_dataset(
+    path: Path | str,
+    n_samples: int,
+    input_size: int = 10,
+    output_size: int = 1,
+    seed: int = 42,
+    chunk_size: int = 1_000_000,
+) -> Path:
+    """
+    Writes a synthetic dataset to a `.npy` file in chunks, so datasets
+    larger than memory can be created.
+
+    Args:
+        path: Destination `.npy` file.
+        n_samples: Number of samples.
+        input_size: Number of feature columns.
+        output_size: Number of target columns.
+        seed: Seed for the random generator.
+        chunk_size: Number of rows generated at a time.
+
+    Returns:
+        The path of the written file.
+    """
+    path = Path(path)
+    rng = np.random.default_rng(seed)
+    data = np.lib.format.open_memmap(
+        path,
+        mode="w+",
+        dtype=np.float32,
+        shape=(n_samples, input_size + output_size),
+    )
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        data[start:stop] = rng.standard_normal(
+            (stop - start, input_size + output_size), dtype=np.float32
+        )
+    data.flush()
+    del data
+    return path
@@ -0,0 +1,424 @@
+"""
+Model, data and objective functions for the GPU tuning example.
+
+Importing this module loads torch but does not probe CUDA. The device is
+detected, and the random seed set, on the first call to `get_device()` (or
+first access of `device`). The command-line entry point is
+`docktuna.gpu_tune`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import optuna
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from optuna.distributions import (
+    CategoricalDistribution,
+    FloatDistribution,
+    IntDistribution,
+)
+from optuna.pruners import BasePruner, HyperbandPruner, MedianPruner, NopPruner
+from torch.utils.data import (
+    BatchSampler,
+    DataLoader,
+    RandomSampler,
+    TensorDataset,
+)
+
+from docktuna.datasets import DatasetProvider
+
+_device = None
+_device_lock = threading.Lock()
+
+
+# Ensure reproducibility
+def set_seed(seed: int = 42):
+    torch.manual_seed(seed)
+    if torch.cuda.is_available():
+        torch.cuda.manual_seed_all(seed)
+
+
+def get_device() -> torch.device:
+    """Detects the device (CUDA if available, else CPU) and seeds torch on first call."""
+    global _device
+    if _device is None:
+        with _device_lock:
+            if _device is None:
+                device = torch.device(
+                    "cuda" if torch.cuda.is_available() else "cpu"
+                )
+                print(f"Using device: {device}")
+                set_seed()
+                _device = device
+    return _device
+
+
+def __getattr__(name: str):
+    """Resolves the module-level `device` lazily."""
+    if name == "device":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+SEARCH_SPACE = {
+    "hidden_size": IntDistribution(8, 128),
+    "optimizer": CategoricalDistribution(["Adam", "SGD"]),
+    "lr": FloatDistribution(1e-5, 1e-1, log=True),
+}
+
+
+class SimpleNet(nn.Module):
+    """A simple neural network with one hidden layer."""
+
+    def __init__(self, input_size: int, hidden_size: int, output_size: int):
+        super(SimpleNet, self).__init__()
+        self.fc1 = nn.Linear(input_size, hidden_size)
+        self.relu = nn.ReLU()
+        self.fc2 = nn.Linear(hidden_size, output_size)
+
+    def forward(self, x):
+        x = self.fc1(x)
+        x = self.relu(x)
+        x = self.fc2(x)
+        return x
+
+
+class StackedSimpleNet(nn.Module):
+    """
+    Several SimpleNets with different hidden sizes, stacked along a leading
+    model dimension and evaluated with batched matmul. Hidden units beyond a
+    model's own hidden size are masked out, so each slice trains exactly like
+    a SimpleNet of that size.
+    """
+
+    def __init__(
+        self, input_size: int, hidden_sizes: list[int], output_size: int
+    ):
+        super(StackedSimpleNet, self).__init__()
+        n_models = len(hidden_sizes)
+        max_hidden = max(hidden_sizes)
+        hidden = torch.tensor(hidden_sizes, dtype=torch.float32)
+
+        # Same uniform(-1/sqrt(fan_in), 1/sqrt(fan_in)) init as nn.Linear
+        bound1 = 1 / input_size**0.5
+        bound2 = (1 / hidden.sqrt()).view(n_models, 1, 1)
+        self.w1 = nn.Parameter(
+            torch.empty(n_models, input_size, max_hidden).uniform_(
+                -bound1, bound1
+            )
+        )
+        self.b1 = nn.Parameter(
+            torch.empty(n_models, 1, max_hidden).uniform_(-bound1, bound1)
+        )
+        self.w2 = nn.Parameter(
+            (torch.rand(n_models, max_hidden, output_size) * 2 - 1) * bound2
+        )
+        self.b2 = nn.Parameter(
+            (torch.rand(n_models, 1, output_size) * 2 - 1) * bound2
+        )
+        self.register_buffer(
+            "hidden_mask",
+            (torch.arange(max_hidden) < hidden.view(-1, 1))
+            .float()
+            .unsqueeze(1),
+        )
+
+    def forward(self, x):
+        """Maps inputs of shape (n, input) to outputs of shape (models, n, output)."""
+        hidden = (
+            torch.relu(torch.matmul(x, self.w1) + self.b1) * self.hidden_mask
+        )
+        return torch.bmm(hidden, self.w2) + self.b2
+
+
+def generate_synthetic_data(n_samples: int = 1000, input_size: int = 10):
+    """Generates synthetic dataset."""
+    device = get_device()
+    X = torch.randn(
+        n_samples, input_size, device=device
+    )  # Place on correct device
+    y = torch.randn(n_samples, 1, device=device)
+    return X, y
+
+
+_dataset_config = {"n_samples": 1000, "path": None}
+_dataset_provider = None
+_dataset_lock = threading.Lock()
+
+
+def configure_dataset(n_samples: int = None, path: str = None):
+    """
+    Sets the dataset used by objectives in this process. Worker processes
+    call it again on start (see `run_parallel`'s `initializer`).
+    """
+    global _dataset_provider
+    with _dataset_lock:
+        _dataset_config["n_samples"] = 1000 if n_samples is None else n_samples
+        _dataset_config["path"] = path
+        _dataset_provider = None
+
+
+def get_dataset() -> tuple[torch.Tensor, torch.Tensor]:
+    """Returns views of this process's device-resident dataset, built once."""
+    global _dataset_provider
+    provider = _dataset_provider
+    if provider is None:
+        with _dataset_lock:
+            if _dataset_provider is None:
+                _dataset_provider = DatasetProvider(
+                    n_samples=_dataset_config["n_samples"],
+                    input_size=10,
+                    output_size=1,
+                    path=_dataset_config["path"],
+                    device=get_device(),
+                )
+            provider = _dataset_provider
+    return provider.get()
+
+
+PRECISIONS = ("fp32", "bf16", "fp16", "auto")
+
+# Compiled models keyed by architecture and device, reused across trials
+_compiled_models: OrderedDict[tuple, nn.Module] = OrderedDict()
+MAX_COMPILED_MODELS = 16
+
+
+def resolve_autocast_dtype(
+    precision: str, device: torch.device
+) -> torch.dtype | None:
+    """
+    Maps a precision setting to the autocast dtype supported on the device.
+
+    CPU autocast uses bf16 for any reduced precision. On CUDA, bf16 falls
+    back to fp16 when the GPU lacks bf16 support; auto prefers bf16.
+    Returns None for fp32.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision}")
+    if precision == "fp32":
+        return None
+    if device.type != "cuda":
+        return torch.bfloat16
+    if precision == "fp16" or not torch.cuda.is_bf16_supported():
+        return torch.float16
+    return torch.bfloat16
+
+
+def configure_threads(num_threads: int = None):
+    """Limits the CPU threads torch uses in this process."""
+    if num_threads is not None and torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def build_model(
+    input_size: int,
+    hidden_size: int,
+    output_size: int,
+    compile_model: bool = False,
+) -> tuple[nn.Module, bool]:
+    """
+    Returns a freshly initialized SimpleNet on the device, and whether a
+    cached compiled graph is reused.
+
+    With `compile_model`, one compiled model is kept per architecture. Later
+    trials with the same architecture re-initialize its parameters in place
+    instead of compiling again.
+    """
+    device = get_device()
+    if not compile_model:
+        return (
+            SimpleNet(input_size, hidden_size, output_size).to(device),
+            False,
+        )
+
+    key = (input_size, hidden_size, output_size, str(device))
+    compiled = _compiled_models.get(key)
+    if compiled is None:
+        model = SimpleNet(input_size, hidden_size, output_size).to(device)
+        _compiled_models[key] = torch.compile(model)
+        while len(_compiled_models) > MAX_COMPILED_MODELS:
+            _compiled_models.popitem(last=False)
+        return _compiled_models[key], False
+
+    _compiled_models.move_to_end(key)
+    for layer in compiled._orig_mod.modules():
+        if hasattr(layer, "reset_parameters"):
+            layer.reset_parameters()
+    return compiled, True
+
+
+def make_loader(
+    X: torch.Tensor, y: torch.Tensor, minibatch_size: int
+) -> DataLoader:
+    """Builds a shuffling DataLoader that slices whole mini-batches from X and y."""
+    dataset = TensorDataset(X, y)
+    sampler = BatchSampler(
+        RandomSampler(dataset), batch_size=minibatch_size, drop_last=False
+    )
+    # batch_size=None: the sampler yields index lists, so each mini-batch is
+    # one indexing operation instead of a per-sample collate.
+    return DataLoader(dataset, sampler=sampler, batch_size=None)
+
+
+def objective(
+    trial: optuna.Trial,
+    epochs: int = 20,
+    minibatch_size: int = None,
+    report: bool = False,
+    precision: str = "fp32",
+    compile_model: bool = False,
+    num_threads: int = None,
+) -> float:
+    """
+    Defines the Optuna objective function for tuning.
+
+    Trains full-batch by default. With `minibatch_size`, each epoch iterates
+    over shuffled mini-batches. With `report`, the mean epoch loss is
+    reported after every epoch and the trial stops early if the study's
+    pruner says so. `precision` enables automatic mixed precision,
+    `compile_model` runs the model through torch.compile, and `num_threads`
+    limits torch's CPU threads. The training mode and timings are stored in
+    the trial's `timing` user attribute.
+    """
+    configure_threads(num_threads)
+    input_size = 10
+    output_size = 1
+    hidden_size = trial.suggest_int("hidden_size", 8, 128)
+
+    device = get_device()
+    model, compile_cache_hit = build_model(
+        input_size, hidden_size, output_size, compile_model=compile_model
+    )
+    autocast_dtype = resolve_autocast_dtype(precision, device)
+    scaler = torch.amp.GradScaler(
+        device.type, enabled=autocast_dtype == torch.float16
+    )
+
+    optimizer_name = trial.suggest_categorical("optimizer", ["Adam", "SGD"])
+    lr = trial.suggest_loguniform("lr", 1e-5, 1e-1)
+    optimizer = getattr(optim, optimizer_name)(model.parameters(), lr=lr)
+
+    loss_fn = nn.MSELoss()
+    X, y = get_dataset()
+    batches = (
+        [(X, y)]
+        if minibatch_size is None
+        else make_loader(X, y, minibatch_size)
+    )
+
+    start_time = time.perf_counter()
+    first_epoch_seconds = None
+    for epoch in range(epochs):
+        epoch_loss = 0.0
+        n_batches = 0
+        for X_batch, y_batch in batches:
+            optimizer.zero_grad()
+            with torch.autocast(
+                device_type=device.type,
+                dtype=autocast_dtype,
+                enabled=autocast_dtype is not None,
+            ):
+                predictions = model(X_batch)
+                loss = loss_fn(predictions.float(), y_batch)
+            scaler.scale(loss).backward()
+            scaler.step(optimizer)
+            scaler.update()
+            epoch_loss += loss.item()
+            n_batches += 1
+        if first_epoch_seconds is None:
+            # loss.item() has synchronized the device
+            first_epoch_seconds = time.perf_counter() - start_time
+
+        if report:
+            trial.report(epoch_loss / n_batches, step=epoch)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
+    train_seconds = time.perf_counter() - start_time
+    trial.set_user_attr(
+        "timing",
+        {
+            "precision": str(autocast_dtype or torch.float32),
+            "compiled": compile_model,
+            "compile_cache_hit": compile_cache_hit,
+            "num_threads": torch.get_num_threads(),
+            "first_epoch_seconds": first_epoch_seconds,
+            "train_seconds": train_seconds,
+            "seconds_per_epoch": train_seconds / epochs,
+        },
+    )
+
+    return loss.item() if minibatch_size is None else epoch_loss / n_batches
+
+
+def make_pruner(name: str, epochs: int = 20) -> BasePruner:
+    """Returns the pruner selected by name: none, median or hyperband."""
+    if name == "none":
+        return NopPruner()
+    if name == "median":
+        return MedianPruner(n_startup_trials=5, n_warmup_steps=epochs // 4)
+    if name == "hyperband":
+        return HyperbandPruner(min_resource=1, max_resource=epochs)
+    raise ValueError(f"Unknown pruner {name}")
+
+
+def batch_objective(
+    params: dict[str, np.ndarray],
+    epochs: int = 20,
+    minibatch_size: int = None,
+    num_threads: int = None,
+) -> torch.Tensor:
+    """
+    Vectorized objective that trains one SimpleNet per parameter set in a
+    single StackedSimpleNet. Adam and SGD updates are applied per model with
+    each model's own learning rate. Training is full-batch by default; with
+    `minibatch_size`, all models see the same shuffled mini-batches and the
+    mean epoch loss is returned, as in `objective`.
+    """
+    configure_threads(num_threads)
+    hidden_sizes = [int(hidden_size) for hidden_size in params["hidden_size"]]
+    device = get_device()
+    model = StackedSimpleNet(10, hidden_sizes, 1).to(device)
+    lr = torch.as_tensor(params["lr"], dtype=torch.float32, device=device)
+    lr = lr.view(-1, 1, 1)
+    use_adam = torch.as_tensor(params["optimizer"] == "Adam", device=device)
+    use_adam = use_adam.view(-1, 1, 1)
+
+    beta1, beta2, eps = 0.9, 0.999, 1e-8  # torch.optim.Adam defaults
+    moments = [
+        (torch.zeros_like(p), torch.zeros_like(p)) for p in model.parameters()
+    ]
+    X, y = get_dataset()
+    batches = (
+        [(X, y)]
+        if minibatch_size is None
+        else make_loader(X, y, minibatch_size)
+    )
+
+    step = 0
+    for _ in range(epochs):
+        epoch_losses = torch.zeros(len(hidden_sizes), device=device)
+        n_batches = 0
+        for X_batch, y_batch in batches:
+            step += 1
+            model.zero_grad()
+            losses = ((model(X_batch) - y_batch) ** 2).mean(dim=(1, 2))
+            losses.sum().backward()
+            with torch.no_grad():
+                for p, (m, v) in zip(model.parameters(), moments):
+                    m.mul_(beta1).add_(p.grad, alpha=1 - beta1)
+                    v.mul_(beta2).addcmul_(p.grad, p.grad, value=1 - beta2)
+                    adam_update = (m / (1 - beta1**step)) / (
+                        (v / (1 - beta2**step)).sqrt() + eps
+                    )
+                    p.sub_(lr * torch.where(use_adam, adam_update, p.grad))
+            epoch_losses += losses.detach()
+            n_batches += 1
+
+    if minibatch_size is None:
+        return losses.detach().cpu()
+    return (epoch_losses / n_batches).cpu()
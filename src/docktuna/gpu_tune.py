@@ -4,107 +4,403 @@ GPU-accelerated hyperparameter tuning with Optuna.
 This script optimizes a simple PyTorch model using RDB storage in Optuna.
 If an NVIDIA GPU is available, computations run on CUDA; otherwise, the script falls back to CPU.
 
+Heavy dependencies (torch, optuna and the database layer) are imported only
+once tuning starts, so `--help` and argument errors return immediately. The
+model, data and objective code lives in `docktuna.gpu_training`; its public
+names are also available as attributes of this module.
+
 Usage:
     python gpu_tune.py --study_name my_study --n_trials 10
+    python gpu_tune.py --study_name my_study --n_trials 100 --workers 4
+    python gpu_tune.py --study_name my_study --n_trials 100 --batch_size 16
+    python gpu_tune.py --study_name my_study --dataset_size 1000000
+    python gpu_tune.py --study_name my_study --dataset_path data.npy
+    python gpu_tune.py --study_name my_study --minibatch_size 256 --pruner median
+    python gpu_tune.py --study_name my_study --precision bf16 --compile --num_threads 4
+    python gpu_tune.py --study_name my_study --n_trials 100 --metrics_port 8000
+    python gpu_tune.py --study_name my_study --heartbeat_interval 60 --max_retry 2 --reap_stale
+    python gpu_tune.py --study_name my_study --reap_stale --max_runtime 7200
+    python gpu_tune.py --study_name new_study --warm_start_from my_study --warm_start_k 5
+    python gpu_tune.py --study_name my_study --n_trials 100 --concurrency 4
 """
 
 import argparse
+import json
 import logging
 import sys
-import torch
-import torch.nn as nn
-import torch.optim as optim
-import optuna
-from optuna.study import StudyDirection
-from docktuna.optuna_db.db_instance import get_optuna_db
-
-
-# Detect GPU availability and set device
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-print(f"Using device: {device}")
-
-# Ensure reproducibility
-def set_seed(seed: int = 42):
-    torch.manual_seed(seed)
-    if torch.cuda.is_available():
-        torch.cuda.manual_seed_all(seed)
-
-
-set_seed()
-
-
-class SimpleNet(nn.Module):
-    """A simple neural network with one hidden layer."""
-
-    def __init__(self, input_size: int, hidden_size: int, output_size: int):
-        super(SimpleNet, self).__init__()
-        self.fc1 = nn.Linear(input_size, hidden_size)
-        self.relu = nn.ReLU()
-        self.fc2 = nn.Linear(hidden_size, output_size)
-
-    def forward(self, x):
-        x = self.fc1(x)
-        x = self.relu(x)
-        x = self.fc2(x)
-        return x
-
-
-def generate_synthetic_data(n_samples: int = 1000, input_size: int = 10):
-    """Generates synthetic dataset."""
-    X = torch.randn(n_samples, input_size, device=device)  # Place on correct device
-    y = torch.randn(n_samples, 1, device=device)
-    return X, y
-
+from functools import partial
 
-def objective(trial: optuna.Trial) -> float:
-    """Defines the Optuna objective function for tuning."""
-    input_size = 10
-    output_size = 1
-    hidden_size = trial.suggest_int("hidden_size", 8, 128)
+_TRAINING_NAMES = {
+    "SEARCH_SPACE",
+    "SimpleNet",
+    "StackedSimpleNet",
+    "batch_objective",
+    "build_model",
+    "configure_dataset",
+    "configure_threads",
+    "device",
+    "generate_synthetic_data",
+    "get_dataset",
+    "get_device",
+    "make_loader",
+    "make_pruner",
+    "objective",
+    "resolve_autocast_dtype",
+    "set_seed",
+}
 
-    model = SimpleNet(input_size, hidden_size, output_size).to(device)
 
-    optimizer_name = trial.suggest_categorical("optimizer", ["Adam", "SGD"])
-    lr = trial.suggest_loguniform("lr", 1e-5, 1e-1)
-    optimizer = getattr(optim, optimizer_name)(model.parameters(), lr=lr)
+def __getattr__(name: str):
+    """Forwards model and training names to docktuna.gpu_training on first access."""
+    if name in _TRAINING_NAMES:
+        from docktuna import gpu_training
 
-    loss_fn = nn.MSELoss()
-    X, y = generate_synthetic_data()
+        return getattr(gpu_training, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    for epoch in range(20):
-        optimizer.zero_grad()
-        predictions = model(X)
-        loss = loss_fn(predictions, y)
-        loss.backward()
-        optimizer.step()
 
-    return loss.item()
+def get_study(study_name: str, pruner=None, optuna_db=None, sampler=None):
+    """Retrieves or creates an Optuna study using RDB storage (the shared
+    default database unless `optuna_db` is given)."""
+    import optuna
+    from optuna.study import StudyDirection
 
+    from docktuna.optuna_db.db_instance import get_optuna_db
 
-def get_study(study_name: str) -> optuna.Study:
-    """Retrieves or creates an Optuna study using RDB storage."""
-    optuna_db = get_optuna_db()
+    optuna_db = optuna_db or get_optuna_db()
     return optuna.create_study(
         study_name=study_name,
         storage=optuna_db.storage,
         load_if_exists=True,
         direction=StudyDirection.MINIMIZE,
+        pruner=pruner,
+        sampler=sampler,
     )
 
 
-def main(study_name: str = "gpu_study", n_trials: int = 10):
+def main(
+    study_name: str = "gpu_study",
+    n_trials: int = 10,
+    workers: int = 1,
+    timeout: float = None,
+    batch_size: int = None,
+    dataset_size: int = None,
+    dataset_path: str = None,
+    epochs: int = 20,
+    minibatch_size: int = None,
+    pruner: str = "none",
+    precision: str = "fp32",
+    compile_model: bool = False,
+    num_threads: int = None,
+    instrument: bool = False,
+    metrics_port: int = None,
+    heartbeat_interval: int = None,
+    max_retry: int = None,
+    reap_stale: bool = False,
+    max_runtime: float = None,
+    warm_start_from: list[str] = None,
+    warm_start_k: int = 10,
+    concurrency: int = 1,
+    seed: int = None,
+):
     """Runs an Optuna study with GPU support (or CPU fallback)."""
+    if batch_size and (workers > 1 or timeout is not None):
+        raise ValueError(
+            "batch_size cannot be combined with workers or timeout"
+        )
+    if batch_size and (
+        pruner != "none" or precision != "fp32" or compile_model or instrument
+    ):
+        raise ValueError(
+            "batch_size cannot be combined with pruner, precision, "
+            "compile_model or instrument"
+        )
+    if concurrency > 1 and (workers > 1 or batch_size or compile_model):
+        raise ValueError(
+            "concurrency cannot be combined with workers, batch_size or "
+            "compile_model"
+        )
+
+    import optuna
+
+    from docktuna import gpu_training
+    from docktuna.batched import BatchedRunner
+    from docktuna.metrics_server import start_metrics_server
+    from docktuna.optuna_db.db_instance import get_optuna_db
+    from docktuna.optuna_db.instrumentation import InstrumentedObjective
+    from docktuna.packed import run_packed
+    from docktuna.parallel import run_parallel
+    from docktuna.warm_start import warm_start
+
+    # Passed to the workers too
+    db_settings = {}
+    if instrument:
+        db_settings["instrument"] = True
+    if heartbeat_interval is not None:
+        db_settings["heartbeat_interval"] = heartbeat_interval
+    if max_retry is not None:
+        db_settings["max_retry"] = max_retry
+    optuna_db = get_optuna_db(**db_settings)
+
+    gpu_training.configure_dataset(n_samples=dataset_size, path=dataset_path)
+
     # Configure logging
     optuna_logger = optuna.logging.get_logger("optuna")
     optuna_logger.addHandler(logging.StreamHandler(sys.stdout))
 
-    study = get_study(study_name)
-    study.optimize(func=objective, n_trials=n_trials)
+    study_pruner = gpu_training.make_pruner(pruner, epochs=epochs)
+    trial_objective = partial(
+        gpu_training.objective,
+        epochs=epochs,
+        minibatch_size=minibatch_size,
+        report=pruner != "none",
+        precision=precision,
+        compile_model=compile_model,
+        num_threads=num_threads,
+    )
+    if instrument:
+        trial_objective = InstrumentedObjective(
+            trial_objective, device_memory=concurrency == 1
+        )
+    study = get_study(
+        study_name,
+        pruner=study_pruner,
+        optuna_db=optuna_db,
+        sampler=None if seed is None else optuna.samplers.TPESampler(seed),
+    )
+    if reap_stale:
+        reaped = optuna_db.reap_stale_trials(max_runtime=max_runtime)
+        print(f"Failed stale trials: {reaped}")
+    runner = (
+        BatchedRunner(study=study, batch_size=batch_size)
+        if batch_size
+        else None
+    )
+    if warm_start_from:
+        enqueued = warm_start(
+            optuna_db=optuna_db,
+            study=study,
+            source_study_names=warm_start_from,
+            k=warm_start_k,
+            search_space=gpu_training.SEARCH_SPACE,
+            queue=None if runner is None else runner.shadow_study,
+        )
+        print(f"Enqueued {len(enqueued)} warm-start trials")
+    if metrics_port is not None:
+        start_metrics_server(optuna_db=optuna_db, port=metrics_port)
+    if runner is not None:
+        runner.optimize_vectorized(
+            batch_objective=partial(
+                gpu_training.batch_objective,
+                epochs=epochs,
+                minibatch_size=minibatch_size,
+                num_threads=num_threads,
+            ),
+            search_space=gpu_training.SEARCH_SPACE,
+            n_trials=n_trials,
+        )
+    elif workers > 1:
+        run_parallel(
+            study_name=study_name,
+            objective=trial_objective,
+            n_trials=n_trials,
+            n_workers=workers,
+            timeout=timeout,
+            seed=seed,
+            pruner=study_pruner,
+            initializer=partial(
+                gpu_training.configure_dataset,
+                n_samples=dataset_size,
+                path=dataset_path,
+            ),
+            db_settings=db_settings,
+        )
+    elif concurrency > 1:
+        run_packed(
+            study=study,
+            objective=trial_objective,
+            n_trials=n_trials,
+            concurrency=concurrency,
+            timeout=timeout,
+            device=gpu_training.get_device(),
+            num_threads=num_threads,
+            prepare=gpu_training.get_dataset,
+        )
+    else:
+        study.optimize(
+            func=trial_objective, n_trials=n_trials, timeout=timeout
+        )
+
+    if instrument:
+        report = optuna_db.get_performance_report(study_name=study_name)
+        print(json.dumps(report, indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the command-line parser. Imports nothing heavy."""
+    parser = argparse.ArgumentParser(
+        description="Run GPU-based Optuna tuning."
+    )
+    parser.add_argument(
+        "--study_name", type=str, default="gpu_study", help="Name of the study"
+    )
+    parser.add_argument(
+        "--n_trials",
+        type=int,
+        default=10,
+        help="Number of trials for optimization",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes sharing the study",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Time limit for optimization in seconds",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=None,
+        help="Train trials in stacked batches of this size",
+    )
+    parser.add_argument(
+        "--dataset_size",
+        type=int,
+        default=None,
+        help="Number of synthetic samples (default 1000)",
+    )
+    parser.add_argument(
+        "--dataset_path",
+        type=str,
+        default=None,
+        help="Memory-mapped .npy or .pt dataset file",
+    )
+    parser.add_argument(
+        "--epochs", type=int, default=20, help="Training epochs per trial"
+    )
+    parser.add_argument(
+        "--minibatch_size",
+        type=int,
+        default=None,
+        help="Mini-batch size (default: full batch)",
+    )
+    parser.add_argument(
+        "--pruner",
+        type=str,
+        default="none",
+        choices=["none", "median", "hyperband"],
+        help="Pruner for early stopping",
+    )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        default="fp32",
+        choices=["fp32", "bf16", "fp16", "auto"],
+        help="Automatic mixed precision mode",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile models with torch.compile, reusing graphs across trials",
+    )
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=None,
+        help="CPU threads used by torch in each worker",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record per-trial performance metrics and print a report",
+    )
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port while tuning",
+    )
+    parser.add_argument(
+        "--heartbeat_interval",
+        type=int,
+        default=None,
+        help="Seconds between heartbeats of running trials",
+    )
+    parser.add_argument(
+        "--max_retry",
+        type=int,
+        default=None,
+        help="Re-enqueue trials of dead workers up to this many times",
+    )
+    parser.add_argument(
+        "--reap_stale",
+        action="store_true",
+        help="Fail stale running trials of all studies before tuning",
+    )
+    parser.add_argument(
+        "--max_runtime",
+        type=float,
+        default=None,
+        help="With --reap_stale, fail trials without heartbeats running "
+        "longer than this many seconds",
+    )
+    parser.add_argument(
+        "--warm_start_from",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Enqueue the best trials of these studies into a new study",
+    )
+    parser.add_argument(
+        "--warm_start_k",
+        type=int,
+        default=10,
+        help="Number of best trials taken from each warm-start study",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Trials trained concurrently in this process",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Sampler seed (worker i of --workers uses seed + i)",
+    )
+    return parser
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Run GPU-based Optuna tuning.")
-    parser.add_argument("--study_name", type=str, default="gpu_study", help="Name of the study")
-    parser.add_argument("--n_trials", type=int, default=10, help="Number of trials for optimization")
-    args = parser.parse_args()
-    main(study_name=args.study_name, n_trials=args.n_trials)
+    args = build_parser().parse_args()
+    main(
+        study_name=args.study_name,
+        n_trials=args.n_trials,
+        workers=args.workers,
+        timeout=args.timeout,
+        batch_size=args.batch_size,
+        dataset_size=args.dataset_size,
+        dataset_path=args.dataset_path,
+        epochs=args.epochs,
+        minibatch_size=args.minibatch_size,
+        pruner=args.pruner,
+        precision=args.precision,
+        compile_model=args.compile,
+        num_threads=args.num_threads,
+        instrument=args.instrument,
+        metrics_port=args.metrics_port,
+        heartbeat_interval=args.heartbeat_interval,
+        max_retry=args.max_retry,
+        reap_stale=args.reap_stale,
+        max_runtime=args.max_runtime,
+        warm_start_from=args.warm_start_from,
+        warm_start_k=args.warm_start_k,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
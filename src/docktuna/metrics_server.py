@@ -0,0 +1,244 @@
+"""
+Prometheus-style metrics endpoint for studies in an OptunaDatabase.
+
+Serves `/metrics` in the Prometheus text format using only the standard
+library HTTP server. Each scrape runs two grouped aggregate queries (trial
+counts by study and state, and trials finished in the last window) and
+never loads trials. It also reports the connection pool usage of the
+database and, for queries tracked by `docktuna.optuna_db.instrumentation`
+in this process, a query latency histogram.
+
+The `optuna_app` service in docker-compose publishes port 8000, which is the
+default port here.
+
+Usage:
+    python -m docktuna.metrics_server --port 8000
+    python src/docktuna/simple_tune.py --n_trials 100 --metrics_port 8000
+"""
+
+import argparse
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from optuna.storages import RDBStorage
+
+from docktuna.optuna_db.instrumentation import (
+    query_latency_histogram,
+    track_queries,
+)
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    """Formats labels as `{name="value",...}`."""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_metrics(optuna_db: OptunaDatabase, window: float = 60.0) -> str:
+    """
+    Renders the current metrics in the Prometheus text format.
+
+    Args:
+        optuna_db: The database whose studies are reported.
+        window: Seconds over which the trial throughput is averaged.
+
+    Returns:
+        The metrics text.
+    """
+    since = datetime.datetime.now() - datetime.timedelta(seconds=window)
+    lines = [
+        "# HELP optuna_trials Number of trials by study and state.",
+        "# TYPE optuna_trials gauge",
+    ]
+    for study_name, states in sorted(
+        optuna_db.count_trials_by_state().items()
+    ):
+        for state, count in sorted(states.items()):
+            lines.append(
+                f"optuna_trials{_labels(study=study_name, state=state)} {count}"
+            )
+
+    lines += [
+        f"# HELP optuna_trials_per_second Trials finished per second over "
+        f"the last {window:g} seconds.",
+        "# TYPE optuna_trials_per_second gauge",
+    ]
+    for study_name, count in sorted(
+        optuna_db.count_trials_finished_since(since).items()
+    ):
+        lines.append(
+            f"optuna_trials_per_second{_labels(study=study_name)} "
+            f"{count / window}"
+        )
+
+    pool_status = optuna_db.pool_status
+    if pool_status:
+        lines += [
+            "# HELP docktuna_db_pool_connections Connection pool usage.",
+            "# TYPE docktuna_db_pool_connections gauge",
+        ]
+        for kind, value in pool_status.items():
+            lines.append(
+                f"docktuna_db_pool_connections{_labels(kind=kind)} {value}"
+            )
+
+    buckets, total_seconds, total_count = query_latency_histogram()
+    lines += [
+        "# HELP docktuna_db_query_seconds Latency of tracked storage queries.",
+        "# TYPE docktuna_db_query_seconds histogram",
+    ]
+    for bound, count in buckets:
+        lines.append(
+            f"docktuna_db_query_seconds_bucket"
+            f"{_labels(le=_format_bound(bound))} {count}"
+        )
+    lines += [
+        f"docktuna_db_query_seconds_sum {total_seconds}",
+        f"docktuna_db_query_seconds_count {total_count}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Background HTTP server exposing `/metrics` for an OptunaDatabase.
+    """
+
+    def __init__(
+        self,
+        optuna_db: OptunaDatabase,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        window: float = 60.0,
+    ):
+        """
+        Creates the server and binds the port. Call `start()` to serve.
+
+        Args:
+            optuna_db: The database whose studies are reported.
+            host: Interface to listen on.
+            port: Port to listen on. Use 0 to pick a free port.
+            window: Seconds over which the trial throughput is averaged.
+        """
+        self._optuna_db = optuna_db
+        self._window = window
+        if isinstance(optuna_db.storage, RDBStorage):
+            track_queries(optuna_db.storage.engine)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render_metrics(
+                        server._optuna_db, window=server._window
+                    ).encode()
+                except Exception as e:
+                    self.send_error(500, explain=str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        """Returns the port the server is bound to."""
+        return self._http_server.server_address[1]
+
+    def serve_forever(self):
+        """Serves requests on the calling thread until `stop()` is called."""
+        self._http_server.serve_forever()
+
+    def start(self) -> "MetricsServer":
+        """
+        Serves requests on a daemon thread.
+
+        Returns:
+            The server itself.
+        """
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            name="docktuna-metrics",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and releases the port."""
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def start_metrics_server(
+    optuna_db: OptunaDatabase, port: int = 8000, host: str = "0.0.0.0"
+) -> MetricsServer:
+    """
+    Starts a metrics server on a background thread.
+
+    Args:
+        optuna_db: The database whose studies are reported.
+        port: Port to listen on.
+        host: Interface to listen on.
+
+    Returns:
+        The running server.
+    """
+    return MetricsServer(optuna_db=optuna_db, host=host, port=port).start()
+
+
+if __name__ == "__main__":
+    from docktuna.optuna_db.db_instance import get_optuna_db
+
+    parser = argparse.ArgumentParser(
+        description="Serve Prometheus metrics for Optuna studies."
+    )
+    parser.add_argument("--host", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=60.0,
+        help="Seconds over which trial throughput is averaged",
+    )
+    args = parser.parse_args()
+    metrics_server = MetricsServer(
+        optuna_db=get_optuna_db(),
+        host=args.host,
+        port=args.port,
+        window=args.window,
+    )
+    print(
+        f"Serving metrics on http://{args.host}:{metrics_server.port}/metrics"
+    )
+    metrics_server.serve_forever()
@@ -0,0 +1,188 @@
+"""
+Asyncio front end for OptunaDatabase.
+
+`AsyncOptunaDatabase` runs OptunaDatabase lookups on a bounded thread pool,
+so an event loop (e.g. a FastAPI dashboard) is never blocked by the
+database and independent queries run concurrently. Concurrent calls of the
+same lookup with the same arguments are coalesced: they await one shared
+query instead of each making a round trip. Results are not kept after the
+query finishes; combine with the OptunaDatabase `cache_ttl` for caching.
+
+Lookups of a missing study raise KeyError instead of the StopIteration of
+the blocking API, since StopIteration cannot be raised through a future.
+
+Usage:
+    async with AsyncOptunaDatabase(get_optuna_db()) as async_db:
+        summaries, latest = await asyncio.gather(
+            async_db.study_summaries(), async_db.get_latest_study()
+        )
+"""
+
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import optuna
+
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+
+def _call(func: Callable, *args):
+    """
+    Calls a blocking lookup, turning StopIteration into KeyError.
+
+    Args:
+        func: The blocking function.
+        *args: Arguments for `func`.
+
+    Returns:
+        The result of `func`.
+
+    Raises:
+        KeyError: If `func` raises StopIteration.
+    """
+    try:
+        return func(*args)
+    except StopIteration as e:
+        raise KeyError(str(e)) from e
+
+
+class AsyncOptunaDatabase:
+    """
+    Awaitable, coalescing read API over an OptunaDatabase. Use one instance
+    per event loop.
+    """
+
+    def __init__(self, optuna_db: OptunaDatabase, max_workers: int = 4):
+        """
+        Wraps a database.
+
+        Args:
+            optuna_db: The database to query.
+            max_workers: Maximum number of queries running at once. Keep it
+                at or below the database's connection pool size.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._optuna_db = optuna_db
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="docktuna-async-db"
+        )
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncOptunaDatabase":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    @property
+    def optuna_db(self) -> OptunaDatabase:
+        """Returns the wrapped database."""
+        return self._optuna_db
+
+    @property
+    def inflight(self) -> int:
+        """Returns the number of distinct queries currently running."""
+        return len(self._inflight)
+
+    async def _run(self, key: tuple, func: Callable, *args):
+        """
+        Runs a blocking lookup on the thread pool, sharing the result with
+        concurrent calls that use the same key.
+
+        Args:
+            key: Identifies the lookup and its arguments.
+            func: The blocking function.
+            *args: Arguments for `func`.
+
+        Returns:
+            The result of the lookup.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, _call, func, *args)
+            self._inflight[key] = future
+            future.add_done_callback(
+                lambda done: self._inflight.pop(key, None)
+            )
+        # A cancelled caller must not cancel the query for the others
+        return await asyncio.shield(future)
+
+    async def study_summaries(self) -> list[optuna.study.StudySummary]:
+        """Awaitable `OptunaDatabase.study_summaries`."""
+        summaries = await self._run(
+            ("study_summaries",),
+            lambda: self._optuna_db.study_summaries,
+        )
+        return list(summaries)
+
+    async def get_study_summary(
+        self, study_name: str
+    ) -> optuna.study.StudySummary:
+        """Awaitable `OptunaDatabase.get_study_summary`."""
+        return await self._run(
+            ("study_summary", study_name),
+            self._optuna_db.get_study_summary,
+            study_name,
+        )
+
+    async def get_best_params(self, study_name: str) -> dict[str, Any]:
+        """Awaitable `OptunaDatabase.get_best_params`."""
+        params = await self._run(
+            ("best_params", study_name),
+            self._optuna_db.get_best_params,
+            study_name,
+        )
+        return copy.deepcopy(params)
+
+    async def is_in_db(self, study_name: str) -> bool:
+        """Awaitable `OptunaDatabase.is_in_db`."""
+        return await self._run(
+            ("is_in_db", study_name), self._optuna_db.is_in_db, study_name
+        )
+
+    async def list_study_names(self) -> list[str]:
+        """Awaitable `OptunaDatabase.list_study_names`."""
+        names = await self._run(
+            ("study_names",), self._optuna_db.list_study_names
+        )
+        return list(names)
+
+    async def count_studies(self) -> int:
+        """Awaitable `OptunaDatabase.count_studies`."""
+        return await self._run(
+            ("count_studies",), self._optuna_db.count_studies
+        )
+
+    async def count_trials_by_state(self) -> dict[str, dict[str, int]]:
+        """Awaitable `OptunaDatabase.count_trials_by_state`."""
+        counts = await self._run(
+            ("trials_by_state",), self._optuna_db.count_trials_by_state
+        )
+        return copy.deepcopy(counts)
+
+    async def get_latest_study(self) -> optuna.Study:
+        """Awaitable `OptunaDatabase.get_latest_study`."""
+        return await self._run(
+            ("latest_study",), self._optuna_db.get_latest_study
+        )
+
+    async def get_study(self, study_name: str) -> optuna.Study:
+        """Awaitable `OptunaDatabase.get_study`."""
+        return await self._run(
+            ("study", study_name), self._optuna_db.get_study, study_name
+        )
+
+    def close(self):
+        """Waits for running queries and shuts down the thread pool."""
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self):
+        """
+        Awaitable `close`. Waits for running queries on another thread, so
+        the event loop keeps running meanwhile.
+        """
+        await asyncio.to_thread(self.close)
@@ -0,0 +1,372 @@
+"""
+Storage backends for OptunaDatabase.
+
+A backend knows how to build one kind of Optuna storage:
+
+- `PostgresBackend`: PostgreSQL, password from a Docker secret (default).
+- `SQLiteBackend`: a SQLite file (in WAL mode by default) or in-memory database.
+- `JournalFileBackend`: Optuna's `JournalStorage` on an append-only file.
+- `InMemoryBackend`: Optuna's `InMemoryStorage`, for short-lived studies.
+- `RDBUrlBackend`: any SQLAlchemy URL supported by `RDBStorage`.
+
+`backend_from_env` selects a backend from the `DOCKTUNA_STORAGE_BACKEND`
+(`postgres`, `sqlite`, `journal` or `inmemory`) and `DOCKTUNA_STORAGE_PATH`
+environment variables.
+
+Backends compare equal when their configuration is equal, so they can be
+used as part of registry keys. In-memory backends (`InMemoryBackend` and
+`SQLiteBackend` without a path) are only equal to themselves, since each
+one holds a separate database.
+"""
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from os import getenv
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+import optuna
+from optuna.storages import BaseStorage, InMemoryStorage, RDBStorage
+from sqlalchemy.pool import StaticPool
+
+BACKEND_ENV = "DOCKTUNA_STORAGE_BACKEND"
+PATH_ENV = "DOCKTUNA_STORAGE_PATH"
+
+
+def read_secret(secret_name: str) -> str:
+    """
+    Reads a secret value from the Docker secrets directory.
+
+    Args:
+        secret_name: The name of the secret file to read.
+
+    Returns:
+        The contents of the secret file.
+
+    Raises:
+        Exception: If the secret file is not found.
+    """
+    secret_path = Path("/run/secrets") / secret_name
+    try:
+        with secret_path.open(mode="r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        raise Exception(f"Secret {secret_name} not found!")
+
+
+def _canonical(value: Any) -> str:
+    """
+    Serializes settings that may hold unhashable values, such as
+    `connect_args` dicts, into a hashable string.
+
+    Args:
+        value: The settings.
+
+    Returns:
+        Canonical JSON, with other objects written as their repr.
+    """
+    return json.dumps(value, sort_keys=True, default=repr)
+
+
+class StorageBackend(ABC):
+    """
+    Builds the Optuna storage used by an OptunaDatabase.
+    """
+
+    @abstractmethod
+    def _config(self) -> tuple:
+        """
+        Returns the settings that identify this backend.
+
+        Returns:
+            A hashable tuple of settings.
+        """
+
+    @abstractmethod
+    def create_storage(self, **storage_kwargs) -> BaseStorage:
+        """
+        Creates the storage.
+
+        Args:
+            **storage_kwargs: Extra keyword arguments for the storage
+                constructor, such as RDBStorage heartbeat settings.
+
+        Returns:
+            A new (or, for in-memory storage, the shared) storage instance.
+
+        Raises:
+            ValueError: If the storage does not accept `storage_kwargs`.
+        """
+
+    def refresh(self):
+        """Forgets cached credentials so the next storage re-reads them."""
+
+    def _reject_storage_kwargs(self, storage_kwargs: dict[str, Any]):
+        """
+        Rejects storage options for backends whose storage takes none.
+
+        Args:
+            storage_kwargs: The requested storage options.
+
+        Raises:
+            ValueError: If any option is given.
+        """
+        if storage_kwargs:
+            raise ValueError(
+                f"{type(self).__name__} does not support storage options "
+                f"{sorted(storage_kwargs)}; heartbeats require RDB storage."
+            )
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._config() == other._config()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self._config()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self._config()}"
+
+
+class RDBUrlBackend(StorageBackend):
+    """
+    RDBStorage for an explicit SQLAlchemy URL.
+    """
+
+    def __init__(self, url: str, engine_kwargs: dict[str, Any] = None):
+        """
+        Args:
+            url: SQLAlchemy database URL.
+            engine_kwargs: Keyword arguments for `create_engine`.
+        """
+        self._url = url
+        self._engine_kwargs = dict(engine_kwargs or {})
+
+    @property
+    def url(self) -> str:
+        """Returns the database URL."""
+        return self._url
+
+    @property
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Returns the keyword arguments passed to `create_engine`."""
+        return self._engine_kwargs
+
+    def _config(self) -> tuple:
+        return (self._url, _canonical(self._engine_kwargs))
+
+    def create_storage(self, **storage_kwargs) -> RDBStorage:
+        return RDBStorage(
+            url=self.url, engine_kwargs=self.engine_kwargs, **storage_kwargs
+        )
+
+
+class PostgresBackend(RDBUrlBackend):
+    """
+    PostgreSQL RDBStorage with the password read from a Docker secret and a
+    configurable connection pool.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        db_password_secret: str,
+        db_name: str,
+        hostname: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 3600,
+    ):
+        """
+        Args:
+            username: Database username.
+            db_password_secret: Secret name for the database password.
+            db_name: Name of the database.
+            hostname: Database host.
+            pool_size: Number of connections kept open in the pool.
+            max_overflow: Connections allowed beyond `pool_size` under load.
+            pool_pre_ping: Whether to test connections before handing them
+                out, so connections dropped by the server are replaced.
+            pool_recycle: Seconds after which pooled connections are
+                recycled. Use -1 to disable.
+        """
+        super().__init__(
+            url=None,
+            engine_kwargs={
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_pre_ping": pool_pre_ping,
+                "pool_recycle": pool_recycle,
+            },
+        )
+        self.username = username
+        self.db_password_secret = db_password_secret
+        self.db_name = db_name
+        self.hostname = hostname
+
+    def _config(self) -> tuple:
+        return (
+            self.username,
+            self.db_password_secret,
+            self.db_name,
+            self.hostname,
+            _canonical(self._engine_kwargs),
+        )
+
+    @property
+    def url(self) -> str:
+        """
+        Constructs a secure database connection URL using credentials
+        stored in Docker secrets. The secret is read once and the URL is
+        cached until `refresh()` is called.
+
+        Returns:
+            The formatted database connection URL.
+        """
+        if self._url is None:
+            password = read_secret(self.db_password_secret)
+            self._url = f"postgresql+psycopg2://{self.username}:{quote(password, safe='')}@{self.hostname}/{self.db_name}"
+        return self._url
+
+    def refresh(self):
+        self._url = None
+
+
+class SQLiteBackend(RDBUrlBackend):
+    """
+    SQLite RDBStorage in a local file, or in memory when no path is given.
+    File databases use write-ahead logging by default, so readers do not
+    block the writer.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        wal: bool = True,
+        timeout: float = 30.0,
+    ):
+        """
+        Args:
+            path: Database file, or None (or ":memory:") for an in-memory
+                database shared by all threads of this process.
+            wal: Whether to enable WAL journal mode for file databases.
+            timeout: Seconds to wait for a locked database.
+        """
+        self._path = None if path in (None, ":memory:") else str(path)
+        self._wal = wal
+        self._timeout = timeout
+        if self._path is None:
+            # One shared connection, so every thread sees the same database
+            super().__init__(
+                url="sqlite://",
+                engine_kwargs={
+                    "poolclass": StaticPool,
+                    "connect_args": {"check_same_thread": False},
+                },
+            )
+        else:
+            super().__init__(
+                url=f"sqlite:///{self._path}",
+                engine_kwargs={"creator": self._connect},
+            )
+
+    def _config(self) -> tuple:
+        if self._path is None:
+            # Each in-memory database is separate, like InMemoryBackend
+            return (id(self),)
+        return (self._path, self._wal, self._timeout)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a connection to the database file with the configured
+        journal mode.
+
+        Returns:
+            A new SQLite connection.
+        """
+        connection = sqlite3.connect(
+            self._path, timeout=self._timeout, check_same_thread=False
+        )
+        if self._wal:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+class JournalFileBackend(StorageBackend):
+    """
+    Optuna JournalStorage backed by an append-only log file. Suitable for
+    several processes on one host without a database server.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Args:
+            path: The journal file.
+        """
+        self._path = str(path)
+
+    def _config(self) -> tuple:
+        return (self._path,)
+
+    def create_storage(self, **storage_kwargs) -> BaseStorage:
+        from optuna.storages.journal import JournalFileBackend as FileBackend
+
+        self._reject_storage_kwargs(storage_kwargs)
+        return optuna.storages.JournalStorage(FileBackend(self._path))
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    Optuna InMemoryStorage. The storage lives as long as the backend, so
+    closing and reopening an OptunaDatabase keeps its studies. It is not
+    shared with other processes.
+    """
+
+    def __init__(self):
+        self._storage = None
+        self._lock = threading.Lock()
+
+    def _config(self) -> tuple:
+        # Each backend holds its own storage, so only it is equal to itself
+        return (id(self),)
+
+    def create_storage(self, **storage_kwargs) -> InMemoryStorage:
+        self._reject_storage_kwargs(storage_kwargs)
+        with self._lock:
+            if self._storage is None:
+                self._storage = InMemoryStorage()
+            return self._storage
+
+
+def backend_from_env(**postgres_settings) -> StorageBackend:
+    """
+    Selects a storage backend from environment variables.
+
+    Args:
+        **postgres_settings: Keyword arguments for PostgresBackend, used
+            when `DOCKTUNA_STORAGE_BACKEND` is unset or `postgres`.
+
+    Returns:
+        The configured backend.
+
+    Raises:
+        ValueError: If the backend name is unknown, or a journal backend
+            has no path.
+    """
+    name = getenv(BACKEND_ENV, "postgres").lower()
+    path = getenv(PATH_ENV)
+    if name == "postgres":
+        return PostgresBackend(**postgres_settings)
+    if name == "sqlite":
+        return SQLiteBackend(path=path)
+    if name == "journal":
+        if path is None:
+            raise ValueError(f"{PATH_ENV} must be set for journal storage.")
+        return JournalFileBackend(path=path)
+    if name == "inmemory":
+        return InMemoryBackend()
+    raise ValueError(f"Unknown storage backend {name}")
@@ -0,0 +1,171 @@
+"""
+Grouped trial writes and incremental trial reads on RDB storage.
+
+Optuna's storage API writes one trial per `create_new_trial` call, each in
+its own transaction. `insert_trials` writes a list of finished trials,
+with their values, parameters, attributes and intermediate values, in a
+single transaction. `trials_since` reads only the trials created after a
+trial-id cursor plus previously unfinished ones, so pollers do not re-read
+the whole study.
+
+Both accept any storage: studies created from an `RDBStorage` wrap it in
+Optuna's cache, which is unwrapped, and other storages fall back to the
+storage API.
+"""
+
+import json
+from collections.abc import Iterable
+
+from optuna.distributions import distribution_to_json
+from optuna.storages import BaseStorage, RDBStorage
+from optuna.storages._cached_storage import _CachedStorage
+from optuna.storages._rdb import models
+from optuna.trial import FrozenTrial
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+def rdb_storage(storage: BaseStorage) -> RDBStorage | None:
+    """
+    Returns the RDB storage behind a storage, if any.
+
+    Args:
+        storage: A storage, possibly Optuna's cache around an RDBStorage.
+
+    Returns:
+        The RDBStorage, or None for storages without SQL access.
+    """
+    if isinstance(storage, _CachedStorage):
+        storage = storage._backend
+    return storage if isinstance(storage, RDBStorage) else None
+
+
+def insert_trials(
+    storage: BaseStorage, study_id: int, trials: Iterable[FrozenTrial]
+) -> list[int]:
+    """
+    Inserts finished trials into a study, in one transaction on RDB
+    storage.
+
+    Args:
+        storage: The storage holding the study.
+        study_id: The id of the study.
+        trials: The trials to insert. Their ids and numbers are ignored.
+
+    Returns:
+        The trial ids of the inserted trials, in order.
+    """
+    rdb = rdb_storage(storage)
+    if rdb is None:
+        return [
+            storage.create_new_trial(study_id, template_trial=trial)
+            for trial in trials
+        ]
+
+    with Session(bind=rdb.engine) as session, session.begin():
+        # Locks the study row so trial numbers stay consecutive
+        models.StudyModel.find_or_raise_by_id(
+            study_id, session, for_update=True
+        )
+        next_number = session.scalar(
+            select(func.count(models.TrialModel.trial_id)).where(
+                models.TrialModel.study_id == study_id
+            )
+        )
+        trial_models = []
+        for offset, trial in enumerate(trials):
+            trial_model = models.TrialModel(
+                study_id=study_id,
+                number=next_number + offset,
+                state=trial.state,
+                datetime_start=trial.datetime_start,
+                datetime_complete=trial.datetime_complete,
+            )
+            session.add(trial_model)
+            trial_models.append(trial_model)
+            for objective, value in enumerate(trial.values or []):
+                stored, value_type = (
+                    models.TrialValueModel.value_to_stored_repr(value)
+                )
+                session.add(
+                    models.TrialValueModel(
+                        trial=trial_model,
+                        objective=objective,
+                        value=stored,
+                        value_type=value_type,
+                    )
+                )
+            for name, value in trial.params.items():
+                distribution = trial.distributions[name]
+                session.add(
+                    models.TrialParamModel(
+                        trial=trial_model,
+                        param_name=name,
+                        param_value=distribution.to_internal_repr(value),
+                        distribution_json=distribution_to_json(distribution),
+                    )
+                )
+            for attr_model, attrs in (
+                (models.TrialUserAttributeModel, trial.user_attrs),
+                (models.TrialSystemAttributeModel, trial.system_attrs),
+            ):
+                for key, value in attrs.items():
+                    session.add(
+                        attr_model(
+                            trial=trial_model,
+                            key=key,
+                            value_json=json.dumps(value),
+                        )
+                    )
+            intermediate = models.TrialIntermediateValueModel
+            for step, value in trial.intermediate_values.items():
+                stored, value_type = (
+                    intermediate.intermediate_value_to_stored_repr(value)
+                )
+                session.add(
+                    intermediate(
+                        trial=trial_model,
+                        step=step,
+                        intermediate_value=stored,
+                        intermediate_value_type=value_type,
+                    )
+                )
+        session.flush()
+        return [trial_model.trial_id for trial_model in trial_models]
+
+
+def trials_since(
+    storage: BaseStorage,
+    study_id: int,
+    after_trial_id: int = -1,
+    trial_ids: Iterable[int] = (),
+) -> list[FrozenTrial]:
+    """
+    Reads the trials of a study created after a cursor, plus the given
+    trials, without copying the rest of the study.
+
+    Args:
+        storage: The storage holding the study.
+        study_id: The id of the study.
+        after_trial_id: Trials with a larger trial id are returned.
+        trial_ids: Ids of trials that were unfinished at the last read.
+
+    Returns:
+        The matching trials, in any state, ordered by trial id.
+    """
+    trial_ids = set(trial_ids)
+    rdb = rdb_storage(storage)
+    if rdb is not None:
+        trials = rdb._get_trials(
+            study_id,
+            states=None,
+            included_trial_ids=trial_ids,
+            trial_id_greater_than=after_trial_id,
+        )
+    else:
+        trials = [
+            trial
+            for trial in storage.get_all_trials(study_id, deepcopy=False)
+            if trial._trial_id > after_trial_id or trial._trial_id in trial_ids
+        ]
+    return sorted(trials, key=lambda trial: trial._trial_id)
@@ -1,41 +1,187 @@
-from dotenv import load_dotenv
+import json
+import os
+import threading
 from os import getenv
 from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
 
+from docktuna.optuna_db.backends import BACKEND_ENV, backend_from_env
 from docktuna.optuna_db.optuna_db import OptunaDatabase
 
-OPTUNA_DB = None
+DEFAULT_DB = "default"
+
+# Set to "1" to instrument the default database in this and child processes
+INSTRUMENT_ENV = "DOCKTUNA_INSTRUMENT"
+
+# Heartbeat interval (seconds) and stale-trial retries of the default database
+HEARTBEAT_ENV = "DOCKTUNA_HEARTBEAT_INTERVAL"
+MAX_RETRY_ENV = "DOCKTUNA_MAX_RETRY"
+
+_DOTENV_PATH = (
+    Path.home() / "project" / "docker" / "optuna_db" / "optuna_db.env"
+)
 
+_LOCK = threading.RLock()
+_DOTENV_LOADED = False
+_SETTINGS: dict[str, dict[str, Any]] = {}
+_DBS_BY_NAME: dict[str, OptunaDatabase] = {}
+_DBS_BY_SETTINGS: dict[str, OptunaDatabase] = {}
 
-def get_optuna_db() -> OptunaDatabase:
+
+def _default_settings() -> dict[str, Any]:
     """
-    Returns a global OptunaDatabase instance, initializing it if necessary.
+    Reads connection settings for the default database from the
+    environment, loading the project's `.env` file once per process.
+    PostgreSQL is used unless `DOCKTUNA_STORAGE_BACKEND` selects another
+    backend (see `backends.backend_from_env`). Heartbeats are enabled by
+    `DOCKTUNA_HEARTBEAT_INTERVAL`, and `DOCKTUNA_MAX_RETRY` re-enqueues
+    trials that were failed for being stale.
 
-    If the database instance does not exist, it will be created using credentials
-    stored in Docker secrets. If initialization fails, an exception is raised.
+    Returns:
+        Keyword arguments for OptunaDatabase.
+    """
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv(dotenv_path=_DOTENV_PATH)
+        _DOTENV_LOADED = True
+    settings = {
+        "username": getenv("OPTUNA_DB_USER"),
+        "db_password_secret": "optuna_db_user_password",
+        "db_name": getenv("OPTUNA_DB_NAME"),
+        "hostname": getenv("OPTUNA_DB_HOST"),
+        "instrument": getenv(INSTRUMENT_ENV) == "1",
+    }
+    if getenv(BACKEND_ENV, "postgres").lower() != "postgres":
+        settings["backend"] = backend_from_env()
+    if getenv(HEARTBEAT_ENV):
+        settings["heartbeat_interval"] = int(getenv(HEARTBEAT_ENV))
+    if getenv(MAX_RETRY_ENV):
+        settings["max_retry"] = int(getenv(MAX_RETRY_ENV))
+    return settings
+
+
+def _settings_key(settings: dict[str, Any]) -> str:
+    """
+    Builds a hashable registry key from connection settings, which may
+    hold unhashable values such as `connect_args` dicts.
+
+    Args:
+        settings: Keyword arguments for OptunaDatabase.
 
     Returns:
-        The global OptunaDatabase instance.
+        The settings as canonical JSON. Values JSON cannot represent, such
+        as backends, are written as their repr.
+    """
+    return json.dumps(settings, sort_keys=True, default=repr)
+
+
+def register_optuna_db(name: str, **settings):
+    """
+    Registers connection settings under a name so that
+    `get_optuna_db(name)` can build the database on first use.
+
+    Args:
+        name: Name used to retrieve the database.
+        **settings: Keyword arguments for OptunaDatabase.
 
     Raises:
+        ValueError: If the name is already registered with other settings.
+    """
+    with _LOCK:
+        existing = _SETTINGS.get(name)
+        if existing is not None and existing != settings:
+            raise ValueError(
+                f"Optuna database {name} is already registered with "
+                f"different settings."
+            )
+        _SETTINGS[name] = dict(settings)
+
+
+def get_optuna_db(name: str = DEFAULT_DB, **settings) -> OptunaDatabase:
+    """
+    Returns a shared OptunaDatabase instance, initializing it if necessary.
+
+    The default database is created using credentials stored in environment
+    variables and Docker secrets. Other databases must first be added with
+    `register_optuna_db`. Names registered with identical settings share one
+    instance (and one connection pool). Initialization is guarded by a lock,
+    so concurrent callers never build more than one instance, and lookups
+    after initialization do not take the lock.
+
+    Args:
+        name: Name of the database to retrieve.
+        **settings: Settings that override those of `name`, such as
+            `instrument` or `heartbeat_interval`. The resulting database is
+            shared by callers passing the same settings, but is not stored
+            under `name`.
+
+    Returns:
+        The shared OptunaDatabase instance.
+
+    Raises:
+        KeyError: If no settings are registered under `name`.
         RuntimeError: If the database initialization fails.
     """
-    global OPTUNA_DB
-    if OPTUNA_DB is None:
-        dotenv_path = (
-            Path.home() / "project" / "docker" / "optuna_db" / "optuna_db.env"
-        )
-        load_dotenv(dotenv_path=dotenv_path)
-
-        OPTUNA_DB = OptunaDatabase(
-            username=getenv("OPTUNA_DB_USER"),
-            db_password_secret="optuna_db_user_password",
-            db_name=getenv("OPTUNA_DB_NAME"),
-            hostname=getenv("OPTUNA_DB_HOST"),
-        )
-        try:
-            _ = OPTUNA_DB.storage  # Force initialization to catch errors early
-        except Exception as e:
-            OPTUNA_DB = None  # Reset on failure
-            raise RuntimeError(f"Failed to initialize Optuna database: {e}")
-    return OPTUNA_DB
+    if not settings:
+        optuna_db = _DBS_BY_NAME.get(name)
+        if optuna_db is not None:
+            return optuna_db
+
+    with _LOCK:
+        if not settings:
+            optuna_db = _DBS_BY_NAME.get(name)
+            if optuna_db is not None:
+                return optuna_db
+
+        base_settings = _SETTINGS.get(name)
+        if base_settings is None:
+            if name != DEFAULT_DB:
+                raise KeyError(f"Optuna database {name} is not registered!")
+            base_settings = _default_settings()
+        db_settings = {**base_settings, **settings}
+        key = _settings_key(db_settings)
+
+        optuna_db = _DBS_BY_SETTINGS.get(key)
+        if optuna_db is None:
+            optuna_db = OptunaDatabase(**db_settings)
+            try:
+                _ = (
+                    optuna_db.storage
+                )  # Force initialization to catch errors early
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to initialize Optuna database: {e}"
+                )
+            _DBS_BY_SETTINGS[key] = optuna_db
+        if not settings:
+            _DBS_BY_NAME[name] = optuna_db
+        return optuna_db
+
+
+def reset_optuna_dbs():
+    """
+    Closes all shared OptunaDatabase instances and forgets them. Registered
+    settings are kept.
+    """
+    with _LOCK:
+        optuna_dbs = list(_DBS_BY_SETTINGS.values())
+        _DBS_BY_NAME.clear()
+        _DBS_BY_SETTINGS.clear()
+    for optuna_db in optuna_dbs:
+        optuna_db.close()
+
+
+def _reset_after_fork():
+    """
+    Gives a forked child its own lock and connection pools. Pooled
+    connections inherited from the parent are abandoned, not closed.
+    """
+    global _LOCK
+    _LOCK = threading.RLock()
+    for optuna_db in _DBS_BY_SETTINGS.values():
+        optuna_db.reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
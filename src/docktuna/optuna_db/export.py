@@ -0,0 +1,648 @@
+"""
+Streaming export and bulk import of studies.
+
+`export_study` writes the trials of a study to CSV or Parquet without
+loading the study. On RDB storage, trials are read through a server-side
+cursor in chunks of `chunk_size`, and the parameters, values, attributes
+and intermediate values of each chunk are fetched with one query per
+table, so memory use is bounded by the chunk size.
+
+The layout is columnar: `number`, `state`, `datetime_start`,
+`datetime_complete`, one `value` column per objective (`values_<i>` for
+multi-objective studies), one `params_<name>` column per parameter, and
+JSON columns for user attributes, system attributes, intermediate values
+and the trial's parameter distributions. Categorical parameters are written
+as the index of their choice. Since a parameter's distribution may change
+between trials, each trial is imported with its own distributions. The
+study's directions and attributes are written to a `<file>.meta.json`
+sidecar.
+
+`import_study` reads such an export back in batches of `batch_size`
+trials. On RDB storage each batch is inserted in a single transaction.
+Trials exported while RUNNING are imported as FAIL.
+
+Parquet requires the optional `pyarrow` package.
+
+Usage:
+    optuna_db.export_study("my_study", "my_study.parquet")
+    optuna_db.import_study("my_study.parquet", study_name="my_study_copy")
+"""
+
+import csv
+import datetime
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import optuna
+from optuna.distributions import (
+    BaseDistribution,
+    CategoricalDistribution,
+    FloatDistribution,
+    distribution_to_json,
+    json_to_distribution,
+)
+from optuna.storages import RDBStorage
+from optuna.storages._rdb import models
+from optuna.study import StudyDirection
+from optuna.trial import FrozenTrial, TrialState
+from sqlalchemy import select
+
+from docktuna.optuna_db.bulk import insert_trials
+
+FORMATS = ("csv", "parquet")
+META_SUFFIX = ".meta.json"
+JSON_COLUMNS = (
+    "user_attrs",
+    "system_attrs",
+    "intermediate_values",
+    "distributions",
+)
+
+
+def _require_pyarrow():
+    """
+    Imports pyarrow and its Parquet module.
+
+    Returns:
+        The pyarrow and pyarrow.parquet modules.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet export requires pyarrow. Install it or use CSV."
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+def _file_format(path: Path) -> str:
+    """
+    Infers the file format from the file suffix.
+
+    Args:
+        path: The export file.
+
+    Returns:
+        "csv" or "parquet".
+
+    Raises:
+        ValueError: If the suffix is not .csv or .parquet.
+    """
+    file_format = path.suffix.lstrip(".").lower()
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported export format {path.suffix}")
+    return file_format
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + META_SUFFIX)
+
+
+def _value_columns(n_objectives: int) -> list[str]:
+    if n_objectives == 1:
+        return ["value"]
+    return [f"values_{index}" for index in range(n_objectives)]
+
+
+def _columns(metadata: dict[str, Any]) -> list[str]:
+    """
+    Lists the export columns of a study.
+
+    Args:
+        metadata: The study metadata.
+
+    Returns:
+        The column names in file order.
+    """
+    return [
+        "number",
+        "state",
+        "datetime_start",
+        "datetime_complete",
+        *_value_columns(len(metadata["directions"])),
+        *(f"params_{name}" for name in metadata["params"]),
+        *JSON_COLUMNS,
+    ]
+
+
+def _column_type(distribution: BaseDistribution) -> str:
+    """
+    Returns the type of the values a distribution's parameter is exported
+    as. Categorical parameters are exported as choice indexes.
+    """
+    if isinstance(distribution, FloatDistribution):
+        return "float"
+    return "int"
+
+
+def _study_metadata(optuna_db, study_name: str) -> dict[str, Any]:
+    """
+    Reads the study-level data that is not stored per trial.
+
+    Args:
+        optuna_db: The database holding the study.
+        study_name: The name of the study.
+
+    Returns:
+        The study name, directions, attributes and the column type
+        ("int" or "float") of each parameter. A parameter exported as
+        both types is a float column.
+
+    Raises:
+        StopIteration: If the study is not found.
+    """
+    study_id = optuna_db._require_study_id(study_name=study_name)
+    storage = optuna_db.storage
+    if isinstance(storage, RDBStorage):
+        with optuna_db._session() as session:
+            rows = session.execute(
+                select(
+                    models.TrialParamModel.param_name,
+                    models.TrialParamModel.distribution_json,
+                )
+                .distinct()
+                .join(
+                    models.TrialModel,
+                    models.TrialModel.trial_id
+                    == models.TrialParamModel.trial_id,
+                )
+                .where(models.TrialModel.study_id == study_id)
+            ).all()
+        distributions = [
+            (name, json_to_distribution(distribution_json))
+            for name, distribution_json in rows
+        ]
+    else:
+        distributions = [
+            item
+            for trial in storage.get_all_trials(study_id, deepcopy=False)
+            for item in trial.distributions.items()
+        ]
+    params = {}
+    for name, distribution in distributions:
+        if params.get(name) != "float":
+            params[name] = _column_type(distribution)
+    return {
+        "study_name": study_name,
+        "directions": [
+            direction.name
+            for direction in storage.get_study_directions(study_id)
+        ],
+        "user_attrs": storage.get_study_user_attrs(study_id),
+        "system_attrs": storage.get_study_system_attrs(study_id),
+        "params": dict(sorted(params.items())),
+    }
+
+
+def _iter_rdb_trials(
+    optuna_db, study_id: int, chunk_size: int
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Streams the trials of a study from RDB storage.
+
+    Args:
+        optuna_db: The database holding the study.
+        study_id: The id of the study.
+        chunk_size: Trials per chunk.
+
+    Yields:
+        Lists of trial records ordered by trial number.
+    """
+    parsed: dict[str, BaseDistribution] = {}
+    with optuna_db._session() as session:
+        result = session.execute(
+            select(
+                models.TrialModel.trial_id,
+                models.TrialModel.number,
+                models.TrialModel.state,
+                models.TrialModel.datetime_start,
+                models.TrialModel.datetime_complete,
+            )
+            .where(models.TrialModel.study_id == study_id)
+            .order_by(models.TrialModel.trial_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for partition in result.partitions():
+            records = {
+                row.trial_id: {
+                    "number": row.number,
+                    "state": row.state,
+                    "datetime_start": row.datetime_start,
+                    "datetime_complete": row.datetime_complete,
+                    "values": {},
+                    "params": {},
+                    "user_attrs": {},
+                    "system_attrs": {},
+                    "intermediate_values": {},
+                    "distributions": {},
+                }
+                for row in partition
+            }
+            trial_ids = list(records)
+
+            for trial_id, objective, value, value_type in session.execute(
+                select(
+                    models.TrialValueModel.trial_id,
+                    models.TrialValueModel.objective,
+                    models.TrialValueModel.value,
+                    models.TrialValueModel.value_type,
+                ).where(models.TrialValueModel.trial_id.in_(trial_ids))
+            ):
+                records[trial_id]["values"][objective] = (
+                    models.TrialValueModel.stored_repr_to_value(
+                        value, value_type
+                    )
+                )
+
+            for trial_id, name, value, distribution_json in session.execute(
+                select(
+                    models.TrialParamModel.trial_id,
+                    models.TrialParamModel.param_name,
+                    models.TrialParamModel.param_value,
+                    models.TrialParamModel.distribution_json,
+                ).where(models.TrialParamModel.trial_id.in_(trial_ids))
+            ):
+                if distribution_json not in parsed:
+                    parsed[distribution_json] = json_to_distribution(
+                        distribution_json
+                    )
+                records[trial_id]["params"][name] = parsed[
+                    distribution_json
+                ].to_external_repr(value)
+                records[trial_id]["distributions"][name] = parsed[
+                    distribution_json
+                ]
+
+            for attr_model, field in (
+                (models.TrialUserAttributeModel, "user_attrs"),
+                (models.TrialSystemAttributeModel, "system_attrs"),
+            ):
+                for trial_id, key, value_json in session.execute(
+                    select(
+                        attr_model.trial_id,
+                        attr_model.key,
+                        attr_model.value_json,
+                    ).where(attr_model.trial_id.in_(trial_ids))
+                ):
+                    records[trial_id][field][key] = json.loads(value_json)
+
+            intermediate = models.TrialIntermediateValueModel
+            for trial_id, step, value, value_type in session.execute(
+                select(
+                    intermediate.trial_id,
+                    intermediate.step,
+                    intermediate.intermediate_value,
+                    intermediate.intermediate_value_type,
+                ).where(intermediate.trial_id.in_(trial_ids))
+            ):
+                records[trial_id]["intermediate_values"][step] = (
+                    intermediate.stored_repr_to_intermediate_value(
+                        value, value_type
+                    )
+                )
+
+            yield list(records.values())
+
+
+def _iter_storage_trials(
+    storage, study_id: int, chunk_size: int
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yields the trials of a study from a storage without SQL access, in
+    chunks.
+
+    Args:
+        storage: The storage holding the study.
+        study_id: The id of the study.
+        chunk_size: Trials per chunk.
+
+    Yields:
+        Lists of trial records ordered by trial number.
+    """
+    trials = storage.get_all_trials(study_id, deepcopy=False)
+    for start in range(0, len(trials), chunk_size):
+        yield [
+            {
+                "number": trial.number,
+                "state": trial.state,
+                "datetime_start": trial.datetime_start,
+                "datetime_complete": trial.datetime_complete,
+                "values": dict(enumerate(trial.values or [])),
+                "params": trial.params,
+                "user_attrs": trial.user_attrs,
+                "system_attrs": trial.system_attrs,
+                "intermediate_values": trial.intermediate_values,
+                "distributions": trial.distributions,
+            }
+            for trial in trials[start : start + chunk_size]
+        ]
+
+
+def _to_row(record: dict[str, Any], metadata: dict[str, Any]) -> dict:
+    """
+    Converts a trial record to an export row.
+
+    Args:
+        record: The trial record.
+        metadata: The study metadata.
+
+    Returns:
+        The row, keyed by column name.
+    """
+    row = {
+        "number": record["number"],
+        "state": record["state"].name,
+        "datetime_start": record["datetime_start"],
+        "datetime_complete": record["datetime_complete"],
+    }
+    for objective, column in enumerate(
+        _value_columns(len(metadata["directions"]))
+    ):
+        row[column] = record["values"].get(objective)
+    distributions = record["distributions"]
+    for name in metadata["params"]:
+        value = None
+        if name in distributions:
+            value = record["params"][name]
+            if isinstance(distributions[name], CategoricalDistribution):
+                value = int(distributions[name].to_internal_repr(value))
+        row[f"params_{name}"] = value
+    for column in ("user_attrs", "system_attrs", "intermediate_values"):
+        row[column] = json.dumps(record[column])
+    row["distributions"] = json.dumps(
+        {
+            name: json.loads(distribution_to_json(distribution))
+            for name, distribution in distributions.items()
+        }
+    )
+    return row
+
+
+def _parquet_schema(metadata: dict[str, Any]):
+    """
+    Builds the Arrow schema of an export.
+
+    Args:
+        metadata: The study metadata.
+
+    Returns:
+        The pyarrow schema.
+    """
+    pyarrow, _ = _require_pyarrow()
+    fields = [
+        ("number", pyarrow.int64()),
+        ("state", pyarrow.string()),
+        ("datetime_start", pyarrow.timestamp("us")),
+        ("datetime_complete", pyarrow.timestamp("us")),
+    ]
+    fields += [
+        (column, pyarrow.float64())
+        for column in _value_columns(len(metadata["directions"]))
+    ]
+    for name, column_type in metadata["params"].items():
+        arrow_type = (
+            pyarrow.float64() if column_type == "float" else pyarrow.int64()
+        )
+        fields.append((f"params_{name}", arrow_type))
+    fields += [(column, pyarrow.string()) for column in JSON_COLUMNS]
+    return pyarrow.schema(fields)
+
+
+def export_study(
+    optuna_db, study_name: str, path: Path | str, chunk_size: int = 1000
+) -> int:
+    """
+    Streams the trials of a study to a CSV or Parquet file.
+
+    Args:
+        optuna_db: The database holding the study.
+        study_name: The name of the study.
+        path: The output file. The format follows its .csv or .parquet
+            suffix. The metadata is written next to it.
+        chunk_size: Trials read and written at a time.
+
+    Returns:
+        The number of exported trials.
+
+    Raises:
+        StopIteration: If the study is not found.
+        ValueError: If the file suffix is not supported.
+        ImportError: If Parquet is requested without pyarrow.
+    """
+    path = Path(path)
+    file_format = _file_format(path)
+    metadata = _study_metadata(optuna_db, study_name=study_name)
+    study_id = optuna_db._require_study_id(study_name=study_name)
+    if isinstance(optuna_db.storage, RDBStorage):
+        chunks = _iter_rdb_trials(optuna_db, study_id, chunk_size)
+    else:
+        chunks = _iter_storage_trials(optuna_db.storage, study_id, chunk_size)
+
+    columns = _columns(metadata)
+    n_trials = 0
+    if file_format == "csv":
+        with path.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            for chunk in chunks:
+                writer.writerows(_to_row(record, metadata) for record in chunk)
+                n_trials += len(chunk)
+    else:
+        pyarrow, parquet = _require_pyarrow()
+        schema = _parquet_schema(metadata)
+        with parquet.ParquetWriter(path, schema) as writer:
+            for chunk in chunks:
+                writer.write_batch(
+                    pyarrow.RecordBatch.from_pylist(
+                        [_to_row(record, metadata) for record in chunk],
+                        schema=schema,
+                    )
+                )
+                n_trials += len(chunk)
+
+    metadata["columns"] = columns
+    _meta_path(path).write_text(json.dumps(metadata, indent=2))
+    return n_trials
+
+
+def export_studies(
+    optuna_db,
+    directory: Path | str,
+    study_names: list[str] | None = None,
+    file_format: str = "parquet",
+    chunk_size: int = 1000,
+) -> list[Path]:
+    """
+    Exports several studies, one file per study.
+
+    Args:
+        optuna_db: The database holding the studies.
+        directory: The output directory. It is created if missing.
+        study_names: The studies to export. Defaults to all studies.
+        file_format: "csv" or "parquet".
+        chunk_size: Trials read and written at a time.
+
+    Returns:
+        The written files.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if study_names is None:
+        study_names = optuna_db.list_study_names()
+    paths = []
+    for study_name in study_names:
+        path = directory / f"{study_name}.{file_format}"
+        export_study(optuna_db, study_name, path, chunk_size=chunk_size)
+        paths.append(path)
+    return paths
+
+
+def _iter_rows(
+    path: Path, file_format: str, batch_size: int
+) -> Iterator[list[dict]]:
+    """
+    Reads an export file in batches.
+
+    Args:
+        path: The export file.
+        file_format: "csv" or "parquet".
+        batch_size: Rows per batch.
+
+    Yields:
+        Lists of rows keyed by column name.
+    """
+    if file_format == "parquet":
+        _, parquet = _require_pyarrow()
+        for batch in parquet.ParquetFile(path).iter_batches(
+            batch_size=batch_size
+        ):
+            yield batch.to_pylist()
+        return
+
+    with path.open(newline="") as f:
+        batch = []
+        for row in csv.DictReader(f):
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _parse_datetime(value) -> datetime.datetime | None:
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def _from_row(
+    row: dict,
+    n_objectives: int,
+    parsed: dict[str, dict[str, BaseDistribution]],
+) -> FrozenTrial:
+    """
+    Rebuilds a trial from an export row.
+
+    Args:
+        row: The row, keyed by column name.
+        n_objectives: Number of objectives of the study.
+        parsed: Cache of parsed `distributions` cells. Trials usually
+            share their distributions, so each distinct cell is parsed
+            once.
+
+    Returns:
+        The trial, without id and number.
+    """
+    state = TrialState[row["state"]]
+    datetime_complete = _parse_datetime(row["datetime_complete"])
+    if state == TrialState.RUNNING:
+        state = TrialState.FAIL
+        datetime_complete = datetime.datetime.now()
+
+    values = [
+        None if row[column] in (None, "") else float(row[column])
+        for column in _value_columns(n_objectives)
+    ]
+    if row["distributions"] not in parsed:
+        parsed[row["distributions"]] = {
+            name: json_to_distribution(json.dumps(distribution))
+            for name, distribution in json.loads(row["distributions"]).items()
+        }
+    distributions = parsed[row["distributions"]]
+    return FrozenTrial(
+        number=-1,
+        state=state,
+        value=None,
+        values=None if any(value is None for value in values) else values,
+        datetime_start=_parse_datetime(row["datetime_start"]),
+        datetime_complete=datetime_complete,
+        params={
+            name: distribution.to_external_repr(float(row[f"params_{name}"]))
+            for name, distribution in distributions.items()
+        },
+        distributions=distributions,
+        user_attrs=json.loads(row["user_attrs"]),
+        system_attrs=json.loads(row["system_attrs"]),
+        intermediate_values={
+            int(step): value
+            for step, value in json.loads(row["intermediate_values"]).items()
+        },
+        trial_id=-1,
+    )
+
+
+def import_study(
+    optuna_db,
+    path: Path | str,
+    study_name: str | None = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Loads an exported study into the database.
+
+    Args:
+        optuna_db: The database receiving the study.
+        path: The export file written by `export_study`.
+        study_name: Name of the new study. Defaults to the exported name.
+        batch_size: Trials read and inserted per transaction.
+
+    Returns:
+        The number of imported trials.
+
+    Raises:
+        optuna.exceptions.DuplicatedStudyError: If the study exists.
+        ImportError: If a Parquet file is read without pyarrow.
+    """
+    path = Path(path)
+    file_format = _file_format(path)
+    metadata = json.loads(_meta_path(path).read_text())
+    study_name = study_name or metadata["study_name"]
+    parsed = {}
+    n_objectives = len(metadata["directions"])
+
+    study = optuna.create_study(
+        study_name=study_name,
+        storage=optuna_db.storage,
+        directions=[
+            StudyDirection[direction] for direction in metadata["directions"]
+        ],
+    )
+    for key, value in metadata["user_attrs"].items():
+        study.set_user_attr(key, value)
+    for key, value in metadata["system_attrs"].items():
+        optuna_db.storage.set_study_system_attr(study._study_id, key, value)
+
+    n_trials = 0
+    for rows in _iter_rows(path, file_format, batch_size):
+        trials = [_from_row(row, n_objectives, parsed) for row in rows]
+        insert_trials(optuna_db.storage, study._study_id, trials)
+        n_trials += len(trials)
+    optuna_db.invalidate_study(study_name=study_name)
+    return n_trials
@@ -0,0 +1,273 @@
+"""
+Opt-in performance instrumentation for Optuna trials.
+
+Query tracking hooks SQLAlchemy cursor events on an OptunaDatabase engine
+and accumulates, per thread, how many statements ran and how long they took.
+`InstrumentedObjective` wraps an objective function and, after each trial,
+stores a `perf` user attribute with the trial's wall time, storage query
+count and latency, sampler time, peak RSS and (when torch is using CUDA) peak
+device memory. Peak device memory is a per-device counter, so it is only
+recorded when trials run one at a time per process. Counters accumulate from the end of one trial to the end of
+the next, so trial creation and sampling before the objective starts are
+attributed to the trial they belong to.
+
+`OptunaDatabase.get_performance_report` aggregates the stored `perf`
+attributes of a study. Tracked statements also feed a process-wide latency
+histogram, exposed by `query_latency_histogram` for the metrics server.
+
+Usage:
+    optuna_db = OptunaDatabase(..., instrument=True)
+    study.optimize(InstrumentedObjective(objective), n_trials=100)
+"""
+
+import bisect
+import itertools
+import resource
+import sys
+import threading
+import time
+from typing import Callable
+
+import optuna
+from optuna.samplers import BaseSampler
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PERF_ATTR = "perf"
+
+# Upper bounds, in seconds, of the query latency histogram buckets
+QUERY_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+_counters = threading.local()
+_histogram_lock = threading.Lock()
+_histogram_counts = [0] * (len(QUERY_LATENCY_BUCKETS) + 1)
+_histogram_sum = 0.0
+_sampler_lock = threading.Lock()
+
+
+def _thread_counters() -> dict[str, float]:
+    """
+    Returns the calling thread's accumulated counters.
+
+    Returns:
+        Query count, query seconds and sampler seconds since the last reset.
+    """
+    counters = getattr(_counters, "values", None)
+    if counters is None:
+        counters = {"db_queries": 0, "db_seconds": 0.0, "sampler_seconds": 0.0}
+        _counters.values = counters
+    return counters
+
+
+def reset_thread_counters() -> dict[str, float]:
+    """
+    Resets the calling thread's counters.
+
+    Returns:
+        The counter values before the reset.
+    """
+    counters = dict(_thread_counters())
+    _counters.values = None
+    return counters
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    conn.info.setdefault("docktuna_query_start", []).append(
+        time.perf_counter()
+    )
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    elapsed = time.perf_counter() - conn.info["docktuna_query_start"].pop()
+    counters = _thread_counters()
+    counters["db_queries"] += 1
+    counters["db_seconds"] += elapsed
+    _observe_latency(elapsed)
+
+
+def _observe_latency(seconds: float):
+    """
+    Adds one query to the process-wide latency histogram.
+
+    Args:
+        seconds: The query latency.
+    """
+    global _histogram_sum
+    bucket = bisect.bisect_left(QUERY_LATENCY_BUCKETS, seconds)
+    with _histogram_lock:
+        _histogram_counts[bucket] += 1
+        _histogram_sum += seconds
+
+
+def query_latency_histogram() -> tuple[list[tuple[float, int]], float, int]:
+    """
+    Returns the process-wide latency histogram of tracked queries.
+
+    Returns:
+        Cumulative counts per bucket upper bound (ending with infinity),
+        the sum of all latencies, and the total number of queries.
+    """
+    with _histogram_lock:
+        counts = list(_histogram_counts)
+        total_seconds = _histogram_sum
+    cumulative = list(itertools.accumulate(counts))
+    bounds = [*QUERY_LATENCY_BUCKETS, float("inf")]
+    return list(zip(bounds, cumulative)), total_seconds, cumulative[-1]
+
+
+def track_queries(engine: Engine):
+    """
+    Starts counting statements executed through an engine.
+
+    Args:
+        engine: The SQLAlchemy engine to instrument.
+    """
+    if not event.contains(
+        engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedSampler(BaseSampler):
+    """
+    Sampler wrapper that adds the time spent sampling to the calling
+    thread's counters.
+    """
+
+    def __init__(self, sampler: BaseSampler):
+        """
+        Wraps a sampler.
+
+        Args:
+            sampler: The sampler that does the actual sampling.
+        """
+        self._sampler = sampler
+
+    def _timed(self, func: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            _thread_counters()["sampler_seconds"] += (
+                time.perf_counter() - start
+            )
+
+    def infer_relative_search_space(self, study, trial):
+        return self._timed(
+            self._sampler.infer_relative_search_space, study, trial
+        )
+
+    def sample_relative(self, study, trial, search_space):
+        return self._timed(
+            self._sampler.sample_relative, study, trial, search_space
+        )
+
+    def sample_independent(self, study, trial, param_name, param_distribution):
+        return self._timed(
+            self._sampler.sample_independent,
+            study,
+            trial,
+            param_name,
+            param_distribution,
+        )
+
+    def before_trial(self, study, trial):
+        self._timed(self._sampler.before_trial, study, trial)
+
+    def after_trial(self, study, trial, state, values):
+        self._timed(self._sampler.after_trial, study, trial, state, values)
+
+    def reseed_rng(self):
+        self._sampler.reseed_rng()
+
+
+def _peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of this process in MiB.
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _cuda_in_use():
+    """
+    Returns the torch module if it is already imported and CUDA is
+    initialized, without importing torch.
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_initialized():
+        return torch
+    return None
+
+
+class InstrumentedObjective:
+    """
+    Objective wrapper that records per-trial performance metrics as the
+    `perf` user attribute. Instances are picklable when the wrapped
+    objective is, so they can be passed to worker processes.
+    """
+
+    def __init__(
+        self,
+        objective: Callable[[optuna.Trial], float],
+        device_memory: bool = True,
+    ):
+        """
+        Wraps an objective.
+
+        Args:
+            objective: The objective function to measure.
+            device_memory: Whether to record peak CUDA memory. Disable it
+                when several trials run at once in one process (e.g.
+                `run_packed`), since each trial would reset the peak of
+                the others.
+        """
+        self._objective = objective
+        self._device_memory = device_memory
+
+    def __call__(self, trial: optuna.Trial) -> float:
+        study = trial.study
+        if not isinstance(study.sampler, TimedSampler):
+            # Trials may run on several threads of one study
+            with _sampler_lock:
+                if not isinstance(study.sampler, TimedSampler):
+                    study.sampler = TimedSampler(study.sampler)
+
+        torch = _cuda_in_use() if self._device_memory else None
+        if torch is not None:
+            torch.cuda.reset_peak_memory_stats()
+
+        start = time.perf_counter()
+        try:
+            return self._objective(trial)
+        finally:
+            objective_seconds = time.perf_counter() - start
+            perf = reset_thread_counters()
+            perf["objective_seconds"] = objective_seconds
+            perf["peak_rss_mb"] = _peak_rss_mb()
+            if self._device_memory:
+                torch = torch or _cuda_in_use()
+            if torch is not None:
+                perf["peak_device_mb"] = torch.cuda.max_memory_allocated() / (
+                    1024 * 1024
+                )
+            trial.set_user_attr(PERF_ATTR, perf)
@@ -1,10 +1,28 @@
+import copy
 import datetime
+import json
+import threading
+from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
 from pathlib import Path
-from urllib.parse import quote
+from typing import Any, Callable
 
 import optuna
-from optuna.storages import RDBStorage
+from optuna.storages import BaseStorage, RDBStorage, RetryFailedTrialCallback
+from optuna.storages._rdb import models
+from optuna.study import StudyDirection
+from optuna.trial import TrialState
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session, selectinload
+
+from docktuna.optuna_db.backends import (
+    PostgresBackend,
+    RDBUrlBackend,
+    StorageBackend,
+    read_secret,
+)
+from docktuna.optuna_db.instrumentation import PERF_ATTR, track_queries
+from docktuna.optuna_db.summary_cache import TTLCache
 
 
 @contextmanager
@@ -28,14 +46,39 @@ class OptunaDatabase:
     """
     Handles database interactions for Optuna studies, including secure
     retrieval of credentials from Docker secrets and connection management.
+
+    The storage is PostgreSQL by default, or whatever a `StorageBackend`
+    from `backends` builds (SQLite, journal file or in-memory). A single
+    storage (for RDB storages, a single SQLAlchemy engine and connection
+    pool) is built lazily on first use and reused until `close()` or
+    `reset_storage()` is called. Instances can be used as context managers
+    to release the pool on exit. Lookups run as SQL queries on RDB storages
+    and fall back to Optuna's storage API otherwise.
+
+    Study summaries, best parameters and the set of study names can
+    optionally be cached for `cache_ttl` seconds. Entries for a study are
+    invalidated when this process records a trial through
+    `cache_invalidation_callback`.
     """
 
     def __init__(
         self,
-        username: str,
-        db_password_secret: str,
-        db_name: str,
-        hostname: str,
+        username: str = None,
+        db_password_secret: str = None,
+        db_name: str = None,
+        hostname: str = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 3600,
+        cache_ttl: float | None = None,
+        cache_max_entries: int = 256,
+        instrument: bool = False,
+        backend: StorageBackend | None = None,
+        heartbeat_interval: int | None = None,
+        grace_period: int | None = None,
+        max_retry: int | None = None,
+        failed_trial_callback: Callable | None = None,
     ):
         """
         Initializes an OptunaDatabase instance with database connection details.
@@ -45,11 +88,73 @@ class OptunaDatabase:
             db_password_secret: Secret name for the database password.
             db_name: Name of the database.
             hostname: Database host.
+            pool_size: Number of connections kept open in the pool.
+            max_overflow: Connections allowed beyond `pool_size` under load.
+            pool_pre_ping: Whether to test connections before handing them
+                out, so connections dropped by the server are replaced.
+            pool_recycle: Seconds after which pooled connections are
+                recycled. Use -1 to disable.
+            cache_ttl: Seconds that summary, best-params and study-name
+                lookups are cached. None disables caching.
+            cache_max_entries: Maximum number of cached lookups.
+            instrument: Whether to count and time the SQL statements run
+                through the storage engine (see `instrumentation`).
+            backend: Storage backend to use instead of PostgreSQL. The
+                connection and pool arguments above are then ignored.
+            heartbeat_interval: Seconds between heartbeats that running
+                trials record in RDB storage. None disables heartbeats.
+            grace_period: Seconds without a heartbeat after which a
+                running trial is stale. Defaults to twice the interval.
+            max_retry: If given, trials failed for being stale are
+                re-enqueued with the same parameters up to this many times.
+            failed_trial_callback: Called with the study and trial for each
+                stale trial that is failed. Overrides `max_retry`.
+
+        Raises:
+            ValueError: If heartbeats are enabled for a backend that is not
+                an RDB storage.
         """
         self._username = username
         self._db_password_secret = db_password_secret
         self._db_name = db_name
         self._hostname = hostname
+        self._backend = backend or PostgresBackend(
+            username=username,
+            db_password_secret=db_password_secret,
+            db_name=db_name,
+            hostname=hostname,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+        )
+        if heartbeat_interval is not None and not isinstance(
+            self._backend, RDBUrlBackend
+        ):
+            raise ValueError(
+                f"Heartbeats require RDB storage, not {self._backend!r}"
+            )
+        self._storage = None
+        self._storage_lock = threading.Lock()
+        self._instrument = instrument
+        self._heartbeat_interval = heartbeat_interval
+        self._grace_period = grace_period
+        if failed_trial_callback is None and max_retry is not None:
+            failed_trial_callback = RetryFailedTrialCallback(
+                max_retry=max_retry
+            )
+        self._failed_trial_callback = failed_trial_callback
+        self._cache = (
+            None
+            if cache_ttl is None
+            else TTLCache(ttl=cache_ttl, max_entries=cache_max_entries)
+        )
+
+    def __enter__(self) -> "OptunaDatabase":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _read_secret(self, secret_name: str) -> str:
         """
@@ -64,12 +169,7 @@ class OptunaDatabase:
         Raises:
             Exception: If the secret file is not found.
         """
-        secret_path = Path("/run/secrets") / secret_name
-        try:
-            with secret_path.open(mode="r") as f:
-                return f.read().strip()
-        except FileNotFoundError:
-            raise Exception(f"Secret {secret_name} not found!")
+        return read_secret(secret_name)
 
     @property
     def username(self) -> str:
@@ -87,30 +187,219 @@ class OptunaDatabase:
         return self._hostname
 
     @property
-    def _db_url(self) -> str:
+    def backend(self) -> StorageBackend:
+        """Returns the backend that builds the storage."""
+        return self._backend
+
+    @property
+    def _storage_kwargs(self) -> dict[str, Any]:
         """
-        Constructs a secure database connection URL dynamically
-        using credentials stored in Docker secrets.
+        Keyword arguments passed to the storage constructor.
 
         Returns:
-            The formatted database connection URL.
+            Heartbeat settings, if heartbeats are enabled.
+        """
+        if self._heartbeat_interval is None:
+            return {}
+        return {
+            "heartbeat_interval": self._heartbeat_interval,
+            "grace_period": self._grace_period,
+            "failed_trial_callback": self._failed_trial_callback,
+        }
+
+    def _build_storage(self) -> BaseStorage:
         """
-        user = self._username
-        password = self._read_secret(self._db_password_secret)
-        db_name = self._db_name
-        host = self._hostname
+        Creates a new Optuna storage from the backend.
 
-        return f"postgresql+psycopg2://{user}:{quote(password, safe='')}@{host}/{db_name}"
+        Returns:
+            The newly created storage backend.
+        """
+        storage = self._backend.create_storage(**self._storage_kwargs)
+        if self._instrument and isinstance(storage, RDBStorage):
+            track_queries(storage.engine)
+        return storage
 
     @property
-    def storage(self) -> RDBStorage:
+    def storage(self) -> BaseStorage:
         """
-        Creates an Optuna RDBStorage instance for persistent study storage.
+        Returns the Optuna storage for persistent study storage, creating
+        it on first access.
 
         Returns:
             The Optuna storage backend.
         """
-        return RDBStorage(url=self._db_url)
+        storage = self._storage
+        if storage is None:
+            with self._storage_lock:
+                if self._storage is None:
+                    self._storage = self._build_storage()
+                storage = self._storage
+        return storage
+
+    @property
+    def _is_rdb(self) -> bool:
+        """Whether the storage can be queried with SQL."""
+        return isinstance(self.storage, RDBStorage)
+
+    @staticmethod
+    def _dispose_storage(storage: BaseStorage):
+        """
+        Releases the session and all pooled connections held by a storage.
+        Storages without an engine hold nothing to release.
+
+        Args:
+            storage: The storage to dispose.
+        """
+        if isinstance(storage, RDBStorage):
+            storage.remove_session()
+            storage.engine.dispose()
+
+    def close(self):
+        """
+        Closes all pooled connections. The next access to `storage`
+        creates a fresh storage.
+        """
+        with self._storage_lock:
+            storage, self._storage = self._storage, None
+        if storage is not None:
+            self._dispose_storage(storage)
+
+    def reset_after_fork(self):
+        """
+        Drops the storage inherited from a parent process without closing
+        the parent's connections. Call this in a child process after
+        `os.fork()`; the child builds its own pool on next use.
+        """
+        self._storage_lock = threading.Lock()
+        storage, self._storage = self._storage, None
+        if isinstance(storage, RDBStorage):
+            storage.engine.dispose(close=False)
+
+    def reset_storage(self) -> BaseStorage:
+        """
+        Re-reads the password secret and rebuilds the storage. Use this
+        after the database credentials have been rotated.
+
+        Returns:
+            The newly created storage backend.
+        """
+        with self._storage_lock:
+            old_storage = self._storage
+            self._backend.refresh()
+            self._storage = self._build_storage()
+            storage = self._storage
+        if old_storage is not None and old_storage is not storage:
+            self._dispose_storage(old_storage)
+        return storage
+
+    def _all_trials(self, study_id: int) -> list[optuna.trial.FrozenTrial]:
+        """
+        Fetches the trials of a study through the storage API. Used by
+        storages that cannot be queried with SQL.
+
+        Args:
+            study_id: The id of the study.
+
+        Returns:
+            The trials of the study, not copied.
+        """
+        return self.storage.get_all_trials(study_id, deepcopy=False)
+
+    def _load_trials(self, query) -> list[optuna.trial.FrozenTrial]:
+        """
+        Runs a query for trial rows on RDB storage and builds the trials,
+        loading each related table with one extra query.
+
+        Args:
+            query: A select of `TrialModel` rows.
+
+        Returns:
+            The trials in query order.
+        """
+        trial_model = models.TrialModel
+        with self._session() as session:
+            trial_models = session.scalars(
+                query.options(
+                    selectinload(trial_model.params),
+                    selectinload(trial_model.values),
+                    selectinload(trial_model.user_attributes),
+                    selectinload(trial_model.system_attributes),
+                    selectinload(trial_model.intermediate_values),
+                )
+            ).all()
+            return [
+                self.storage._build_frozen_trial_from_trial_model(model)
+                for model in trial_models
+            ]
+
+    @contextmanager
+    def _session(self):
+        """
+        Opens a short-lived SQLAlchemy session on the storage engine for
+        read queries that Optuna's storage API does not provide.
+
+        Yields:
+            A SQLAlchemy session bound to the pooled engine.
+        """
+        with Session(bind=self.storage.engine) as session:
+            yield session
+
+    def _cached(self, key: tuple, compute):
+        """
+        Returns the result of `compute`, served from the cache when
+        caching is enabled.
+
+        Args:
+            key: The cache key.
+            compute: Function producing the value on a cache miss.
+
+        Returns:
+            The cached or newly computed value.
+        """
+        if self._cache is None:
+            return compute()
+        return self._cache.get_or_compute(key, compute)
+
+    @property
+    def cache_stats(self) -> dict[str, int] | None:
+        """
+        Returns cache hit/miss counters and size.
+
+        Returns:
+            The cache statistics, or None if caching is disabled.
+        """
+        return None if self._cache is None else self._cache.stats
+
+    def clear_cache(self):
+        """Removes all cached lookups."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def invalidate_study(self, study_name: str):
+        """
+        Removes cached lookups that depend on a study's trials.
+
+        Args:
+            study_name: The name of the study that changed.
+        """
+        if self._cache is None:
+            return
+        self._cache.invalidate(("study_summaries",))
+        self._cache.invalidate(("study_summary", study_name))
+        self._cache.invalidate(("best_params", study_name))
+
+    def cache_invalidation_callback(
+        self, study: optuna.Study, trial: optuna.trial.FrozenTrial
+    ):
+        """
+        Optuna callback that invalidates cached lookups for a study after
+        each trial. Pass it to `study.optimize(callbacks=[...])`.
+
+        Args:
+            study: The study the trial belongs to.
+            trial: The finished trial.
+        """
+        self.invalidate_study(study_name=study.study_name)
 
     @property
     def study_summaries(self) -> list[optuna.study.StudySummary]:
@@ -120,7 +409,75 @@ class OptunaDatabase:
         Returns:
             A list of study summaries.
         """
-        return optuna.study.get_all_study_summaries(storage=self.storage)
+        return list(
+            self._cached(
+                ("study_summaries",),
+                lambda: optuna.study.get_all_study_summaries(
+                    storage=self.storage
+                ),
+            )
+        )
+
+    def _study_name_set(self) -> frozenset[str]:
+        """
+        Returns the set of study names, served from the cache when
+        caching is enabled.
+
+        Returns:
+            The names of all studies.
+        """
+        return self._cached(
+            ("study_names",), lambda: frozenset(self.list_study_names())
+        )
+
+    def get_study_id(self, study_name: str) -> int | None:
+        """
+        Looks up a study's id by name using the unique study name index.
+
+        Args:
+            study_name: The name of the study.
+
+        Returns:
+            The study id, or None if the study does not exist.
+        """
+        try:
+            return self.storage.get_study_id_from_name(study_name)
+        except KeyError:
+            return None
+
+    def _require_study_id(self, study_name: str) -> int:
+        """
+        Looks up a study's id by name.
+
+        Args:
+            study_name: The name of the study.
+
+        Returns:
+            The study id.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        study_id = self.get_study_id(study_name=study_name)
+        if study_id is None:
+            raise StopIteration(f"Study {study_name} not found!")
+        return study_id
+
+    def _get_best_trial(self, study_id: int) -> optuna.trial.FrozenTrial:
+        """
+        Fetches only the best trial of a single-objective study.
+
+        Args:
+            study_id: The id of the study.
+
+        Returns:
+            The best trial, or None if the study has no completed trials
+            or has multiple objectives.
+        """
+        try:
+            return self.storage.get_best_trial(study_id)
+        except (ValueError, RuntimeError):
+            return None
 
     def is_in_db(self, study_name: str) -> bool:
         """
@@ -132,13 +489,14 @@ class OptunaDatabase:
         Returns:
             True if the study exists, False otherwise.
         """
-        return study_name in {
-            summary.study_name for summary in self.study_summaries
-        }
+        if self._cache is not None:
+            return study_name in self._study_name_set()
+        return self.get_study_id(study_name=study_name) is not None
 
     def get_study_summary(self, study_name: str) -> optuna.study.StudySummary:
         """
-        Retrieves the summary of a specific study.
+        Retrieves the summary of a specific study without computing
+        summaries for any other study.
 
         Args:
             study_name: The name of the study.
@@ -149,26 +507,157 @@ class OptunaDatabase:
         Raises:
             StopIteration: If the study is not found.
         """
-        return next(
-            summary
-            for summary in self.study_summaries
-            if summary.study_name == study_name
+        return self._cached(
+            ("study_summary", study_name),
+            lambda: self._load_study_summary(study_name=study_name),
+        )
+
+    def _load_study_summary(
+        self, study_name: str
+    ) -> optuna.study.StudySummary:
+        """
+        Builds the summary of a single study from the database.
+
+        Args:
+            study_name: The name of the study.
+
+        Returns:
+            The summary of the study.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        study_id = self._require_study_id(study_name=study_name)
+        storage = self.storage
+        if self._is_rdb:
+            with self._session() as session:
+                n_trials, datetime_start = session.execute(
+                    select(
+                        func.count(models.TrialModel.trial_id),
+                        func.min(models.TrialModel.datetime_start),
+                    ).where(models.TrialModel.study_id == study_id)
+                ).one()
+        else:
+            trials = self._all_trials(study_id=study_id)
+            n_trials = len(trials)
+            datetime_start = min(
+                (
+                    trial.datetime_start
+                    for trial in trials
+                    if trial.datetime_start
+                ),
+                default=None,
+            )
+        return optuna.study.StudySummary(
+            study_name=study_name,
+            direction=None,
+            directions=storage.get_study_directions(study_id),
+            best_trial=self._get_best_trial(study_id=study_id),
+            user_attrs=storage.get_study_user_attrs(study_id),
+            system_attrs=storage.get_study_system_attrs(study_id),
+            n_trials=n_trials,
+            datetime_start=datetime_start,
+            study_id=study_id,
         )
 
     def get_best_params(self, study_name: str) -> dict[str, any]:
         """
-        Retrieves the best hyperparameters from a completed study.
+        Retrieves the best hyperparameters from a completed study. Only the
+        best trial of the named study is loaded.
 
         Args:
             study_name: The name of the study.
 
         Returns:
             The best hyperparameters, or an empty dictionary if no trials exist.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        return dict(
+            self._cached(
+                ("best_params", study_name),
+                lambda: self._load_best_params(study_name=study_name),
+            )
+        )
+
+    def _load_best_params(self, study_name: str) -> dict[str, Any]:
         """
-        study_summary = self.get_study_summary(study_name=study_name)
-        if study_summary is None or study_summary.best_trial is None:
+        Fetches the best hyperparameters of a study from the database.
+
+        Args:
+            study_name: The name of the study.
+
+        Returns:
+            The best hyperparameters, or an empty dictionary if no trials exist.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        study_id = self._require_study_id(study_name=study_name)
+        best_trial = self._get_best_trial(study_id=study_id)
+        if best_trial is None:
             return {}
-        return study_summary.best_trial.params
+        return best_trial.params
+
+    def get_top_trials(
+        self, study_name: str, k: int
+    ) -> list[optuna.trial.FrozenTrial]:
+        """
+        Fetches the best completed trials of a single-objective study. With
+        RDB storage the ranking and limit run in the database, so only the
+        `k` returned trials are loaded.
+
+        Args:
+            study_name: The name of the study.
+            k: Maximum number of trials to return.
+
+        Returns:
+            Up to `k` completed trials, best first.
+
+        Raises:
+            StopIteration: If the study is not found.
+            ValueError: If the study has multiple objectives.
+        """
+        study_id = self._require_study_id(study_name=study_name)
+        directions = self.storage.get_study_directions(study_id)
+        if len(directions) != 1:
+            raise ValueError(
+                f"Study {study_name} has multiple objectives; "
+                "top trials are undefined"
+            )
+        maximize = directions[0] == StudyDirection.MAXIMIZE
+        if not self._is_rdb:
+            completed = self.storage.get_all_trials(
+                study_id, deepcopy=False, states=(TrialState.COMPLETE,)
+            )
+            return copy.deepcopy(
+                sorted(completed, key=lambda t: t.value, reverse=maximize)[:k]
+            )
+
+        trial_model = models.TrialModel
+        value_model = models.TrialValueModel
+        # Infinite values are stored as NULL with their sign in value_type
+        rank = case(
+            {"INF_NEG": -1, "FINITE": 0, "INF_POS": 1},
+            value=value_model.value_type,
+        )
+        order = (
+            (rank.desc(), value_model.value.desc())
+            if maximize
+            else (rank, value_model.value)
+        )
+        return self._load_trials(
+            select(trial_model)
+            .join(value_model, value_model.trial_id == trial_model.trial_id)
+            .where(
+                trial_model.study_id == study_id,
+                trial_model.state == TrialState.COMPLETE,
+                value_model.objective == 0,
+            )
+            .order_by(*order, trial_model.trial_id)
+            .limit(k)
+        )
 
     def get_study(self, study_name: str) -> optuna.Study:
         """
@@ -181,11 +670,70 @@ class OptunaDatabase:
             The retrieved or newly created study.
         """
         with temporary_optuna_verbosity(logging_level=optuna.logging.WARNING):
-            return optuna.create_study(
+            study = optuna.create_study(
                 study_name=study_name,
                 storage=self.storage,
                 load_if_exists=True,
             )
+        if self._cache is not None:
+            self._cache.invalidate(("study_names",))
+        return study
+
+    def list_study_names(self) -> list[str]:
+        """
+        Retrieves the names of all studies in a single query, without
+        loading trials or building Study objects.
+
+        Returns:
+            Study names ordered by study id.
+        """
+        if not self._is_rdb:
+            return [
+                study.study_name for study in self.storage.get_all_studies()
+            ]
+        with self._session() as session:
+            return list(
+                session.scalars(
+                    select(models.StudyModel.study_name).order_by(
+                        models.StudyModel.study_id
+                    )
+                )
+            )
+
+    def count_studies(self) -> int:
+        """
+        Counts the studies in the database with a single query.
+
+        Returns:
+            The total number of studies.
+        """
+        if not self._is_rdb:
+            return len(self.storage.get_all_studies())
+        with self._session() as session:
+            return session.scalar(
+                select(func.count(models.StudyModel.study_id))
+            )
+
+    def iter_studies(self) -> Iterator[optuna.Study]:
+        """
+        Lazily yields the studies in the database. Each Study is only
+        loaded when the iterator reaches it, and studies deleted after the
+        names were listed are skipped.
+
+        Yields:
+            Optuna studies, ordered by study id.
+        """
+        for study_name in self.list_study_names():
+            with temporary_optuna_verbosity(
+                logging_level=optuna.logging.WARNING
+            ):
+                try:
+                    study = optuna.load_study(
+                        study_name=study_name, storage=self.storage
+                    )
+                except KeyError:
+                    continue
+            yield study
 
     def get_all_studies(self) -> list[optuna.Study]:
         """
@@ -194,13 +742,7 @@ class OptunaDatabase:
         Returns:
             A list of all Optuna studies.
         """
-        with temporary_optuna_verbosity(logging_level=optuna.logging.WARNING):
-            return [
-                self.get_study(study_name)
-                for study_name in {
-                    summary.study_name for summary in self.study_summaries
-                }
-            ]
+        return list(self.iter_studies())
 
     @property
     def num_existing_studies(self) -> int:
@@ -210,7 +752,7 @@ class OptunaDatabase:
         Returns:
             The total number of studies.
         """
-        return len(self.get_all_studies())
+        return self.count_studies()
 
     @staticmethod
     def get_last_update_time(study: optuna.Study) -> datetime.datetime:
@@ -235,17 +777,534 @@ class OptunaDatabase:
             else datetime.datetime(1, 1, 1)
         )
 
+    def get_last_update_time_from_id(self, study_id: int) -> datetime.datetime:
+        """
+        Retrieves the last update time of a study with a single aggregate
+        query, without loading any trials.
+
+        Args:
+            study_id: The id of the study.
+
+        Returns:
+            The timestamp of the most recent trial completion,
+            or a default old date if no trials exist.
+        """
+        if self._is_rdb:
+            with self._session() as session:
+                last_complete = session.scalar(
+                    select(
+                        func.max(models.TrialModel.datetime_complete)
+                    ).where(models.TrialModel.study_id == study_id)
+                )
+        else:
+            last_complete = max(
+                (
+                    trial.datetime_complete
+                    for trial in self._all_trials(study_id=study_id)
+                    if trial.datetime_complete
+                ),
+                default=None,
+            )
+        return last_complete or datetime.datetime(1, 1, 1)
+
+    def get_trials_since(
+        self,
+        study_name: str,
+        after_trial_id: int = -1,
+        finished_since: datetime.datetime | None = None,
+        trial_ids: Iterable[int] = (),
+    ) -> list[optuna.trial.FrozenTrial]:
+        """
+        Fetches only the trials of a study that were created or finished
+        since a cursor, so a poller pays for the new trials instead of
+        re-reading the whole study. With RDB storage this is one query plus
+        one query per trial table, restricted to the matching trials.
+
+        Args:
+            study_name: The name of the study.
+            after_trial_id: Trials with a larger trial id are returned.
+                Trial ids grow in creation order; -1 returns every trial.
+            finished_since: If given, trials completed at or after this
+                time are returned too.
+            trial_ids: Ids of trials that were unfinished at the last poll.
+                Those that have finished since are returned too. Unlike
+                `finished_since`, this does not rely on worker clocks.
+
+        Returns:
+            The matching trials, ordered by trial id.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        study_id = self._require_study_id(study_name=study_name)
+        trial_ids = set(trial_ids)
+        if not self._is_rdb:
+            return [
+                copy.deepcopy(trial)
+                for trial in self._all_trials(study_id=study_id)
+                if trial._trial_id > after_trial_id
+                or trial.state.is_finished()
+                and (
+                    trial._trial_id in trial_ids
+                    or finished_since is not None
+                    and trial.datetime_complete >= finished_since
+                )
+            ]
+
+        trial_model = models.TrialModel
+        conditions = [trial_model.trial_id > after_trial_id]
+        if finished_since is not None:
+            conditions.append(trial_model.datetime_complete >= finished_since)
+        if trial_ids:
+            conditions.append(
+                and_(
+                    trial_model.trial_id.in_(trial_ids),
+                    trial_model.state.in_(
+                        [state for state in TrialState if state.is_finished()]
+                    ),
+                )
+            )
+        return self._load_trials(
+            select(trial_model)
+            .where(trial_model.study_id == study_id, or_(*conditions))
+            .order_by(trial_model.trial_id)
+        )
+
+    def _get_latest_study_name(self) -> str | None:
+        """
+        Finds the study with the most recent trial completion using one
+        grouped query. Studies without completed trials sort last.
+
+        Returns:
+            The name of the latest study, or None if no studies exist.
+        """
+        last_complete = func.max(models.TrialModel.datetime_complete)
+        with self._session() as session:
+            return session.scalar(
+                select(models.StudyModel.study_name)
+                .outerjoin(
+                    models.TrialModel,
+                    models.TrialModel.study_id == models.StudyModel.study_id,
+                )
+                .group_by(
+                    models.StudyModel.study_id, models.StudyModel.study_name
+                )
+                .order_by(
+                    last_complete.desc().nulls_last(),
+                    models.StudyModel.study_id.desc(),
+                )
+                .limit(1)
+            )
+
     def get_latest_study(self) -> optuna.Study:
         """
-        Retrieves the most recently updated study.
+        Retrieves the most recently updated study. With RDB storage the
+        latest study is resolved in the database and only that study is
+        loaded; other storages fall back to comparing every study's trials.
 
         Returns:
             The study with the most recent completed trial,
             or None if no studies exist.
         """
+        if isinstance(self.storage, RDBStorage):
+            study_name = self._get_latest_study_name()
+            return (
+                None
+                if study_name is None
+                else self.get_study(study_name=study_name)
+            )
         sorted_studies = sorted(
             self.get_all_studies(),
             key=lambda x: self.get_last_update_time(x),
             reverse=True,
         )
         return sorted_studies[0] if sorted_studies else None
+
+    @staticmethod
+    def _summarize(values: list[float]) -> dict[str, float]:
+        """
+        Computes summary statistics of a list of measurements.
+
+        Args:
+            values: The measurements.
+
+        Returns:
+            Count, mean, median, 95th percentile and maximum.
+        """
+        values = sorted(values)
+
+        def percentile(q: float) -> float:
+            return values[min(len(values) - 1, round(q * (len(values) - 1)))]
+
+        return {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": values[-1],
+        }
+
+    def get_performance_report(
+        self, study_name: str
+    ) -> dict[str, dict[str, float]]:
+        """
+        Aggregates the per-trial performance metrics recorded by
+        `InstrumentedObjective`. Only the `perf` user attributes are read;
+        trials are not loaded.
+
+        Args:
+            study_name: The name of the study.
+
+        Returns:
+            Summary statistics for each recorded metric, or an empty
+            dictionary if no trial was instrumented.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        study_id = self._require_study_id(study_name=study_name)
+        if self._is_rdb:
+            with self._session() as session:
+                perf_values = [
+                    json.loads(value_json)
+                    for value_json in session.scalars(
+                        select(models.TrialUserAttributeModel.value_json)
+                        .join(
+                            models.TrialModel,
+                            models.TrialModel.trial_id
+                            == models.TrialUserAttributeModel.trial_id,
+                        )
+                        .where(
+                            models.TrialModel.study_id == study_id,
+                            models.TrialUserAttributeModel.key == PERF_ATTR,
+                        )
+                    )
+                ]
+        else:
+            perf_values = [
+                trial.user_attrs[PERF_ATTR]
+                for trial in self._all_trials(study_id=study_id)
+                if PERF_ATTR in trial.user_attrs
+            ]
+
+        metrics: dict[str, list[float]] = {}
+        for perf in perf_values:
+            for name, value in perf.items():
+                metrics.setdefault(name, []).append(value)
+        return {
+            name: self._summarize(values) for name, values in metrics.items()
+        }
+
+    def count_trials_by_state(self) -> dict[str, dict[str, int]]:
+        """
+        Counts the trials of every study by state with one grouped query.
+
+        Returns:
+            For each study name, the number of trials in each state
+            (e.g. RUNNING, COMPLETE, PRUNED, FAIL).
+        """
+        if not self._is_rdb:
+            counts: dict[str, dict[str, int]] = {}
+            for study in self.storage.get_all_studies():
+                states = counts.setdefault(study.study_name, {})
+                for trial in self._all_trials(study_id=study._study_id):
+                    state = trial.state.name
+                    states[state] = states.get(state, 0) + 1
+                if not states:
+                    del counts[study.study_name]
+            return counts
+        with self._session() as session:
+            rows = session.execute(
+                select(
+                    models.StudyModel.study_name,
+                    models.TrialModel.state,
+                    func.count(models.TrialModel.trial_id),
+                )
+                .join(
+                    models.TrialModel,
+                    models.TrialModel.study_id == models.StudyModel.study_id,
+                )
+                .group_by(
+                    models.StudyModel.study_name, models.TrialModel.state
+                )
+            ).all()
+        counts: dict[str, dict[str, int]] = {}
+        for study_name, state, count in rows:
+            counts.setdefault(study_name, {})[state.name] = count
+        return counts
+
+    def count_trials_finished_since(
+        self, since: datetime.datetime
+    ) -> dict[str, int]:
+        """
+        Counts the trials of every study that finished after a given time,
+        with one grouped query.
+
+        Args:
+            since: Only trials with a later `datetime_complete` are counted.
+
+        Returns:
+            For each study with recently finished trials, their number.
+        """
+        if not self._is_rdb:
+            finished = {}
+            for study in self.storage.get_all_studies():
+                count = sum(
+                    1
+                    for trial in self._all_trials(study_id=study._study_id)
+                    if trial.datetime_complete
+                    and trial.datetime_complete > since
+                )
+                if count:
+                    finished[study.study_name] = count
+            return finished
+        with self._session() as session:
+            rows = session.execute(
+                select(
+                    models.StudyModel.study_name,
+                    func.count(models.TrialModel.trial_id),
+                )
+                .join(
+                    models.TrialModel,
+                    models.TrialModel.study_id == models.StudyModel.study_id,
+                )
+                .where(models.TrialModel.datetime_complete > since)
+                .group_by(models.StudyModel.study_name)
+            ).all()
+        return dict(rows)
+
+    @property
+    def pool_status(self) -> dict[str, int]:
+        """
+        Reports the connection pool usage of the storage engine.
+
+        Returns:
+            Pool size, connections checked out and overflow connections
+            in use. Empty if the storage has no pool or the pool does not
+            expose these numbers.
+        """
+        if not self._is_rdb:
+            return {}
+        pool = self.storage.engine.pool
+        if not all(
+            hasattr(pool, name) for name in ("size", "checkedout", "overflow")
+        ):
+            return {}
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    def _find_stale_trials(
+        self, grace_period: float | None, max_runtime: float | None
+    ) -> list[tuple[str, int]]:
+        """
+        Finds running trials of all studies that no process is evaluating
+        any more, with one query on RDB storage.
+
+        Args:
+            grace_period: Seconds since the last heartbeat after which a
+                trial is stale, or None to ignore heartbeats.
+            max_runtime: Seconds since the start after which a trial
+                without heartbeats is stale, or None to ignore such trials.
+
+        Returns:
+            The study name and trial id of each stale trial.
+        """
+        started_before = (
+            None
+            if max_runtime is None
+            else datetime.datetime.now()
+            - datetime.timedelta(seconds=max_runtime)
+        )
+        if not self._is_rdb:
+            return [
+                (study.study_name, trial._trial_id)
+                for study in self.storage.get_all_studies()
+                for trial in self.storage.get_all_trials(
+                    study._study_id,
+                    deepcopy=False,
+                    states=(TrialState.RUNNING,),
+                )
+                if started_before is not None
+                and trial.datetime_start < started_before
+            ]
+
+        heartbeat = models.TrialHeartbeatModel.heartbeat
+        conditions = []
+        with self._session() as session:
+            if grace_period is not None:
+                # Heartbeats are recorded with the database clock
+                now = session.scalar(select(func.current_timestamp()))
+                stale_before = now.replace(tzinfo=None) - datetime.timedelta(
+                    seconds=grace_period
+                )
+                conditions.append(
+                    and_(heartbeat.is_not(None), heartbeat < stale_before)
+                )
+            if started_before is not None:
+                conditions.append(
+                    and_(
+                        heartbeat.is_(None),
+                        models.TrialModel.datetime_start < started_before,
+                    )
+                )
+            if not conditions:
+                return []
+            return session.execute(
+                select(
+                    models.StudyModel.study_name, models.TrialModel.trial_id
+                )
+                .join(
+                    models.TrialModel,
+                    models.TrialModel.study_id == models.StudyModel.study_id,
+                )
+                .outerjoin(
+                    models.TrialHeartbeatModel,
+                    models.TrialHeartbeatModel.trial_id
+                    == models.TrialModel.trial_id,
+                )
+                .where(
+                    models.TrialModel.state == TrialState.RUNNING,
+                    or_(*conditions),
+                )
+            ).all()
+
+    def reap_stale_trials(
+        self,
+        grace_period: float | None = None,
+        max_runtime: float | None = None,
+    ) -> dict[str, list[int]]:
+        """
+        Fails the stale running trials of all studies in one pass, so trials
+        of workers that died do not stay RUNNING. Each failed trial is
+        passed to the failed-trial callback, which with `max_retry`
+        re-enqueues its parameters.
+
+        Args:
+            grace_period: Seconds without a heartbeat after which a trial is
+                stale. Defaults to the configured grace period, or twice the
+                heartbeat interval.
+            max_runtime: If given, trials that never recorded a heartbeat
+                are stale once they have run this many seconds.
+
+        Returns:
+            The numbers of the failed trials, by study name.
+
+        Raises:
+            ValueError: If no grace period can be derived (no heartbeat
+                interval is configured) and `max_runtime` is not given.
+        """
+        if grace_period is None and self._heartbeat_interval is not None:
+            grace_period = self._grace_period or 2 * self._heartbeat_interval
+        if grace_period is None and max_runtime is None:
+            raise ValueError(
+                "Reaping stale trials requires a grace period, a heartbeat "
+                "interval or max_runtime."
+            )
+
+        storage = self.storage
+        studies: dict[str, optuna.Study] = {}
+        reaped: dict[str, list[int]] = {}
+        for study_name, trial_id in self._find_stale_trials(
+            grace_period=grace_period, max_runtime=max_runtime
+        ):
+            try:
+                if not storage.set_trial_state_values(
+                    trial_id, state=TrialState.FAIL
+                ):
+                    continue
+            except RuntimeError:
+                # The trial finished after it was found stale
+                continue
+            trial = storage.get_trial(trial_id)
+            reaped.setdefault(study_name, []).append(trial.number)
+            if self._failed_trial_callback is not None:
+                if study_name not in studies:
+                    studies[study_name] = optuna.load_study(
+                        study_name=study_name, storage=storage
+                    )
+                self._failed_trial_callback(studies[study_name], trial)
+            self.invalidate_study(study_name=study_name)
+        return reaped
+
+    def export_study(
+        self, study_name: str, path: Path | str, chunk_size: int = 1000
+    ) -> int:
+        """
+        Streams the trials of a study to a CSV or Parquet file in chunks,
+        without loading the study (see `export`).
+
+        Args:
+            study_name: The name of the study.
+            path: The output file, ending in .csv or .parquet.
+            chunk_size: Trials read and written at a time.
+
+        Returns:
+            The number of exported trials.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        from docktuna.optuna_db.export import export_study
+
+        return export_study(
+            self, study_name=study_name, path=path, chunk_size=chunk_size
+        )
+
+    def export_studies(
+        self,
+        directory: Path | str,
+        study_names: list[str] | None = None,
+        file_format: str = "parquet",
+        chunk_size: int = 1000,
+    ) -> list[Path]:
+        """
+        Exports several studies, one file per study.
+
+        Args:
+            directory: The output directory.
+            study_names: The studies to export. Defaults to all studies.
+            file_format: "csv" or "parquet".
+            chunk_size: Trials read and written at a time.
+
+        Returns:
+            The written files.
+        """
+        from docktuna.optuna_db.export import export_studies
+
+        return export_studies(
+            self,
+            directory=directory,
+            study_names=study_names,
+            file_format=file_format,
+            chunk_size=chunk_size,
+        )
+
+    def import_study(
+        self,
+        path: Path | str,
+        study_name: str | None = None,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Loads a study written by `export_study`, inserting trials in
+        batches of one transaction each.
+
+        Args:
+            path: The export file.
+            study_name: Name of the new study. Defaults to the exported name.
+            batch_size: Trials inserted per transaction.
+
+        Returns:
+            The number of imported trials.
+
+        Raises:
+            optuna.exceptions.DuplicatedStudyError: If the study exists.
+        """
+        from docktuna.optuna_db.export import import_study
+
+        return import_study(
+            self, path=path, study_name=study_name, batch_size=batch_size
+        )
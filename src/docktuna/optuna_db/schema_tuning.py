@@ -0,0 +1,499 @@
+"""
+Index and autovacuum tuning for the Optuna RDB schema.
+
+Optuna's schema only indexes primary keys, `studies.study_name`,
+`trials.study_id` and its unique constraints. The queries OptunaDatabase
+runs most (trial counts by study and state, the latest
+`datetime_complete` of a study, best value by study, parameters by name)
+otherwise scan every trial of a study or of the database. This module
+adds indexes for them and, on PostgreSQL, more aggressive autovacuum
+settings for the frequently updated trial tables. Both can be rolled back.
+
+All indexes are named `ix_docktuna_*` and created with `IF NOT EXISTS`
+(and `CONCURRENTLY` on PostgreSQL, so running studies are not blocked),
+so applying twice is harmless. `apply` and `rollback` report the median
+timings of the main OptunaDatabase operations before and after the change.
+
+Usage:
+    python -m docktuna.optuna_db.schema_tuning inspect
+    python -m docktuna.optuna_db.schema_tuning apply --repeats 10
+    python -m docktuna.optuna_db.schema_tuning rollback
+"""
+
+import argparse
+import datetime
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+import sqlalchemy
+from optuna.storages._rdb import models
+from sqlalchemy import func, select, text
+
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+INDEX_PREFIX = "ix_docktuna_"
+
+# Index name -> (table, columns, columns covered on PostgreSQL)
+INDEXES = {
+    # count_trials_by_state, RUNNING/WAITING trial lookups, reaping
+    "ix_docktuna_trials_study_state": ("trials", ("study_id", "state"), ()),
+    # Last update time and latest study, finished-since trial deltas
+    "ix_docktuna_trials_study_complete": (
+        "trials",
+        ("study_id", "datetime_complete"),
+        (),
+    ),
+    # Trials finished since a time, across all studies
+    "ix_docktuna_trials_complete": ("trials", ("datetime_complete",), ()),
+    # Best value by study: the value join is answered from the index
+    "ix_docktuna_trial_values_trial_objective": (
+        "trial_values",
+        ("trial_id", "objective"),
+        ("value", "value_type"),
+    ),
+    # Parameter lookup by name
+    "ix_docktuna_trial_params_name": (
+        "trial_params",
+        ("param_name", "trial_id"),
+        ("param_value",),
+    ),
+}
+
+# Without included columns this would duplicate the unique constraint
+POSTGRES_ONLY = {"ix_docktuna_trial_values_trial_objective"}
+
+# Table -> storage parameters. Trial rows are updated several times while
+# a trial runs and heartbeats are rewritten every interval, so dead rows
+# pile up long before the default 20% threshold triggers a vacuum.
+AUTOVACUUM = {
+    "trials": {
+        "autovacuum_vacuum_scale_factor": 0.05,
+        "autovacuum_analyze_scale_factor": 0.02,
+    },
+    "trial_values": {
+        "autovacuum_vacuum_scale_factor": 0.05,
+        "autovacuum_analyze_scale_factor": 0.02,
+    },
+    "trial_params": {
+        "autovacuum_vacuum_scale_factor": 0.05,
+        "autovacuum_analyze_scale_factor": 0.02,
+    },
+    "trial_intermediate_values": {
+        "autovacuum_vacuum_scale_factor": 0.05,
+        "autovacuum_analyze_scale_factor": 0.02,
+    },
+    "trial_heartbeats": {
+        "autovacuum_vacuum_scale_factor": 0.01,
+        "autovacuum_analyze_scale_factor": 0.05,
+    },
+}
+
+
+def _engine(optuna_db: OptunaDatabase) -> sqlalchemy.Engine:
+    """
+    Returns the engine of an RDB-backed database.
+
+    Raises:
+        ValueError: If the database does not use RDB storage.
+    """
+    if not optuna_db._is_rdb:
+        raise ValueError("Schema tuning requires RDB storage")
+    return optuna_db.storage.engine
+
+
+def _is_postgres(engine: sqlalchemy.Engine) -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def _indexes(engine: sqlalchemy.Engine) -> dict[str, tuple]:
+    """Returns the docktuna indexes used with the engine's dialect."""
+    return {
+        name: definition
+        for name, definition in INDEXES.items()
+        if _is_postgres(engine) or name not in POSTGRES_ONLY
+    }
+
+
+def _execute(engine: sqlalchemy.Engine, statements: list[str]):
+    """
+    Runs DDL statements outside a transaction, as PostgreSQL requires for
+    concurrent index builds.
+
+    Args:
+        engine: The engine to run the statements on.
+        statements: The SQL statements.
+    """
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def inspect_schema(optuna_db: OptunaDatabase) -> dict[str, Any]:
+    """
+    Reports the tuning state of the database.
+
+    Args:
+        optuna_db: The database to inspect.
+
+    Returns:
+        The dialect, which docktuna indexes exist, the other indexes of the
+        tuned tables, row counts and, on PostgreSQL, the table storage
+        parameters.
+
+    Raises:
+        ValueError: If the database does not use RDB storage.
+    """
+    engine = _engine(optuna_db)
+    inspector = sqlalchemy.inspect(engine)
+    tables = sorted(
+        {table for table, _, _ in INDEXES.values()} | set(AUTOVACUUM)
+    )
+    existing = {
+        table: [index["name"] for index in inspector.get_indexes(table)]
+        for table in tables
+    }
+    report = {
+        "dialect": engine.dialect.name,
+        "docktuna_indexes": {
+            name: name in existing[table]
+            for name, (table, _, _) in _indexes(engine).items()
+        },
+        "other_indexes": {
+            table: [
+                name for name in names if not name.startswith(INDEX_PREFIX)
+            ]
+            for table, names in existing.items()
+        },
+    }
+    with engine.connect() as connection:
+        report["row_counts"] = {
+            table: connection.scalar(
+                select(func.count()).select_from(sqlalchemy.table(table))
+            )
+            for table in tables
+        }
+        if _is_postgres(engine):
+            rows = connection.execute(
+                text(
+                    "SELECT relname, reloptions FROM pg_class "
+                    "WHERE relname = ANY(:tables)"
+                ),
+                {"tables": tables},
+            )
+            report["storage_parameters"] = {
+                relname: reloptions or [] for relname, reloptions in rows
+            }
+    return report
+
+
+def tuning_statements(
+    engine: sqlalchemy.Engine, autovacuum: bool = True
+) -> list[str]:
+    """
+    Builds the statements that apply the tuning.
+
+    Args:
+        engine: The engine whose dialect the statements are written for.
+        autovacuum: Whether to include the autovacuum settings. They are
+            only used on PostgreSQL.
+
+    Returns:
+        The SQL statements.
+    """
+    postgres = _is_postgres(engine)
+    statements = []
+    for name, (table, columns, include) in _indexes(engine).items():
+        statement = (
+            f"CREATE INDEX {'CONCURRENTLY ' if postgres else ''}"
+            f"IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+        if postgres and include:
+            statement += f" INCLUDE ({', '.join(include)})"
+        statements.append(statement)
+    if postgres and autovacuum:
+        for table, settings in AUTOVACUUM.items():
+            options = ", ".join(
+                f"{option} = {value}" for option, value in settings.items()
+            )
+            statements.append(f"ALTER TABLE {table} SET ({options})")
+    statements += [
+        f"ANALYZE {table}"
+        for table in sorted({table for table, _, _ in INDEXES.values()})
+    ]
+    return statements
+
+
+def rollback_statements(engine: sqlalchemy.Engine) -> list[str]:
+    """
+    Builds the statements that remove the tuning.
+
+    Args:
+        engine: The engine whose dialect the statements are written for.
+
+    Returns:
+        The SQL statements.
+    """
+    postgres = _is_postgres(engine)
+    statements = [
+        f"DROP INDEX {'CONCURRENTLY ' if postgres else ''}IF EXISTS {name}"
+        for name in INDEXES
+    ]
+    if postgres:
+        statements += [
+            f"ALTER TABLE {table} RESET ({', '.join(settings)})"
+            for table, settings in AUTOVACUUM.items()
+        ]
+    return statements
+
+
+def apply_tuning(
+    optuna_db: OptunaDatabase, autovacuum: bool = True
+) -> list[str]:
+    """
+    Creates the docktuna indexes and sets the autovacuum parameters.
+
+    Args:
+        optuna_db: The database to tune.
+        autovacuum: Whether to change the autovacuum settings (PostgreSQL).
+
+    Returns:
+        The statements that were run.
+
+    Raises:
+        ValueError: If the database does not use RDB storage.
+    """
+    engine = _engine(optuna_db)
+    statements = tuning_statements(engine, autovacuum=autovacuum)
+    _execute(engine, statements)
+    return statements
+
+
+def rollback_tuning(optuna_db: OptunaDatabase) -> list[str]:
+    """
+    Drops the docktuna indexes and resets the autovacuum parameters.
+
+    Args:
+        optuna_db: The database to restore.
+
+    Returns:
+        The statements that were run.
+
+    Raises:
+        ValueError: If the database does not use RDB storage.
+    """
+    engine = _engine(optuna_db)
+    statements = rollback_statements(engine)
+    _execute(engine, statements)
+    return statements
+
+
+def _param_values(
+    optuna_db: OptunaDatabase, study_id: int, param_name: str
+) -> list[float]:
+    """Fetches the values of one parameter across a study's trials."""
+    with optuna_db._session() as session:
+        return session.scalars(
+            select(models.TrialParamModel.param_value)
+            .join(
+                models.TrialModel,
+                models.TrialModel.trial_id == models.TrialParamModel.trial_id,
+            )
+            .where(
+                models.TrialModel.study_id == study_id,
+                models.TrialParamModel.param_name == param_name,
+            )
+        ).all()
+
+
+def _operations(
+    optuna_db: OptunaDatabase, study_name: str | None
+) -> dict[str, Callable]:
+    """
+    Lists the timed operations.
+
+    Args:
+        optuna_db: The database to query.
+        study_name: The study used by per-study operations. Defaults to
+            the latest study.
+
+    Returns:
+        Operation names mapped to functions running them.
+    """
+    since = datetime.datetime.now() - datetime.timedelta(hours=1)
+    operations = {
+        "count_trials_by_state": optuna_db.count_trials_by_state,
+        "count_trials_finished_since": lambda: (
+            optuna_db.count_trials_finished_since(since)
+        ),
+        "get_latest_study": optuna_db.get_latest_study,
+    }
+    study_name = study_name or optuna_db._get_latest_study_name()
+    if study_name is None:
+        return operations
+
+    study_id = optuna_db._require_study_id(study_name=study_name)
+    with optuna_db._session() as session:
+        last_trial_id = session.scalar(
+            select(func.max(models.TrialModel.trial_id)).where(
+                models.TrialModel.study_id == study_id
+            )
+        )
+        param_name = session.scalar(
+            select(models.TrialParamModel.param_name)
+            .join(
+                models.TrialModel,
+                models.TrialModel.trial_id == models.TrialParamModel.trial_id,
+            )
+            .where(models.TrialModel.study_id == study_id)
+            .limit(1)
+        )
+    operations.update(
+        {
+            "get_last_update_time": lambda: (
+                optuna_db.get_last_update_time_from_id(study_id)
+            ),
+            "get_best_params": lambda: optuna_db.get_best_params(study_name),
+            "get_trials_since": lambda: optuna_db.get_trials_since(
+                study_name,
+                after_trial_id=-1 if last_trial_id is None else last_trial_id,
+                finished_since=since,
+            ),
+        }
+    )
+    if param_name is not None:
+        operations["param_values_by_name"] = lambda: _param_values(
+            optuna_db, study_id, param_name
+        )
+    return operations
+
+
+def time_operations(
+    optuna_db: OptunaDatabase, repeats: int = 5, study_name: str | None = None
+) -> dict[str, float]:
+    """
+    Times the main OptunaDatabase operations. The result cache is cleared
+    before each call so every call reaches the database.
+
+    Args:
+        optuna_db: The database to query.
+        repeats: Number of timed calls of each operation.
+        study_name: The study used by per-study operations. Defaults to
+            the latest study.
+
+    Returns:
+        The median seconds of each operation.
+
+    Raises:
+        ValueError: If the database does not use RDB storage.
+    """
+    _engine(optuna_db)
+    timings = {}
+    for name, operation in _operations(optuna_db, study_name).items():
+        seconds = []
+        for _ in range(repeats):
+            optuna_db.clear_cache()
+            start = time.perf_counter()
+            operation()
+            seconds.append(time.perf_counter() - start)
+        timings[name] = statistics.median(seconds)
+    return timings
+
+
+def _compare(
+    before: dict[str, float], after: dict[str, float]
+) -> dict[str, dict[str, float]]:
+    return {
+        name: {
+            "before": before[name],
+            "after": after[name],
+            "speedup": before[name] / after[name] if after[name] else None,
+        }
+        for name in before
+    }
+
+
+def main(
+    action: str,
+    repeats: int = 5,
+    study_name: str | None = None,
+    autovacuum: bool = True,
+    optuna_db: OptunaDatabase | None = None,
+) -> dict[str, Any]:
+    """
+    Runs a tuning command.
+
+    Args:
+        action: "inspect", "apply" or "rollback".
+        repeats: Number of timed calls of each operation.
+        study_name: The study used by per-study timings.
+        autovacuum: Whether `apply` changes the autovacuum settings.
+        optuna_db: The database. Defaults to `get_optuna_db()`.
+
+    Returns:
+        The inspection report, or for "apply" and "rollback" the executed
+        statements and the operation timings before and after.
+
+    Raises:
+        ValueError: If the action is unknown.
+    """
+    if optuna_db is None:
+        from docktuna.optuna_db.db_instance import get_optuna_db
+
+        optuna_db = get_optuna_db()
+
+    if action == "inspect":
+        return inspect_schema(optuna_db)
+    if action not in ("apply", "rollback"):
+        raise ValueError(f"Unknown action {action}")
+
+    before = time_operations(optuna_db, repeats=repeats, study_name=study_name)
+    if action == "apply":
+        statements = apply_tuning(optuna_db, autovacuum=autovacuum)
+    else:
+        statements = rollback_tuning(optuna_db)
+    after = time_operations(optuna_db, repeats=repeats, study_name=study_name)
+    return {
+        "statements": statements,
+        "timings": _compare(before, after),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Tune indexes and autovacuum of the Optuna database."
+    )
+    parser.add_argument("action", choices=["inspect", "apply", "rollback"])
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Timed calls of each operation before and after",
+    )
+    parser.add_argument(
+        "--study_name",
+        type=str,
+        default=None,
+        help="Study used for per-study timings (default: latest study)",
+    )
+    parser.add_argument(
+        "--no_autovacuum",
+        action="store_true",
+        help="Only change indexes, not autovacuum settings",
+    )
+    args = parser.parse_args()
+    print(
+        json.dumps(
+            main(
+                action=args.action,
+                repeats=args.repeats,
+                study_name=args.study_name,
+                autovacuum=not args.no_autovacuum,
+            ),
+            indent=2,
+            default=str,
+        )
+    )
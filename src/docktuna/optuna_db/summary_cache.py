@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after a fixed
+    time-to-live. When full, the least recently used entry is evicted.
+    Values computed while their key was invalidated are returned but not
+    stored, so an invalidation is never undone by a slower computation.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes an empty cache.
+
+        Args:
+            ttl: Seconds an entry stays valid after it is stored.
+            max_entries: Maximum number of entries kept in memory.
+            clock: Function returning the current time in seconds.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Bumped by invalidate (per key) and clear (for all keys)
+        self._generations: dict[Hashable, int] = {}
+        self._clear_generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]):
+        """
+        Returns the cached value for a key, computing and storing it if the
+        key is missing or expired.
+
+        Args:
+            key: The cache key.
+            compute: Function called to produce the value on a miss.
+
+        Returns:
+            The cached or newly computed value.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation(key)
+
+        value = compute()
+
+        with self._lock:
+            if self._generation(key) != generation:
+                return value
+            self._entries[key] = (self._clock() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _generation(self, key: Hashable) -> tuple[int, int]:
+        """
+        Returns the invalidation generation of a key. Requires the lock.
+        """
+        return self._clear_generation, self._generations.get(key, 0)
+
+    def invalidate(self, key: Hashable):
+        """
+        Removes a single entry, if present, and discards values for it that
+        are still being computed.
+
+        Args:
+            key: The cache key to remove.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        """Removes all entries. Hit and miss counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._clear_generation += 1
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Returns hit/miss counters and the current number of entries.
+
+        Returns:
+            A dictionary with `hits`, `misses` and `size` keys.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
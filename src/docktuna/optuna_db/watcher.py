@@ -0,0 +1,213 @@
+"""
+Incrementally updated in-memory view of a study.
+
+`StudyWatcher` keeps the trials of one study in memory and refreshes them
+with `OptunaDatabase.get_trials_since`, so each poll only transfers the
+trials created since the last poll and the previously unfinished trials
+that have finished. Live dashboards and monitors therefore cost O(new
+trials) per poll instead of re-reading the whole study.
+
+The cursor only advances past a trial once every lower trial number has
+been seen, so a trial whose insert commits after a later trial's is picked
+up on the next poll instead of being skipped.
+
+Usage:
+    with StudyWatcher(optuna_db, "my_study", poll_interval=5.0) as watcher:
+        ...
+        print(watcher.state_counts, watcher.best_trial)
+"""
+
+import datetime
+import threading
+
+from optuna.study import StudyDirection
+from optuna.trial import FrozenTrial, TrialState
+
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+
+class StudyWatcher:
+    """
+    Maintains the trials of a study from incremental database reads.
+    """
+
+    def __init__(
+        self,
+        optuna_db: OptunaDatabase,
+        study_name: str,
+        poll_interval: float = 5.0,
+    ):
+        """
+        Creates an empty view. Call `poll()` or `start()` to fill it.
+
+        Args:
+            optuna_db: The database holding the study.
+            study_name: The name of the study.
+            poll_interval: Seconds between background polls.
+
+        Raises:
+            StopIteration: If the study is not found.
+        """
+        self._optuna_db = optuna_db
+        self._study_name = study_name
+        self._poll_interval = poll_interval
+        study_id = optuna_db._require_study_id(study_name=study_name)
+        directions = optuna_db.storage.get_study_directions(study_id)
+        self._direction = directions[0] if len(directions) == 1 else None
+
+        self._lock = threading.Lock()
+        self._trials: dict[int, FrozenTrial] = {}
+        self._unfinished: set[int] = set()
+        self._ids_by_number: dict[int, int] = {}
+        self._next_number = 0
+        self._cursor = -1
+        self._state_counts: dict[str, int] = {}
+        self._best_trial: FrozenTrial | None = None
+        self._last_update_time: datetime.datetime | None = None
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.last_error: Exception | None = None
+
+    def __enter__(self) -> "StudyWatcher":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def study_name(self) -> str:
+        return self._study_name
+
+    @property
+    def trials(self) -> list[FrozenTrial]:
+        """Returns the known trials, ordered by trial number."""
+        with self._lock:
+            return sorted(self._trials.values(), key=lambda t: t.number)
+
+    @property
+    def state_counts(self) -> dict[str, int]:
+        """Returns the number of known trials in each state."""
+        with self._lock:
+            return {
+                state: count
+                for state, count in self._state_counts.items()
+                if count
+            }
+
+    @property
+    def best_trial(self) -> FrozenTrial | None:
+        """
+        Returns the best completed trial, or None if there is none or the
+        study has multiple objectives.
+        """
+        return self._best_trial
+
+    @property
+    def last_update_time(self) -> datetime.datetime:
+        """
+        Returns the most recent trial completion time, or a default old
+        date if no trial has finished, like
+        `OptunaDatabase.get_last_update_time`.
+        """
+        return self._last_update_time or datetime.datetime(1, 1, 1)
+
+    def _is_better(self, trial: FrozenTrial) -> bool:
+        if self._direction is None or trial.state != TrialState.COMPLETE:
+            return False
+        if self._best_trial is None:
+            return True
+        if self._direction == StudyDirection.MINIMIZE:
+            return trial.value < self._best_trial.value
+        return trial.value > self._best_trial.value
+
+    def _merge(self, trial: FrozenTrial):
+        """
+        Adds a new or changed trial to the view.
+
+        Args:
+            trial: The trial read from the database.
+        """
+        trial_id = trial._trial_id
+        previous = self._trials.get(trial_id)
+        if previous is not None:
+            self._state_counts[previous.state.name] -= 1
+        self._trials[trial_id] = trial
+        self._state_counts[trial.state.name] = (
+            self._state_counts.get(trial.state.name, 0) + 1
+        )
+
+        if trial.state.is_finished():
+            self._unfinished.discard(trial_id)
+        else:
+            self._unfinished.add(trial_id)
+        if self._is_better(trial):
+            self._best_trial = trial
+        if trial.datetime_complete is not None and (
+            self._last_update_time is None
+            or trial.datetime_complete > self._last_update_time
+        ):
+            self._last_update_time = trial.datetime_complete
+
+        self._ids_by_number[trial.number] = trial_id
+        while self._next_number in self._ids_by_number:
+            self._cursor = max(
+                self._cursor, self._ids_by_number.pop(self._next_number)
+            )
+            self._next_number += 1
+
+    def poll(self) -> list[FrozenTrial]:
+        """
+        Reads the trials created or finished since the last poll.
+
+        Returns:
+            The new and changed trials, ordered by trial id.
+        """
+        with self._lock:
+            cursor = self._cursor
+            unfinished = set(self._unfinished)
+        changed = self._optuna_db.get_trials_since(
+            study_name=self._study_name,
+            after_trial_id=cursor,
+            trial_ids=unfinished,
+        )
+        with self._lock:
+            changed = [
+                trial
+                for trial in changed
+                if trial != self._trials.get(trial._trial_id)
+            ]
+            for trial in changed:
+                self._merge(trial)
+        return changed
+
+    def _run(self):
+        while not self._stop_event.wait(self._poll_interval):
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the last view and retry on the next interval
+                self.last_error = e
+
+    def start(self) -> "StudyWatcher":
+        """
+        Fills the view and keeps polling on a daemon thread.
+
+        Returns:
+            The watcher itself.
+        """
+        self.poll()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="docktuna-study-watcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,394 @@
+"""
+Write-behind trial recording through a local journal file.
+
+A worker runs its study against an Optuna `JournalStorage` in a local file,
+so recording a trial never waits on the network. A background thread
+periodically copies the finished trials into the study in the shared
+OptunaDatabase, all trials of a sync in one transaction on RDB storage,
+and pulls trials written by other workers into the journal so the sampler
+still sees the whole study.
+
+Each journal has a random id, stored in the journal study's system
+attributes, so it survives a new hostname or mount path when a container
+is recreated. Every copied trial carries a system attribute naming the
+journal id and local trial number. On restart the set of already copied
+trials is recovered from those attributes in the shared database, trials
+left RUNNING by a crashed run are marked FAIL, and copying resumes without
+duplicates.
+`check_consistency` compares the journal with the shared study.
+
+Usage:
+    with WriteBehindJournal(optuna_db, "my_study", "study.log") as journal:
+        journal.study.optimize(objective, n_trials=1000)
+"""
+
+import json
+import threading
+import uuid
+from pathlib import Path
+from typing import Any
+
+import optuna
+from optuna.storages import JournalStorage, RDBStorage
+from optuna.storages._rdb import models
+from optuna.trial import FrozenTrial, TrialState
+from sqlalchemy import select
+
+from docktuna.optuna_db.bulk import insert_trials
+from docktuna.optuna_db.optuna_db import (
+    OptunaDatabase,
+    temporary_optuna_verbosity,
+)
+
+JOURNAL_ID_ATTR = "docktuna:journal_id"
+SOURCE_ATTR = "docktuna:journal_trial"
+REMOTE_ATTR = "docktuna:remote_trial_id"
+
+_FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED, TrialState.FAIL)
+
+
+class WriteBehindJournal:
+    """
+    Records trials of a study in a local journal and copies them to the
+    shared database on a background thread.
+    """
+
+    def __init__(
+        self,
+        optuna_db: OptunaDatabase,
+        study_name: str,
+        journal_path: Path | str,
+        sync_interval: float = 5.0,
+        pull: bool = True,
+        sampler: optuna.samplers.BaseSampler | None = None,
+        pruner: optuna.pruners.BasePruner | None = None,
+    ):
+        """
+        Opens (or creates) the journal and recovers the sync state.
+
+        Args:
+            optuna_db: The shared database holding the study.
+            study_name: The name of the study. It is created in the shared
+                database if it does not exist.
+            journal_path: The local journal file. Use one file per worker.
+            sync_interval: Seconds between background syncs.
+            pull: Whether to copy trials of other workers into the journal.
+            sampler: Sampler of the local study.
+            pruner: Pruner of the local study.
+        """
+        from optuna.storages.journal import JournalFileBackend
+
+        self._optuna_db = optuna_db
+        self._sync_interval = sync_interval
+        self._pull = pull
+        self._sync_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.last_error = None
+
+        remote_study = optuna_db.get_study(study_name=study_name)
+        self._remote_study_id = remote_study._study_id
+        self._local_storage = JournalStorage(
+            JournalFileBackend(str(journal_path))
+        )
+        with temporary_optuna_verbosity(logging_level=optuna.logging.WARNING):
+            self._study = optuna.create_study(
+                study_name=study_name,
+                storage=self._local_storage,
+                directions=remote_study.directions,
+                sampler=sampler,
+                pruner=pruner,
+                load_if_exists=True,
+            )
+        self._local_study_id = self._study._study_id
+        self._journal_id = self._load_journal_id()
+        self._recover()
+
+    def __enter__(self) -> "WriteBehindJournal":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def study(self) -> optuna.Study:
+        """Returns the study backed by the local journal."""
+        return self._study
+
+    @staticmethod
+    def _copy_trial(trial: FrozenTrial, **system_attrs) -> FrozenTrial:
+        """
+        Builds a template for writing a finished trial to another storage.
+
+        Args:
+            trial: The trial to copy.
+            **system_attrs: System attributes added to the copy.
+
+        Returns:
+            The template trial, with the original start and end times.
+        """
+        template = optuna.trial.create_trial(
+            state=trial.state,
+            values=trial.values,
+            params=trial.params,
+            distributions=trial.distributions,
+            user_attrs=trial.user_attrs,
+            system_attrs={**trial.system_attrs, **system_attrs},
+            intermediate_values=trial.intermediate_values,
+        )
+        template.datetime_start = trial.datetime_start
+        template.datetime_complete = trial.datetime_complete
+        return template
+
+    def _load_journal_id(self) -> str:
+        """
+        Reads the id of this journal, creating it on first use.
+
+        Returns:
+            The journal id stored in the local study's system attributes.
+        """
+        system_attrs = self._local_storage.get_study_system_attrs(
+            self._local_study_id
+        )
+        if JOURNAL_ID_ATTR not in system_attrs:
+            self._local_storage.set_study_system_attr(
+                self._local_study_id, JOURNAL_ID_ATTR, uuid.uuid4().hex
+            )
+            system_attrs = self._local_storage.get_study_system_attrs(
+                self._local_study_id
+            )
+        return system_attrs[JOURNAL_ID_ATTR]
+
+    def _source_tag(self, trial: FrozenTrial) -> str:
+        return f"{self._journal_id}/{trial.number}"
+
+    def _remote_source_tags(self) -> set[str]:
+        """
+        Reads the source tags of trials in the shared study that were
+        copied from this journal.
+
+        Returns:
+            The tags of already copied trials.
+        """
+        prefix = f"{self._journal_id}/"
+        remote_storage = self._optuna_db.storage
+        if isinstance(remote_storage, RDBStorage):
+            with self._optuna_db._session() as session:
+                tags = [
+                    json.loads(value_json)
+                    for value_json in session.scalars(
+                        select(models.TrialSystemAttributeModel.value_json)
+                        .join(
+                            models.TrialModel,
+                            models.TrialModel.trial_id
+                            == models.TrialSystemAttributeModel.trial_id,
+                        )
+                        .where(
+                            models.TrialModel.study_id
+                            == self._remote_study_id,
+                            models.TrialSystemAttributeModel.key
+                            == SOURCE_ATTR,
+                        )
+                    )
+                ]
+        else:
+            tags = [
+                trial.system_attrs.get(SOURCE_ATTR)
+                for trial in remote_storage.get_all_trials(
+                    self._remote_study_id, deepcopy=False
+                )
+            ]
+        return {tag for tag in tags if tag and tag.startswith(prefix)}
+
+    def _recover(self):
+        """
+        Restores the sync state after a restart. Trials the previous run
+        left RUNNING are marked FAIL, since no process is evaluating them.
+        """
+        for trial in self._local_trials(states=(TrialState.RUNNING,)):
+            self._local_storage.set_trial_state_values(
+                trial._trial_id, state=TrialState.FAIL
+            )
+        self._synced_tags = self._remote_source_tags()
+        # Remote trials that were unfinished when the previous run stopped
+        # are unknown, so the first pull rereads the shared study
+        self._pulled_ids = {
+            trial.system_attrs[REMOTE_ATTR]
+            for trial in self._local_trials()
+            if REMOTE_ATTR in trial.system_attrs
+        }
+        self._remote_cursor = -1
+        self._remote_unfinished: set[int] = set()
+
+    def _local_trials(
+        self, states: tuple[TrialState, ...] | None = None
+    ) -> list[FrozenTrial]:
+        return self._local_storage.get_all_trials(
+            self._local_study_id, deepcopy=False, states=states
+        )
+
+    def _pending_trials(self) -> list[FrozenTrial]:
+        """
+        Returns finished trials recorded in this journal that have not been
+        copied to the shared study yet.
+        """
+        return [
+            trial
+            for trial in self._local_trials(states=_FINISHED_STATES)
+            if REMOTE_ATTR not in trial.system_attrs
+            and self._source_tag(trial) not in self._synced_tags
+        ]
+
+    def _push(self) -> int:
+        """
+        Copies pending trials to the shared study in one write.
+
+        Returns:
+            The number of trials copied.
+        """
+        pending = self._pending_trials()
+        if not pending:
+            return 0
+        tags = [self._source_tag(trial) for trial in pending]
+        insert_trials(
+            self._optuna_db.storage,
+            self._remote_study_id,
+            [
+                self._copy_trial(trial, **{SOURCE_ATTR: tag})
+                for trial, tag in zip(pending, tags)
+            ],
+        )
+        self._synced_tags.update(tags)
+        return len(pending)
+
+    def _pull_remote(self) -> int:
+        """
+        Copies finished trials written by other workers into the journal.
+        Only trials created since the last pull and previously unfinished
+        trials are read, so a trial that finishes after a later one is not
+        skipped.
+
+        Returns:
+            The number of trials copied.
+        """
+        prefix = f"{self._journal_id}/"
+        changed = self._optuna_db.get_trials_since(
+            study_name=self._study.study_name,
+            after_trial_id=self._remote_cursor,
+            trial_ids=self._remote_unfinished,
+        )
+
+        n_pulled = 0
+        for trial in changed:
+            trial_id = trial._trial_id
+            self._remote_cursor = max(self._remote_cursor, trial_id)
+            if not trial.state.is_finished():
+                self._remote_unfinished.add(trial_id)
+                continue
+            self._remote_unfinished.discard(trial_id)
+            source = trial.system_attrs.get(SOURCE_ATTR, "")
+            if source.startswith(prefix) or trial_id in self._pulled_ids:
+                continue
+            self._local_storage.create_new_trial(
+                self._local_study_id,
+                template_trial=self._copy_trial(
+                    trial, **{REMOTE_ATTR: trial_id}
+                ),
+            )
+            self._pulled_ids.add(trial_id)
+            n_pulled += 1
+        return n_pulled
+
+    def sync(self) -> dict[str, int]:
+        """
+        Copies pending trials to the shared study and, if enabled, other
+        workers' trials into the journal.
+
+        Returns:
+            The number of trials pushed and pulled.
+        """
+        with self._sync_lock:
+            pushed = self._push()
+            pulled = self._pull_remote() if self._pull else 0
+        return {"pushed": pushed, "pulled": pulled}
+
+    def _run(self):
+        while not self._stop_event.wait(self._sync_interval):
+            try:
+                self.sync()
+                self.last_error = None
+            except Exception as e:
+                # Keep recording locally and retry on the next interval
+                self.last_error = e
+
+    def start(self) -> "WriteBehindJournal":
+        """
+        Starts syncing on a daemon thread.
+
+        Returns:
+            The journal itself.
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="docktuna-write-behind", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the background thread and runs a final sync.
+
+        Raises:
+            Exception: If the final sync fails. The trials stay in the
+                journal and are copied by the next run.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sync()
+
+    def check_consistency(self) -> dict[str, Any]:
+        """
+        Compares the trials recorded in this journal with their copies in
+        the shared study.
+
+        Returns:
+            The number of finished local trials, how many of them were
+            copied, how many are pending, and the local trial numbers whose
+            copy differs in state, values or parameters.
+        """
+        remote_trials = {
+            trial.system_attrs[SOURCE_ATTR]: trial
+            for trial in self._optuna_db.storage.get_all_trials(
+                self._remote_study_id, deepcopy=False
+            )
+            if SOURCE_ATTR in trial.system_attrs
+        }
+        local_trials = [
+            trial
+            for trial in self._local_trials(states=_FINISHED_STATES)
+            if REMOTE_ATTR not in trial.system_attrs
+        ]
+        synced = 0
+        pending = 0
+        mismatched = []
+        for trial in local_trials:
+            remote = remote_trials.get(self._source_tag(trial))
+            if remote is None:
+                pending += 1
+                continue
+            synced += 1
+            if (
+                remote.state != trial.state
+                or remote.values != trial.values
+                or remote.params != trial.params
+            ):
+                mismatched.append(trial.number)
+        return {
+            "local": len(local_trials),
+            "synced": synced,
+            "pending": pending,
+            "mismatched": mismatched,
+        }
@@ -0,0 +1,236 @@
+"""
+Multi-process trial runner for Optuna studies with RDB storage.
+
+Each worker process loads the same study from the shared database with its
+own storage and connection pool, and its own sampler seed (derived from a
+random base seed unless one is given). Workers claim
+trials from a shared counter, so the study stops after `n_trials` trials in
+total (or when the timeout expires), and report finished trials back to the
+parent process for aggregated progress output.
+
+With `journal_dir`, each worker records its trials in a local journal file
+and copies them to the database in the background (see
+`docktuna.optuna_db.write_behind`), so cheap objectives do not wait on the
+database for every trial.
+
+Usage:
+    from docktuna.parallel import run_parallel
+    run_parallel(study_name="my_study", objective=objective, n_trials=100, n_workers=8)
+"""
+
+import multiprocessing
+import queue
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import optuna
+from optuna.pruners import BasePruner
+from optuna.samplers import TPESampler
+
+from docktuna.optuna_db.db_instance import get_optuna_db
+from docktuna.optuna_db.write_behind import WriteBehindJournal
+
+
+def _worker(
+    worker_index: int,
+    study_name: str,
+    objective: Callable[[optuna.Trial], float],
+    n_trials: int | None,
+    deadline: float | None,
+    seed: int,
+    pruner: BasePruner | None,
+    journal_dir: str | None,
+    initializer: Callable[[], None] | None,
+    db_settings: dict[str, Any],
+    claimed,
+    progress_queue,
+):
+    """
+    Runs trials of a shared study until the trial budget or deadline is
+    reached.
+
+    Args:
+        worker_index: Index of this worker, used to derive its seed.
+        study_name: The name of the study.
+        objective: The objective function.
+        n_trials: Total number of trials across all workers, or None.
+        deadline: Epoch time after which no new trials start, or None.
+        seed: Base sampler seed. The worker uses `seed + worker_index`.
+        pruner: Pruner for the worker's study, or None for the default.
+        journal_dir: Directory for the worker's write-behind journal, or
+            None to write trials to the database directly.
+        initializer: Called before the first trial, or None.
+        db_settings: Settings passed to `get_optuna_db`.
+        claimed: Shared counter of trials claimed by all workers.
+        progress_queue: Queue receiving one message per finished trial.
+    """
+    optuna_db = get_optuna_db(**db_settings)
+    journal = None
+    try:
+        if initializer is not None:
+            initializer()
+        sampler = TPESampler(seed=seed + worker_index)
+        if journal_dir is None:
+            study = optuna.load_study(
+                study_name=study_name,
+                storage=optuna_db.storage,
+                sampler=sampler,
+                pruner=pruner,
+            )
+        else:
+            journal = WriteBehindJournal(
+                optuna_db=optuna_db,
+                study_name=study_name,
+                journal_path=Path(journal_dir)
+                / f"{study_name}.{worker_index}.log",
+                sampler=sampler,
+                pruner=pruner,
+            ).start()
+            study = journal.study
+
+        def report(study: optuna.Study, trial: optuna.trial.FrozenTrial):
+            progress_queue.put(
+                (worker_index, trial.number, trial.state.name, trial.values)
+            )
+
+        while deadline is None or time.time() < deadline:
+            with claimed.get_lock():
+                if n_trials is not None and claimed.value >= n_trials:
+                    break
+                claimed.value += 1
+            study.optimize(func=objective, n_trials=1, callbacks=[report])
+    finally:
+        try:
+            if journal is not None:
+                journal.stop()
+        finally:
+            optuna_db.close()
+            progress_queue.put(None)
+
+
+def run_parallel(
+    study_name: str,
+    objective: Callable[[optuna.Trial], float],
+    n_trials: int | None = None,
+    n_workers: int = 2,
+    timeout: float | None = None,
+    seed: int | None = None,
+    pruner: BasePruner | None = None,
+    start_method: str = "spawn",
+    journal_dir: str | None = None,
+    initializer: Callable[[], None] | None = None,
+    db_settings: dict[str, Any] | None = None,
+) -> dict[str, float]:
+    """
+    Runs an existing study in several worker processes and prints progress
+    as trials finish.
+
+    Args:
+        study_name: The name of a study that already exists in the database.
+        objective: The objective function. Must be importable by the
+            worker processes (i.e. defined at module level).
+        n_trials: Total number of trials across all workers.
+        n_workers: Number of worker processes.
+        timeout: Seconds after which workers stop starting new trials.
+        seed: Base sampler seed. Worker i uses `seed + i`. Defaults to a
+            random seed, which is printed so the run can be repeated.
+        pruner: Pruner used by every worker. Defaults to Optuna's default.
+        start_method: Multiprocessing start method for the workers.
+        journal_dir: If given, workers record trials in local journal
+            files in this directory and copy them to the database in the
+            background. The directory is created if missing.
+        initializer: Called in each worker process before its first
+            trial, e.g. to configure module state the objective reads.
+            Must be picklable.
+        db_settings: Settings each worker passes to `get_optuna_db`, such
+            as `instrument` or `heartbeat_interval`.
+
+    Returns:
+        The number of finished trials, the elapsed time in seconds, and
+        the resulting throughput in trials per second.
+
+    Raises:
+        ValueError: If neither `n_trials` nor `timeout` is given.
+        RuntimeError: If any worker process exits with an error.
+    """
+    if n_trials is None and timeout is None:
+        raise ValueError("Either n_trials or timeout must be given.")
+    if journal_dir is not None:
+        Path(journal_dir).mkdir(parents=True, exist_ok=True)
+    if seed is None:
+        seed = random.randrange(2**31)
+        print(f"Using base sampler seed {seed}")
+
+    context = multiprocessing.get_context(start_method)
+    claimed = context.Value("i", 0)
+    progress_queue = context.Queue()
+    start_time = time.time()
+    deadline = None if timeout is None else start_time + timeout
+
+    workers = [
+        context.Process(
+            target=_worker,
+            args=(
+                worker_index,
+                study_name,
+                objective,
+                n_trials,
+                deadline,
+                seed,
+                pruner,
+                journal_dir,
+                initializer,
+                db_settings or {},
+                claimed,
+                progress_queue,
+            ),
+        )
+        for worker_index in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    n_finished = 0
+    n_running_workers = n_workers
+    total = "?" if n_trials is None else n_trials
+    while n_running_workers > 0:
+        try:
+            message = progress_queue.get(timeout=1.0)
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                break
+            continue
+        if message is None:
+            n_running_workers -= 1
+            continue
+        worker_index, trial_number, state, values = message
+        n_finished += 1
+        print(
+            f"[{n_finished}/{total}] Trial {trial_number} {state} "
+            f"with values {values} (worker {worker_index})"
+        )
+
+    for worker in workers:
+        worker.join()
+    elapsed = time.time() - start_time
+
+    failed_workers = [
+        worker_index
+        for worker_index, worker in enumerate(workers)
+        if worker.exitcode != 0
+    ]
+    if failed_workers:
+        raise RuntimeError(f"Tuning workers {failed_workers} failed.")
+
+    trials_per_second = n_finished / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Finished {n_finished} trials with {n_workers} workers in "
+        f"{elapsed:.1f} s ({trials_per_second:.2f} trials/s)"
+    )
+    return {
+        "n_trials": n_finished,
+        "elapsed": elapsed,
+        "trials_per_second": trials_per_second,
+    }
@@ -1,24 +1,41 @@
 """
 Example template for running an Optuna study with RDB storage.
 
-This file serves as a **starting point** for users of this project template 
-who need to build an application with more complex hyperparameter tuning. 
+This file serves as a **starting point** for users of this project template
+who need to build an application with more complex hyperparameter tuning.
 Modify and expand this template to fit your specific optimization needs.
 
 Usage:
     python example_tuning_template.py --study_name my_study --n_trials 10
+    python example_tuning_template.py --study_name my_study --n_trials 100 --workers 8
+    python example_tuning_template.py --study_name my_study --n_trials 1000 --batch_size 100
+    python example_tuning_template.py --study_name new_study --warm_start_from my_study
 """
 
 import argparse
+import json
 import logging
 import sys
 
+import numpy as np
 import optuna
+from optuna.distributions import FloatDistribution
 from optuna.pruners import BasePruner  # Add other pruners as needed
-from optuna.samplers import BaseSampler  # Add other samplers as needed
+from optuna.samplers import (  # Add other samplers as needed
+    BaseSampler,
+    TPESampler,
+)
 from optuna.study import StudyDirection
 
+from docktuna.batched import BatchedRunner
+from docktuna.metrics_server import start_metrics_server
 from docktuna.optuna_db.db_instance import get_optuna_db
+from docktuna.optuna_db.instrumentation import InstrumentedObjective
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+from docktuna.parallel import run_parallel
+from docktuna.warm_start import warm_start
+
+SEARCH_SPACE = {"x": FloatDistribution(-10, 10)}
 
 
 def objective(trial: optuna.Trial) -> float:
@@ -38,11 +55,26 @@ def objective(trial: optuna.Trial) -> float:
     return (x - 2) ** 2
 
 
+def batch_objective(params: dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized version of `objective` that evaluates a batch of trials.
+
+    Args:
+        params: Maps each parameter in `SEARCH_SPACE` to an array with one
+            entry per trial.
+
+    Returns:
+        The loss values to be minimized, one per trial.
+    """
+    return (params["x"] - 2) ** 2
+
+
 def get_study(
     study_name: str,
     direction: StudyDirection = StudyDirection.MINIMIZE,
     sampler: BaseSampler = None,
     pruner: BasePruner = None,
+    optuna_db: OptunaDatabase = None,
 ) -> optuna.Study:
     """
     Retrieves or creates an Optuna study using RDB storage.
@@ -52,11 +84,13 @@ def get_study(
         direction: The optimization direction (MINIMIZE or MAXIMIZE).
         sampler: An optional Optuna sampler for customized search strategies.
         pruner: An optional Optuna pruner for early stopping.
+        optuna_db: The database holding the study. Defaults to the shared
+            default database.
 
     Returns:
         The Optuna study object.
     """
-    optuna_db = get_optuna_db()
+    optuna_db = optuna_db or get_optuna_db()
 
     return optuna.create_study(
         study_name=study_name,
@@ -68,7 +102,19 @@ def get_study(
     )
 
 
-def main(study_name: str = "simple_study", n_trials: int = 3):
+def main(
+    study_name: str = "simple_study",
+    n_trials: int = 3,
+    workers: int = 1,
+    timeout: float = None,
+    batch_size: int = None,
+    instrument: bool = False,
+    metrics_port: int = None,
+    journal_dir: str = None,
+    warm_start_from: list[str] = None,
+    warm_start_k: int = 10,
+    seed: int = None,
+):
     """
     Runs an Optuna study with the specified parameters.
 
@@ -77,13 +123,96 @@ def main(study_name: str = "simple_study", n_trials: int = 3):
     Args:
         study_name: The name of the study to create or load.
         n_trials: The number of trials to run in the study.
+        workers: Number of worker processes sharing the study.
+        timeout: Optional time limit in seconds.
+        batch_size: If given, evaluate trials in batches of this size
+            with `batch_objective`. Cannot be combined with `workers`,
+            `timeout` or `instrument`.
+        instrument: Whether to record per-trial performance metrics and
+            print an aggregate report at the end.
+        metrics_port: If given, serve Prometheus metrics on this port
+            while the study runs.
+        journal_dir: If given, worker processes record trials in local
+            journal files in this directory and copy them to the database
+            in the background. Requires `workers` > 1.
+        warm_start_from: Names of studies whose best trials are enqueued
+            first if the study is new.
+        warm_start_k: Number of best trials taken from each of them.
+        seed: Sampler seed. Worker i of a parallel run uses `seed + i`;
+            without a seed, `run_parallel` draws a random base seed.
     """
+    if batch_size and (workers > 1 or timeout is not None):
+        raise ValueError(
+            "batch_size cannot be combined with workers or timeout"
+        )
+    if batch_size and instrument:
+        raise ValueError("batch_size cannot be combined with instrument")
+    if journal_dir is not None and (workers <= 1 or batch_size):
+        raise ValueError(
+            "journal_dir requires workers > 1 and cannot be combined with "
+            "batch_size"
+        )
+    if warm_start_from and journal_dir is not None:
+        raise ValueError("Warm start is not supported with journal_dir")
+
     # Configure Optuna logging to display messages in the console
     optuna_logger = optuna.logging.get_logger("optuna")
     optuna_logger.addHandler(logging.StreamHandler(sys.stdout))
 
-    study = get_study(study_name=study_name)
-    study.optimize(func=objective, n_trials=n_trials)
+    trial_objective = objective
+    # Passed to the workers too
+    db_settings = {"instrument": True} if instrument else {}
+    optuna_db = get_optuna_db(**db_settings)
+    if instrument:
+        trial_objective = InstrumentedObjective(objective)
+
+    study = get_study(
+        study_name=study_name,
+        sampler=None if seed is None else TPESampler(seed=seed),
+        optuna_db=optuna_db,
+    )
+    runner = (
+        BatchedRunner(study=study, batch_size=batch_size)
+        if batch_size
+        else None
+    )
+    if warm_start_from:
+        enqueued = warm_start(
+            optuna_db=optuna_db,
+            study=study,
+            source_study_names=warm_start_from,
+            k=warm_start_k,
+            search_space=SEARCH_SPACE,
+            queue=None if runner is None else runner.shadow_study,
+        )
+        print(f"Enqueued {len(enqueued)} warm-start trials")
+    if metrics_port is not None:
+        start_metrics_server(optuna_db=optuna_db, port=metrics_port)
+    if runner is not None:
+        runner.optimize_vectorized(
+            batch_objective=batch_objective,
+            search_space=SEARCH_SPACE,
+            n_trials=n_trials,
+        )
+    elif workers > 1:
+        run_parallel(
+            study_name=study_name,
+            objective=trial_objective,
+            n_trials=n_trials,
+            n_workers=workers,
+            timeout=timeout,
+            seed=seed,
+            journal_dir=journal_dir,
+            db_settings=db_settings,
+        )
+    else:
+        study.optimize(
+            func=trial_objective, n_trials=n_trials, timeout=timeout
+        )
+
+    if instrument:
+        report = optuna_db.get_performance_report(study_name=study_name)
+        print(json.dumps(report, indent=2))
 
 
 if __name__ == "__main__":
@@ -102,5 +231,71 @@ if __name__ == "__main__":
         default=3,
         help="Number of trials for optimization",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes sharing the study",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Time limit for optimization in seconds",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=None,
+        help="Evaluate trials in vectorized batches of this size",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record per-trial performance metrics and print a report",
+    )
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port while tuning",
+    )
+    parser.add_argument(
+        "--journal_dir",
+        type=str,
+        default=None,
+        help="Directory for worker write-behind journals (with --workers)",
+    )
+    parser.add_argument(
+        "--warm_start_from",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Enqueue the best trials of these studies into a new study",
+    )
+    parser.add_argument(
+        "--warm_start_k",
+        type=int,
+        default=10,
+        help="Number of best trials taken from each warm-start study",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Sampler seed (worker i of --workers uses seed + i)",
+    )
     args = parser.parse_args()
-    main(study_name=args.study_name, n_trials=args.n_trials)
+    main(
+        study_name=args.study_name,
+        n_trials=args.n_trials,
+        workers=args.workers,
+        timeout=args.timeout,
+        batch_size=args.batch_size,
+        instrument=args.instrument,
+        metrics_port=args.metrics_port,
+        journal_dir=args.journal_dir,
+        warm_start_from=args.warm_start_from,
+        warm_start_k=args.warm_start_k,
+        seed=args.seed,
+    )
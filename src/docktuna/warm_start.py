@@ -0,0 +1,158 @@
+"""
+Warm-starting new studies from the best trials of related studies.
+
+`warm_start` takes the top-k completed trials of each source study (ranked
+and limited in the database by `OptunaDatabase.get_top_trials`, so source
+studies are never loaded in full), keeps the parameter values that are
+valid in the new study's search space, and enqueues them with
+`enqueue_trial`. The sampler evaluates these known-good points first
+instead of rediscovering them.
+
+A parameter is carried over if the target distribution is of the same kind
+(categorical or numeric) and contains the value, e.g. a `hidden_size` of
+64 maps into `IntDistribution(8, 128)` but not into
+`IntDistribution(8, 32)`. Values that do not fit are left for the sampler
+to choose. Studies that already have trials, or whose queue already
+holds waiting trials, are not warm-started again.
+
+Usage:
+    study = optuna_db.get_study(study_name="new_study")
+    warm_start(optuna_db, study, ["old_study"], k=5, search_space=SPACE)
+"""
+
+from typing import Any
+
+import optuna
+from optuna.distributions import BaseDistribution, CategoricalDistribution
+from optuna.trial import FrozenTrial, TrialState
+
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+SOURCE_ATTR = "docktuna:warm_start_source"
+
+
+def map_params(
+    trial: FrozenTrial, search_space: dict[str, BaseDistribution] | None
+) -> dict[str, Any]:
+    """
+    Maps the parameters of a source trial into a target search space.
+
+    Args:
+        trial: The source trial.
+        search_space: Distributions of the target study, or None to keep
+            every parameter of the trial.
+
+    Returns:
+        The parameter values that are valid in the target search space.
+    """
+    if search_space is None:
+        return dict(trial.params)
+    params = {}
+    for name, target in search_space.items():
+        source = trial.distributions.get(name)
+        if source is None or isinstance(
+            source, CategoricalDistribution
+        ) != isinstance(target, CategoricalDistribution):
+            continue
+        try:
+            internal = target.to_internal_repr(trial.params[name])
+        except ValueError:
+            continue
+        if target._contains(internal):
+            params[name] = target.to_external_repr(internal)
+    return params
+
+
+def select_warm_start_params(
+    optuna_db: OptunaDatabase,
+    source_study_names: list[str],
+    k: int = 10,
+    search_space: dict[str, BaseDistribution] | None = None,
+) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Selects the parameters to enqueue from the best trials of the sources.
+
+    Trials are interleaved by rank across the sources, so each source
+    contributes its best trial before any source contributes its second.
+    Parameter sets that map to the same values are enqueued once.
+
+    Args:
+        optuna_db: The database holding the source studies.
+        source_study_names: Names of the source studies.
+        k: Number of top trials taken from each source study.
+        search_space: Distributions of the target study, or None to keep
+            every parameter.
+
+    Returns:
+        Pairs of `<study>:<trial number>` source labels and parameters, in
+        enqueue order.
+
+    Raises:
+        StopIteration: If a source study is not found.
+        ValueError: If a source study has multiple objectives.
+    """
+    ranked = [
+        optuna_db.get_top_trials(study_name=study_name, k=k)
+        for study_name in source_study_names
+    ]
+    selected = []
+    seen = set()
+    for rank in range(k):
+        for study_name, trials in zip(source_study_names, ranked):
+            if rank >= len(trials):
+                continue
+            params = map_params(trials[rank], search_space)
+            key = tuple(sorted(params.items()))
+            if not params or key in seen:
+                continue
+            seen.add(key)
+            selected.append((f"{study_name}:{trials[rank].number}", params))
+    return selected
+
+
+def warm_start(
+    optuna_db: OptunaDatabase,
+    study: optuna.Study,
+    source_study_names: list[str],
+    k: int = 10,
+    search_space: dict[str, BaseDistribution] | None = None,
+    queue: optuna.Study | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Enqueues the best parameters of related studies into a new study.
+
+    Args:
+        optuna_db: The database holding the source studies.
+        study: The new study. Nothing is enqueued if it already has trials.
+        source_study_names: Names of the source studies.
+        k: Number of top trials taken from each source study.
+        search_space: Distributions of the new study, or None to keep every
+            parameter of the source trials.
+        queue: The study the trials are enqueued into, if not `study`. Use
+            `BatchedRunner.shadow_study` for batched runs. Nothing is
+            enqueued if it already has waiting trials.
+
+    Returns:
+        The enqueued parameter sets.
+
+    Raises:
+        StopIteration: If a source study is not found.
+        ValueError: If a source study has multiple objectives.
+    """
+    queue = study if queue is None else queue
+    if study._storage.get_n_trials(study._study_id) > 0 or queue.get_trials(
+        deepcopy=False, states=(TrialState.WAITING,)
+    ):
+        return []
+    enqueued = []
+    for source, params in select_warm_start_params(
+        optuna_db=optuna_db,
+        source_study_names=[
+            name for name in source_study_names if name != study.study_name
+        ],
+        k=k,
+        search_space=search_space,
+    ):
+        queue.enqueue_trial(params, user_attrs={SOURCE_ATTR: source})
+        enqueued.append(params)
+    return enqueued
@@ -0,0 +1,51 @@
+import pytest
+
+from docktuna.optuna_db.backends import InMemoryBackend, SQLiteBackend
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+
+@pytest.fixture
+def objective():
+    """A quadratic objective of one parameter `x`."""
+
+    def objective(trial) -> float:
+        return (trial.suggest_float("x", -10, 10) - 2) ** 2
+
+    return objective
+
+
+@pytest.fixture
+def mixed_objective():
+    """An objective with float, int and categorical parameters that also
+    records a user attribute and an intermediate value."""
+
+    def objective(trial) -> float:
+        x = trial.suggest_float("x", -10, 10)
+        n = trial.suggest_int("n", 1, 5)
+        activation = trial.suggest_categorical("activation", ["relu", "tanh"])
+        trial.set_user_attr("n_squared", n * n)
+        trial.report(x, step=0)
+        return (x - 2) ** 2 + n + (activation == "tanh")
+
+    return objective
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """An empty OptunaDatabase on a SQLite file."""
+    with OptunaDatabase(
+        backend=SQLiteBackend(path=tmp_path / "optuna.db")
+    ) as optuna_db:
+        yield optuna_db
+
+
+@pytest.fixture(params=["sqlite", "inmemory"])
+def optuna_db(request, tmp_path):
+    """An empty OptunaDatabase on a SQLite file or in memory."""
+    backend = (
+        SQLiteBackend(path=tmp_path / "optuna.db")
+        if request.param == "sqlite"
+        else InMemoryBackend()
+    )
+    with OptunaDatabase(backend=backend) as optuna_db:
+        yield optuna_db
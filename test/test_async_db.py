@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from docktuna.optuna_db.async_db import AsyncOptunaDatabase
+
+
+@pytest.fixture
+def async_study_db(optuna_db, objective):
+    """A database holding `async_study` with three trials."""
+    optuna_db.get_study(study_name="async_study").optimize(
+        objective, n_trials=3
+    )
+    return optuna_db
+
+
+def test_async_lookups(async_study_db):
+    """Lookups return the same results as the blocking API."""
+
+    async def lookups():
+        async with AsyncOptunaDatabase(async_study_db) as async_db:
+            return await asyncio.gather(
+                async_db.study_summaries(),
+                async_db.get_best_params(study_name="async_study"),
+                async_db.count_studies(),
+                async_db.get_latest_study(),
+            )
+
+    summaries, best_params, count, latest = asyncio.run(lookups())
+    assert [summary.study_name for summary in summaries] == ["async_study"]
+    assert best_params == async_study_db.get_best_params(
+        study_name="async_study"
+    )
+    assert count == 1
+    assert latest.study_name == "async_study"
+
+
+def test_concurrent_calls_are_coalesced(async_study_db):
+    """Concurrent identical queries share one call to the database."""
+    calls = []
+    count_studies = async_study_db.count_studies
+
+    def slow_count() -> int:
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return count_studies()
+
+    async_study_db.count_studies = slow_count
+
+    async def lookups():
+        async with AsyncOptunaDatabase(async_study_db) as async_db:
+            results = await asyncio.gather(
+                *(async_db.count_studies() for _ in range(10))
+            )
+            assert async_db.inflight == 0
+            return results
+
+    assert asyncio.run(lookups()) == [1] * 10
+    assert len(calls) == 1
+
+
+def test_errors_propagate(async_study_db):
+    """Lookup errors are raised in every waiting caller."""
+
+    async def lookups():
+        async with AsyncOptunaDatabase(async_study_db) as async_db:
+            return await asyncio.gather(
+                async_db.get_best_params(study_name="missing"),
+                async_db.get_best_params(study_name="missing"),
+                return_exceptions=True,
+            )
+
+    results = asyncio.run(lookups())
+    assert all(isinstance(result, KeyError) for result in results)
+
+
+def test_exit_does_not_block_the_loop(async_study_db):
+    """Leaving the context waits for running queries without blocking."""
+    count_studies = async_study_db.count_studies
+
+    def slow_count() -> int:
+        time.sleep(0.3)
+        return count_studies()
+
+    async_study_db.count_studies = slow_count
+
+    async def ticker(ticks: list):
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def lookups():
+        ticks = []
+        async with AsyncOptunaDatabase(async_study_db) as async_db:
+            query = asyncio.ensure_future(async_db.count_studies())
+            await asyncio.sleep(0)
+            task = asyncio.create_task(ticker(ticks))
+        task.cancel()
+        return await query, len(ticks)
+
+    count, n_ticks = asyncio.run(lookups())
+    assert count == 1
+    assert n_ticks > 5
@@ -0,0 +1,113 @@
+import datetime
+
+import pytest
+from optuna.storages import InMemoryStorage, JournalStorage, RDBStorage
+
+from docktuna.optuna_db import db_instance
+from docktuna.optuna_db.backends import (
+    BACKEND_ENV,
+    PATH_ENV,
+    InMemoryBackend,
+    JournalFileBackend,
+    PostgresBackend,
+    SQLiteBackend,
+    backend_from_env,
+)
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+
+@pytest.fixture(params=["sqlite_file", "sqlite_memory", "journal", "inmemory"])
+def backend(request, tmp_path):
+    return {
+        "sqlite_file": lambda: SQLiteBackend(path=tmp_path / "optuna.db"),
+        "sqlite_memory": lambda: SQLiteBackend(),
+        "journal": lambda: JournalFileBackend(path=tmp_path / "journal.log"),
+        "inmemory": InMemoryBackend,
+    }[request.param]()
+
+
+def test_same_api_on_every_backend(backend, objective):
+    """Lookups behave the same whichever storage holds the studies."""
+    with OptunaDatabase(backend=backend) as optuna_db:
+        optuna_db.get_study(study_name="first").optimize(objective, n_trials=3)
+        optuna_db.get_study(study_name="second")
+
+        assert optuna_db.list_study_names() == ["first", "second"]
+        assert optuna_db.count_studies() == 2
+        assert optuna_db.is_in_db(study_name="first")
+        assert optuna_db.get_study_summary(study_name="first").n_trials == 3
+        assert "x" in optuna_db.get_best_params(study_name="first")
+        assert optuna_db.get_latest_study().study_name == "first"
+        assert optuna_db.count_trials_by_state() == {"first": {"COMPLETE": 3}}
+        since = datetime.datetime.now() - datetime.timedelta(hours=1)
+        assert optuna_db.count_trials_finished_since(since) == {"first": 3}
+
+
+def test_sqlite_file_uses_wal(tmp_path):
+    """File databases are opened in WAL journal mode."""
+    with OptunaDatabase(
+        backend=SQLiteBackend(path=tmp_path / "optuna.db")
+    ) as optuna_db:
+        assert isinstance(optuna_db.storage, RDBStorage)
+        with optuna_db.storage.engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        assert mode == "wal"
+
+
+def test_file_backends_persist(tmp_path):
+    """Studies in file storages survive closing the database."""
+    for backend in (
+        SQLiteBackend(path=tmp_path / "optuna.db"),
+        JournalFileBackend(path=tmp_path / "journal.log"),
+    ):
+        with OptunaDatabase(backend=backend) as optuna_db:
+            optuna_db.get_study(study_name="kept")
+        with OptunaDatabase(backend=backend) as optuna_db:
+            assert optuna_db.is_in_db(study_name="kept")
+
+
+def test_inmemory_survives_close():
+    """Closing keeps the in-memory storage of the backend."""
+    optuna_db = OptunaDatabase(backend=InMemoryBackend())
+    optuna_db.get_study(study_name="kept")
+    optuna_db.close()
+    assert optuna_db.is_in_db(study_name="kept")
+    assert optuna_db.pool_status == {}
+
+
+def test_backend_equality(tmp_path):
+    """Backends with the same configuration compare equal."""
+    assert SQLiteBackend(path=tmp_path / "a.db") == SQLiteBackend(
+        path=tmp_path / "a.db"
+    )
+    assert SQLiteBackend(path=tmp_path / "a.db") != SQLiteBackend()
+    assert PostgresBackend("u", "s", "d", "h") == PostgresBackend(
+        "u", "s", "d", "h"
+    )
+    backend = InMemoryBackend()
+    assert backend == backend
+    assert InMemoryBackend() != InMemoryBackend()
+    assert SQLiteBackend() != SQLiteBackend()
+
+
+def test_backend_from_env(monkeypatch, tmp_path):
+    """The storage backend is selected by environment variables."""
+    monkeypatch.setenv(BACKEND_ENV, "journal")
+    monkeypatch.setenv(PATH_ENV, str(tmp_path / "journal.log"))
+    assert isinstance(backend_from_env(), JournalFileBackend)
+    assert isinstance(
+        OptunaDatabase(**db_instance._default_settings()).storage,
+        JournalStorage,
+    )
+
+    monkeypatch.setenv(BACKEND_ENV, "inmemory")
+    assert isinstance(backend_from_env().create_storage(), InMemoryStorage)
+
+    monkeypatch.delenv(PATH_ENV)
+    monkeypatch.setenv(BACKEND_ENV, "journal")
+    with pytest.raises(ValueError):
+        backend_from_env()
+
+    monkeypatch.setenv(BACKEND_ENV, "unknown")
+    with pytest.raises(ValueError):
+        backend_from_env()
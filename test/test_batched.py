@@ -0,0 +1,91 @@
+import optuna
+import pytest
+
+from docktuna.batched import BatchedRunner, run_batched
+from docktuna.simple_tune import objective
+
+
+@pytest.fixture
+def study(tmp_path):
+    """A fresh study in a temporary SQLite storage."""
+    return optuna.create_study(
+        study_name="batched_study",
+        storage=f"sqlite:///{tmp_path / 'batched.db'}",
+    )
+
+
+def test_run_batched(study):
+    """All batched trials are written to the study."""
+    n_written = run_batched(
+        study=study, objective=objective, n_trials=10, batch_size=4
+    )
+    assert n_written == 10
+    trials = study.get_trials(deepcopy=False)
+    assert len(trials) == 10
+    assert all(
+        trial.state == optuna.trial.TrialState.COMPLETE for trial in trials
+    )
+    assert all("x" in trial.params for trial in trials)
+
+
+def test_sync_includes_existing_trials(study):
+    """Trials written outside the runner are visible to its sampler."""
+    study.optimize(func=objective, n_trials=3)
+    runner = BatchedRunner(study=study, batch_size=2)
+    runner.optimize(objective=objective, n_trials=2)
+    assert len(runner.shadow_study.trials) == 5
+    assert len(study.trials) == 5
+
+
+def test_optimize_batch(study):
+    """Batch objectives receive every trial in the batch."""
+
+    def batch_objective(trials):
+        return [
+            (trial.suggest_float("x", -10, 10) - 2) ** 2 for trial in trials
+        ]
+
+    runner = BatchedRunner(study=study, batch_size=5)
+    runner.optimize_batch(batch_objective=batch_objective, n_trials=5)
+    assert len(study.trials) == 5
+
+
+def test_failed_trials_are_flushed(study):
+    """Objective errors are re-raised after the batch is written."""
+
+    def failing_objective(trial):
+        trial.suggest_float("x", -10, 10)
+        raise RuntimeError("objective failed")
+
+    with pytest.raises(RuntimeError, match="objective failed"):
+        run_batched(study=study, objective=failing_objective, n_trials=2)
+    assert all(
+        trial.state == optuna.trial.TrialState.FAIL for trial in study.trials
+    )
+
+
+def test_optimize_vectorized(study):
+    """Each entry of a vectorized result is recorded as its own trial."""
+    from docktuna.simple_tune import SEARCH_SPACE, batch_objective
+
+    runner = BatchedRunner(study=study, batch_size=8)
+    runner.optimize_vectorized(
+        batch_objective=batch_objective, search_space=SEARCH_SPACE, n_trials=8
+    )
+    trials = study.trials
+    assert len(trials) == 8
+    for trial in trials:
+        assert trial.value == pytest.approx((trial.params["x"] - 2) ** 2)
+
+
+def test_sync_trial_finished_later(study):
+    """A trial that finishes after the runner's last sync is synced."""
+    running = study.ask()
+    runner = BatchedRunner(study=study, batch_size=2)
+    runner.optimize(objective=objective, n_trials=2)
+    assert len(runner.shadow_study.trials) == 2
+
+    study.tell(running, 1.0)
+    runner.optimize(objective=objective, n_trials=2)
+    assert len(runner.shadow_study.trials) == 5
+    assert len(study.trials) == 5
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import torch
+
+from docktuna.datasets import DatasetProvider, save_synthetic_dataset
+
+
+def test_dataset_is_built_once():
+    """Repeated calls return views of the same storage."""
+    provider = DatasetProvider(n_samples=100, input_size=4, output_size=1)
+    X_a, y_a = provider.get()
+    X_b, y_b = provider.get()
+    assert X_a.shape == (100, 4)
+    assert y_a.shape == (100, 1)
+    assert X_a.data_ptr() == X_b.data_ptr()
+    assert y_a.data_ptr() == y_b.data_ptr()
+
+
+def test_subset_views():
+    """Requesting fewer samples returns a view of the shared dataset."""
+    provider = DatasetProvider(n_samples=100, input_size=4, output_size=1)
+    X, _ = provider.get()
+    X_subset, y_subset = provider.get(n_samples=10)
+    assert X_subset.shape == (10, 4)
+    assert y_subset.shape == (10, 1)
+    assert X_subset.data_ptr() == X.data_ptr()
+
+
+def test_load_npy(tmp_path):
+    """Saved datasets load with features and targets split by column."""
+    path = save_synthetic_dataset(
+        tmp_path / "data.npy", n_samples=50, input_size=3, chunk_size=20
+    )
+    provider = DatasetProvider(input_size=3, output_size=1, path=path)
+    X, y = provider.get()
+    expected = np.load(path)
+    assert torch.allclose(X, torch.from_numpy(expected[:, :3]))
+    assert torch.allclose(y, torch.from_numpy(expected[:, 3:]))
+
+
+def test_load_pt(tmp_path):
+    """Tensors saved with torch.save are loaded memory mapped."""
+    path = tmp_path / "data.pt"
+    torch.save(torch.randn(20, 5), path)
+    X, y = DatasetProvider(input_size=4, output_size=1, path=path).get()
+    assert X.shape == (20, 4)
+    assert y.shape == (20, 1)
+
+
+def test_bad_shape(tmp_path):
+    """Files with the wrong number of columns are rejected."""
+    path = save_synthetic_dataset(
+        tmp_path / "data.npy", n_samples=10, input_size=2
+    )
+    with pytest.raises(ValueError):
+        DatasetProvider(input_size=5, output_size=1, path=path).get()
@@ -1,14 +1,25 @@
+import os
+import threading
 from unittest.mock import PropertyMock, patch
 
 import pytest
 
-from docktuna.optuna_db.db_instance import get_optuna_db
+from docktuna.optuna_db import db_instance
+from docktuna.optuna_db.backends import InMemoryBackend, RDBUrlBackend
+from docktuna.optuna_db.db_instance import (
+    get_optuna_db,
+    register_optuna_db,
+    reset_optuna_dbs,
+)
 
 
 @pytest.fixture(autouse=True)
 def reset_global_optuna_db():
     """Ensures get_optuna_db() always starts fresh for each test."""
-    get_optuna_db.__globals__["OPTUNA_DB"] = None
+    reset_optuna_dbs()
+    yield
+    reset_optuna_dbs()
+    db_instance._SETTINGS.clear()
 
 
 def test_get_optuna_db():
@@ -18,8 +29,89 @@ def test_get_optuna_db():
 
 
 def test_get_optuna_db_twice():
+    """Repeated calls return the same instance."""
     db_a = get_optuna_db()
     db_b = get_optuna_db()
+    assert db_a is db_b
+
+
+def test_get_optuna_db_threads():
+    """Concurrent first calls build a single instance."""
+    results = []
+
+    def worker():
+        results.append(get_optuna_db())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(db) for db in results}) == 1
+
+
+def test_named_db_shares_matching_settings():
+    """A named database with the default settings shares its instance."""
+    register_optuna_db("alias", **db_instance._default_settings())
+    assert get_optuna_db("alias") is get_optuna_db()
+
+
+def test_separate_inmemory_dbs():
+    """Names registered with different in-memory backends do not share."""
+    register_optuna_db("first", backend=InMemoryBackend())
+    register_optuna_db("second", backend=InMemoryBackend())
+    assert get_optuna_db("first") is not get_optuna_db("second")
+
+
+def test_unhashable_settings():
+    """Settings holding dicts are shared by value."""
+    backend = RDBUrlBackend(
+        url="sqlite://",
+        engine_kwargs={"connect_args": {"check_same_thread": False}},
+    )
+    assert hash(backend) == hash(
+        RDBUrlBackend(
+            url="sqlite://",
+            engine_kwargs={"connect_args": {"check_same_thread": False}},
+        )
+    )
+    register_optuna_db("first", backend=backend)
+    register_optuna_db("second", backend=backend)
+    assert get_optuna_db("first") is get_optuna_db("second")
+
+
+def test_settings_override_registration():
+    """Extra settings select another shared instance, not stored by name."""
+    register_optuna_db("memory", backend=InMemoryBackend())
+    instrumented = get_optuna_db("memory", instrument=True)
+    assert instrumented is not get_optuna_db("memory")
+    assert instrumented is get_optuna_db("memory", instrument=True)
+    assert instrumented._instrument
+
+
+def test_unregistered_name():
+    """Unregistered names raise KeyError."""
+    with pytest.raises(KeyError):
+        get_optuna_db("not_registered")
+
+
+def test_conflicting_registration():
+    """Re-registering a name with other settings is rejected."""
+    register_optuna_db("other", username="a")
+    with pytest.raises(ValueError):
+        register_optuna_db("other", username="b")
+
+
+def test_reset_after_fork():
+    """Forked children rebuild their storage instead of reusing the parent's."""
+    db = get_optuna_db()
+    parent_storage = db.storage
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if db.storage is not parent_storage else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
 
 
 def test_get_optuna_db_failure():
@@ -34,14 +126,12 @@ def test_get_optuna_db_failure():
             side_effect=Exception("DB connection failed")
         )
 
-        # Ensure a fresh start
-        get_optuna_db.__globals__["OPTUNA_DB"] = None
-
         with pytest.raises(
             RuntimeError,
             match="Failed to initialize Optuna database: DB connection failed",
         ):
             get_optuna_db()  # Should raise RuntimeError
 
-        # Ensure OPTUNA_DB was reset to None after failure
-        assert get_optuna_db.__globals__["OPTUNA_DB"] is None
+        # Ensure nothing was registered after failure
+        assert not db_instance._DBS_BY_NAME
+        assert not db_instance._DBS_BY_SETTINGS
@@ -0,0 +1,118 @@
+import optuna
+import pytest
+from optuna.distributions import (
+    CategoricalDistribution,
+    FloatDistribution,
+    IntDistribution,
+)
+
+
+@pytest.fixture
+def export_db(optuna_db, mixed_objective):
+    """A database holding `export_study`, with one trial left RUNNING."""
+    study = optuna_db.get_study(study_name="export_study")
+    study.set_user_attr("owner", "test")
+    study.optimize(mixed_objective, n_trials=7)
+    study.ask()
+    return optuna_db
+
+
+def assert_same_trials(source: optuna.Study, target: optuna.Study):
+    source_trials = source.get_trials(deepcopy=False)
+    target_trials = target.get_trials(deepcopy=False)
+    assert len(target_trials) == len(source_trials)
+    for source_trial, target_trial in zip(source_trials, target_trials):
+        assert target_trial.number == source_trial.number
+        assert target_trial.params == source_trial.params
+        assert target_trial.values == source_trial.values
+        assert target_trial.user_attrs == source_trial.user_attrs
+        assert (
+            target_trial.intermediate_values
+            == source_trial.intermediate_values
+        )
+    assert target_trials[-1].state == optuna.trial.TrialState.FAIL
+
+
+@pytest.mark.parametrize("suffix", ["csv", "parquet"])
+def test_round_trip(export_db, tmp_path, suffix):
+    """An exported study is imported with the same trials."""
+    if suffix == "parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"export_study.{suffix}"
+
+    assert export_db.export_study("export_study", path, chunk_size=3) == 8
+    assert export_db.import_study(path, study_name="copy", batch_size=3) == 8
+
+    source = export_db.get_study(study_name="export_study")
+    target = export_db.get_study(study_name="copy")
+    assert target.user_attrs == {"owner": "test"}
+    assert_same_trials(source, target)
+    assert target.best_params == source.best_params
+
+
+@pytest.mark.parametrize("suffix", ["csv", "parquet"])
+def test_round_trip_per_trial_distributions(optuna_db, tmp_path, suffix):
+    """Each trial keeps its own distributions, and None choices survive."""
+    if suffix == "parquet":
+        pytest.importorskip("pyarrow")
+    study = optuna_db.get_study(study_name="changing_study")
+    for x, low, high, c in [(0.18, 0, 1, None), (75.0, 50, 100, "a")]:
+        study.add_trial(
+            optuna.trial.create_trial(
+                params={"x": x, "c": c},
+                distributions={
+                    "x": FloatDistribution(low, high),
+                    "c": CategoricalDistribution([None, "a"]),
+                },
+                value=x,
+            )
+        )
+    study.add_trial(
+        optuna.trial.create_trial(
+            params={"n": 3},
+            distributions={"n": IntDistribution(1, 5)},
+            value=0.0,
+        )
+    )
+    path = tmp_path / f"changing_study.{suffix}"
+
+    optuna_db.export_study("changing_study", path)
+    optuna_db.import_study(path, study_name="changing_copy")
+
+    source = optuna_db.get_study(study_name="changing_study").trials
+    target = optuna_db.get_study(study_name="changing_copy").trials
+    assert [t.params for t in target] == [t.params for t in source]
+    assert [t.distributions for t in target] == [
+        t.distributions for t in source
+    ]
+
+
+def test_csv_columns(export_db, tmp_path):
+    """Parameters and values are written as separate columns."""
+    path = tmp_path / "export_study.csv"
+    export_db.export_study("export_study", path)
+    header = path.read_text().splitlines()[0].split(",")
+    assert header[:5] == [
+        "number",
+        "state",
+        "datetime_start",
+        "datetime_complete",
+        "value",
+    ]
+    assert {"params_x", "params_n", "params_activation"} <= set(header)
+
+
+def test_export_studies(export_db, tmp_path):
+    """Every study is written to its own file."""
+    export_db.get_study(study_name="empty_study")
+    paths = export_db.export_studies(tmp_path / "out", file_format="csv")
+    assert [path.name for path in paths] == [
+        "export_study.csv",
+        "empty_study.csv",
+    ]
+
+
+def test_unsupported_format(export_db, tmp_path):
+    """Only CSV and Parquet files are supported."""
+    with pytest.raises(ValueError):
+        export_db.export_study("export_study", tmp_path / "study.xlsx")
@@ -0,0 +1,119 @@
+import os
+import threading
+from functools import partial
+
+import numpy as np
+import optuna
+import pytest
+import torch
+
+from docktuna import gpu_training
+from docktuna.gpu_training import (
+    SimpleNet,
+    StackedSimpleNet,
+    batch_objective,
+    make_pruner,
+    objective,
+    resolve_autocast_dtype,
+)
+from docktuna.gpu_tune import main
+
+
+def test_stacked_net_matches_simple_nets():
+    """Each slice of a StackedSimpleNet computes the same output as a SimpleNet."""
+    hidden_sizes = [8, 16]
+    stacked = StackedSimpleNet(10, hidden_sizes, 1)
+    X = torch.randn(5, 10)
+    stacked_output = stacked(X)
+
+    for index, hidden_size in enumerate(hidden_sizes):
+        net = SimpleNet(10, hidden_size, 1)
+        with torch.no_grad():
+            net.fc1.weight.copy_(stacked.w1[index, :, :hidden_size].T)
+            net.fc1.bias.copy_(stacked.b1[index, 0, :hidden_size])
+            net.fc2.weight.copy_(stacked.w2[index, :hidden_size, :].T)
+            net.fc2.bias.copy_(stacked.b2[index, 0, :])
+        assert torch.allclose(stacked_output[index], net(X), atol=1e-6)
+
+
+def test_minibatch_objective_reports_epochs():
+    """Mini-batch training reports one intermediate value per epoch."""
+    study = optuna.create_study(pruner=make_pruner("median", epochs=4))
+    study.optimize(
+        partial(objective, epochs=4, minibatch_size=128, report=True),
+        n_trials=2,
+    )
+    for trial in study.trials:
+        assert sorted(trial.intermediate_values) == [0, 1, 2, 3]
+
+
+def test_make_pruner_unknown():
+    """Unknown pruner names are rejected."""
+    with pytest.raises(ValueError):
+        make_pruner("not_a_pruner")
+
+
+def test_resolve_autocast_dtype_cpu():
+    """CPU autocast uses bf16 for any reduced precision."""
+    cpu = torch.device("cpu")
+    assert resolve_autocast_dtype("fp32", cpu) is None
+    assert resolve_autocast_dtype("bf16", cpu) == torch.bfloat16
+    assert resolve_autocast_dtype("fp16", cpu) == torch.bfloat16
+    with pytest.raises(ValueError):
+        resolve_autocast_dtype("fp8", cpu)
+
+
+def test_objective_records_timing():
+    """Mixed precision trials store their mode and timings as a user attribute."""
+    study = optuna.create_study()
+    study.optimize(
+        partial(objective, epochs=2, precision="bf16", num_threads=1),
+        n_trials=1,
+    )
+    timing = study.trials[0].user_attrs["timing"]
+    assert timing["precision"] in ("torch.bfloat16", "torch.float16")
+    assert timing["num_threads"] == 1
+    assert timing["train_seconds"] > 0
+
+
+def test_batch_objective_minibatches():
+    """Vectorized training honours the epoch count and mini-batch size."""
+    params = {
+        "hidden_size": np.array([8, 16]),
+        "optimizer": np.array(["Adam", "SGD"]),
+        "lr": np.array([1e-2, 1e-2]),
+    }
+    losses = batch_objective(params, epochs=2, minibatch_size=128)
+    assert losses.shape == (2,)
+    assert torch.isfinite(losses).all()
+
+
+def test_batch_size_rejects_unsupported_options():
+    """Options the vectorized path cannot honour are rejected."""
+    with pytest.raises(ValueError):
+        main(batch_size=2, pruner="median")
+    with pytest.raises(ValueError):
+        main(batch_size=2, precision="bf16")
+
+
+def test_dataset_configuration_is_built_once():
+    """Concurrent first calls share one dataset of the configured size."""
+    environ = dict(os.environ)
+    gpu_training.configure_dataset(n_samples=64)
+    try:
+        datasets = []
+        threads = [
+            threading.Thread(
+                target=lambda: datasets.append(gpu_training.get_dataset())
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(X.shape == (64, 10) for X, _ in datasets)
+        assert len({X.data_ptr() for X, _ in datasets}) == 1
+        assert dict(os.environ) == environ
+    finally:
+        gpu_training.configure_dataset()
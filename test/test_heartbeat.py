@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from optuna.trial import TrialState
+
+from docktuna.optuna_db.backends import (
+    InMemoryBackend,
+    JournalFileBackend,
+    SQLiteBackend,
+)
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+
+@pytest.fixture
+def heartbeat_db(tmp_path):
+    """A SQLite database with one-second heartbeats and one retry."""
+    with OptunaDatabase(
+        backend=SQLiteBackend(path=tmp_path / "optuna.db"),
+        heartbeat_interval=1,
+        grace_period=1,
+        max_retry=1,
+    ) as optuna_db:
+        yield optuna_db
+
+
+def test_heartbeat_settings_reach_storage(heartbeat_db):
+    """Heartbeat configuration is passed to the RDB storage."""
+    assert heartbeat_db.storage.get_heartbeat_interval() == 1
+    assert heartbeat_db.storage.get_failed_trial_callback() is not None
+
+
+def test_reap_stale_heartbeat(heartbeat_db):
+    """Trials whose heartbeat stopped are failed and retried."""
+    study = heartbeat_db.get_study(study_name="stale_study")
+    trial = study.ask()
+    trial.suggest_float("x", -10, 10)
+    heartbeat_db.storage.record_heartbeat(trial._trial_id)
+    time.sleep(2.5)
+
+    assert heartbeat_db.reap_stale_trials() == {"stale_study": [trial.number]}
+    states = [t.state for t in study.get_trials(deepcopy=False)]
+    assert states == [TrialState.FAIL, TrialState.WAITING]
+    retried = study.get_trials(deepcopy=False)[1]
+    assert retried.params == {"x": trial.params["x"]}
+    assert heartbeat_db.reap_stale_trials() == {}
+
+
+def test_reap_without_heartbeat(heartbeat_db):
+    """Trials without heartbeats are only reaped after max_runtime."""
+    study = heartbeat_db.get_study(study_name="silent_study")
+    trial = study.ask()
+
+    assert heartbeat_db.reap_stale_trials(max_runtime=3600) == {}
+    assert heartbeat_db.reap_stale_trials(max_runtime=0) == {
+        "silent_study": [trial.number]
+    }
+
+
+def test_reap_requires_stale_criterion(sqlite_db):
+    """Reaping without heartbeats or max_runtime is rejected."""
+    with pytest.raises(ValueError):
+        sqlite_db.reap_stale_trials()
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [InMemoryBackend(), JournalFileBackend(path="unused.log")],
+    ids=["inmemory", "journal"],
+)
+def test_heartbeat_requires_rdb(backend):
+    """Heartbeats are rejected for storages that cannot record them."""
+    with pytest.raises(ValueError):
+        OptunaDatabase(backend=backend, heartbeat_interval=1)
+    with pytest.raises(ValueError):
+        backend.create_storage(heartbeat_interval=1)
@@ -0,0 +1,53 @@
+import optuna
+import pytest
+from optuna.storages import RDBStorage
+
+from docktuna.optuna_db.instrumentation import (
+    PERF_ATTR,
+    InstrumentedObjective,
+    TimedSampler,
+    reset_thread_counters,
+    track_queries,
+)
+from docktuna.simple_tune import objective
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """A SQLite-backed storage with query tracking enabled."""
+    storage = RDBStorage(url=f"sqlite:///{tmp_path / 'perf.db'}")
+    track_queries(storage.engine)
+    reset_thread_counters()
+    return storage
+
+
+def test_perf_attr_recorded(storage):
+    """Each instrumented trial stores its performance metrics."""
+    study = optuna.create_study(storage=storage)
+    study.optimize(InstrumentedObjective(objective), n_trials=3)
+
+    for trial in study.trials:
+        perf = trial.user_attrs[PERF_ATTR]
+        assert perf["db_queries"] > 0
+        assert perf["db_seconds"] >= 0
+        assert perf["sampler_seconds"] >= 0
+        assert perf["objective_seconds"] >= 0
+        assert perf["peak_rss_mb"] > 0
+
+
+def test_sampler_is_wrapped_once(storage):
+    """The study's sampler is wrapped with a TimedSampler on first use."""
+    study = optuna.create_study(storage=storage)
+    instrumented = InstrumentedObjective(objective)
+    study.optimize(instrumented, n_trials=2)
+    assert isinstance(study.sampler, TimedSampler)
+    assert not isinstance(study.sampler._sampler, TimedSampler)
+
+
+def test_track_queries_is_idempotent(storage):
+    """Tracking an engine twice does not double count statements."""
+    track_queries(storage.engine)
+    reset_thread_counters()
+    with storage.engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+    assert reset_thread_counters()["db_queries"] == 1
@@ -0,0 +1,39 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from docktuna.metrics_server import MetricsServer, render_metrics
+
+
+@pytest.fixture
+def metrics_db(sqlite_db, objective):
+    """A database with one study that has finished trials."""
+    sqlite_db.get_study(study_name="metrics_study").optimize(
+        objective, n_trials=2
+    )
+    return sqlite_db
+
+
+def test_render_metrics(metrics_db):
+    """Trial counts, throughput, pool usage and latencies are rendered."""
+    text = render_metrics(metrics_db)
+    assert 'optuna_trials{study="metrics_study",state="COMPLETE"}' in text
+    assert 'optuna_trials_per_second{study="metrics_study"}' in text
+    assert "docktuna_db_pool_connections" in text
+    assert 'docktuna_db_query_seconds_bucket{le="+Inf"}' in text
+
+
+def test_metrics_endpoint(metrics_db):
+    """The server answers /metrics and rejects other paths."""
+    server = MetricsServer(optuna_db=metrics_db, host="127.0.0.1", port=0)
+    server.start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            assert response.status == 200
+            assert b"optuna_trials" in response.read()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other")
+    finally:
+        server.stop()
@@ -57,6 +57,35 @@ def test_storage_getter(optuna_db):
     assert storage is not None
 
 
+def test_storage_is_reused(optuna_db):
+    """Repeated storage access returns the same pooled storage."""
+    assert optuna_db.storage is optuna_db.storage
+
+
+def test_close_and_rebuild_storage(optuna_db):
+    """Closing releases the storage and the next access builds a new one."""
+    first_storage = optuna_db.storage
+    optuna_db.close()
+    second_storage = optuna_db.storage
+    assert second_storage is not first_storage
+    assert optuna_db.is_in_db(study_name="test_study")
+
+
+def test_reset_storage(optuna_db):
+    """Resetting the storage re-reads credentials and replaces the storage."""
+    first_storage = optuna_db.storage
+    new_storage = optuna_db.reset_storage()
+    assert new_storage is not first_storage
+    assert optuna_db.storage is new_storage
+
+
+def test_context_manager(optuna_db):
+    """Exiting the context manager closes the storage."""
+    with optuna_db as db:
+        _ = db.storage
+    assert optuna_db._storage is None
+
+
 def test_public_properties(optuna_db):
     """Username, db_name, and hostname are accessible."""
     assert optuna_db.username is not None
@@ -122,3 +151,92 @@ def test_no_study_summary(optuna_db):
     optuna_db.get_study(study_name="unused_study")
     best_params = optuna_db.get_best_params(study_name="unused_study")
     assert len(best_params) == 0
+
+
+def test_get_study_id(optuna_db):
+    """Study ids are found by name, and missing studies return None."""
+    assert isinstance(optuna_db.get_study_id(study_name="test_study"), int)
+    assert optuna_db.get_study_id(study_name="not_a_study") is None
+
+
+def test_is_not_in_db(optuna_db):
+    """A study that was never created is not in the database."""
+    assert not optuna_db.is_in_db(study_name="not_a_study")
+
+
+def test_get_study_summary(optuna_db):
+    """Single-study summary matches the study's trials."""
+    summary = optuna_db.get_study_summary(study_name="test_study")
+    study = optuna_db.get_study(study_name="test_study")
+    assert summary.study_name == "test_study"
+    assert summary.n_trials == len(study.trials)
+    assert summary.best_trial.number == study.best_trial.number
+
+
+def test_get_study_summary_missing(optuna_db):
+    """Requesting the summary of a missing study raises StopIteration."""
+    with pytest.raises(StopIteration):
+        optuna_db.get_study_summary(study_name="not_a_study")
+
+
+def test_list_study_names(optuna_db):
+    """Study names include the test study and match the study count."""
+    study_names = optuna_db.list_study_names()
+    assert "test_study" in study_names
+    assert len(study_names) == optuna_db.count_studies()
+
+
+def test_iter_studies(optuna_db):
+    """Lazily iterated studies match the listed study names."""
+    study_names = [study.study_name for study in optuna_db.iter_studies()]
+    assert study_names == optuna_db.list_study_names()
+
+
+def test_get_last_update_time_from_id(optuna_db):
+    """Aggregate last update time matches the trial-based computation."""
+    my_study = optuna_db.get_study(study_name="test_study")
+    study_id = optuna_db.get_study_id(study_name="test_study")
+    assert optuna_db.get_last_update_time_from_id(
+        study_id=study_id
+    ) == OptunaDatabase.get_last_update_time(study=my_study)
+
+
+def test_cached_lookups(optuna_db):
+    """Cached lookups are served from memory until the study changes."""
+    cached_db = OptunaDatabase(
+        username=optuna_db.username,
+        db_password_secret="optuna_db_user_password",
+        db_name=optuna_db.db_name,
+        hostname=optuna_db.hostname,
+        cache_ttl=60,
+    )
+    cached_db.get_best_params(study_name="test_study")
+    cached_db.get_best_params(study_name="test_study")
+    assert cached_db.is_in_db(study_name="test_study")
+    assert cached_db.cache_stats["hits"] == 1
+
+    study = cached_db.get_study(study_name="test_study")
+    study.optimize(
+        func=simple_objective,
+        n_trials=1,
+        callbacks=[cached_db.cache_invalidation_callback],
+    )
+    cached_db.get_best_params(study_name="test_study")
+    assert cached_db.cache_stats["misses"] == 3
+    cached_db.close()
+
+
+def test_cache_disabled_by_default(optuna_db):
+    """Caching is opt-in."""
+    assert optuna_db.cache_stats is None
+
+
+def test_get_performance_report(optuna_db):
+    """Instrumented trials are aggregated into a performance report."""
+    from docktuna.optuna_db.instrumentation import InstrumentedObjective
+
+    study = optuna_db.get_study(study_name="perf_study")
+    study.optimize(InstrumentedObjective(simple_objective), n_trials=2)
+    report = optuna_db.get_performance_report(study_name="perf_study")
+    assert report["objective_seconds"]["count"] >= 2
+    assert optuna_db.get_performance_report(study_name="test_study") == {}
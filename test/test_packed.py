@@ -0,0 +1,92 @@
+import threading
+import time
+from functools import partial
+
+import optuna
+import pytest
+import torch
+
+from docktuna import gpu_training
+from docktuna.gpu_tune import main
+from docktuna.packed import StreamObjective, run_packed, threads_per_trial
+
+
+@pytest.fixture(autouse=True)
+def restore_process_settings():
+    """Restores torch's thread count and the training dataset."""
+    num_threads = torch.get_num_threads()
+    yield
+    torch.set_num_threads(num_threads)
+    gpu_training.configure_dataset()
+
+
+def test_threads_per_trial():
+    """CPU threads are split evenly, with at least one per trial."""
+    assert threads_per_trial(4, total=16) == 4
+    assert threads_per_trial(3, total=16) == 5
+    assert threads_per_trial(32, total=16) == 1
+
+
+def test_trials_run_concurrently():
+    """Up to `concurrency` trials are evaluated at the same time, and the
+    thread count is restored afterwards."""
+    torch.set_num_threads(2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def objective(trial: optuna.Trial) -> float:
+        with lock:
+            running.append(trial.number)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(trial.number)
+        return trial.suggest_float("x", -10, 10) ** 2
+
+    study = optuna.create_study()
+    run_packed(study, objective, n_trials=8, concurrency=4, num_threads=1)
+    assert len(study.trials) == 8
+    assert max(peak) == 4
+    assert torch.get_num_threads() == 2
+
+
+def test_packed_gpu_objective():
+    """The training objective runs concurrently on one shared dataset."""
+    gpu_training.configure_dataset(n_samples=256)
+    study = optuna.create_study()
+    run_packed(
+        study,
+        partial(gpu_training.objective, epochs=2, minibatch_size=64),
+        n_trials=4,
+        concurrency=2,
+        device=gpu_training.get_device(),
+        prepare=gpu_training.get_dataset,
+    )
+    assert all(
+        trial.state == optuna.trial.TrialState.COMPLETE
+        for trial in study.trials
+    )
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA")
+def test_stream_objective_uses_thread_streams():
+    """Each thread runs its trials on its own CUDA stream."""
+    device = torch.device("cuda")
+    streams = []
+    objective = StreamObjective(
+        lambda trial: streams.append(torch.cuda.current_stream()) or 0.0,
+        device,
+    )
+    study = optuna.create_study()
+    study.optimize(objective, n_trials=4, n_jobs=2)
+    assert len(set(streams)) == 2
+    assert torch.cuda.default_stream(device) not in streams
+
+
+def test_concurrency_rejects_other_modes():
+    """Packing is not combined with worker processes or compiled models."""
+    with pytest.raises(ValueError):
+        main(concurrency=2, workers=2)
+    with pytest.raises(ValueError):
+        main(concurrency=2, compile_model=True)
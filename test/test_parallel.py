@@ -0,0 +1,46 @@
+import pytest
+
+from docktuna.parallel import run_parallel
+from docktuna.simple_tune import get_study, objective
+
+
+def test_run_parallel():
+    """Workers share the trial budget of a single study."""
+    study = get_study(study_name="parallel_test_study")
+    n_trials_before = len(study.trials)
+
+    result = run_parallel(
+        study_name="parallel_test_study",
+        objective=objective,
+        n_trials=4,
+        n_workers=2,
+        seed=0,
+    )
+
+    assert result["n_trials"] == 4
+    assert len(study.trials) == n_trials_before + 4
+
+
+def test_run_parallel_requires_stop_condition():
+    """A trial budget or timeout is required."""
+    with pytest.raises(ValueError):
+        run_parallel(study_name="parallel_test_study", objective=objective)
+
+
+def test_run_parallel_write_behind(tmp_path):
+    """Trials recorded in worker journals (in a new directory) reach the
+    shared study."""
+    study = get_study(study_name="parallel_journal_study")
+    n_trials_before = len(study.trials)
+
+    result = run_parallel(
+        study_name="parallel_journal_study",
+        objective=objective,
+        n_trials=4,
+        n_workers=2,
+        journal_dir=str(tmp_path / "journals"),
+    )
+
+    assert result["n_trials"] == 4
+    assert len(study.trials) == n_trials_before + 4
+    assert (tmp_path / "journals").is_dir()
@@ -0,0 +1,83 @@
+import pytest
+import sqlalchemy
+
+from docktuna.optuna_db import schema_tuning
+from docktuna.optuna_db.backends import InMemoryBackend
+from docktuna.optuna_db.optuna_db import OptunaDatabase
+
+
+@pytest.fixture
+def tuned_db(sqlite_db, objective):
+    """A SQLite database holding `tuned_study` with five trials."""
+    sqlite_db.get_study(study_name="tuned_study").optimize(
+        objective, n_trials=5
+    )
+    return sqlite_db
+
+
+def test_apply_and_rollback(tuned_db):
+    """Indexes are created idempotently and removed again."""
+    report = schema_tuning.inspect_schema(tuned_db)
+    assert report["dialect"] == "sqlite"
+    assert not any(report["docktuna_indexes"].values())
+    assert report["row_counts"]["trials"] == 5
+
+    schema_tuning.apply_tuning(tuned_db)
+    schema_tuning.apply_tuning(tuned_db)
+    report = schema_tuning.inspect_schema(tuned_db)
+    assert all(report["docktuna_indexes"].values())
+    assert "ix_docktuna_trial_values_trial_objective" not in (
+        report["docktuna_indexes"]
+    )
+
+    schema_tuning.rollback_tuning(tuned_db)
+    report = schema_tuning.inspect_schema(tuned_db)
+    assert not any(report["docktuna_indexes"].values())
+    assert tuned_db.get_best_params(study_name="tuned_study")
+
+
+def test_postgres_statements():
+    """PostgreSQL builds indexes concurrently and tunes autovacuum."""
+    engine = sqlalchemy.create_mock_engine("postgresql://", executor=None)
+    statements = schema_tuning.tuning_statements(engine)
+    assert (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+        "ix_docktuna_trial_values_trial_objective ON trial_values "
+        "(trial_id, objective) INCLUDE (value, value_type)"
+    ) in statements
+    assert any(
+        statement.startswith("ALTER TABLE trial_heartbeats SET")
+        for statement in statements
+    )
+    assert not any(
+        "ALTER TABLE" in statement
+        for statement in schema_tuning.tuning_statements(
+            engine, autovacuum=False
+        )
+    )
+    rollback = schema_tuning.rollback_statements(engine)
+    assert len(rollback) == len(schema_tuning.INDEXES) + len(
+        schema_tuning.AUTOVACUUM
+    )
+
+
+def test_main_reports_timings(tuned_db):
+    """Apply reports before/after timings of the main operations."""
+    result = schema_tuning.main("apply", repeats=1, optuna_db=tuned_db)
+    assert {
+        "count_trials_by_state",
+        "get_best_params",
+        "get_trials_since",
+        "param_values_by_name",
+    } <= set(result["timings"])
+    for timing in result["timings"].values():
+        assert timing["before"] > 0 and timing["after"] > 0
+
+    with pytest.raises(ValueError):
+        schema_tuning.main("vacuum", optuna_db=tuned_db)
+
+
+def test_requires_rdb_storage():
+    """Journal and in-memory storages have no schema to tune."""
+    with pytest.raises(ValueError):
+        schema_tuning.inspect_schema(OptunaDatabase(backend=InMemoryBackend()))
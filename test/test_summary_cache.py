@@ -0,0 +1,84 @@
+import pytest
+
+from docktuna.optuna_db.summary_cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic expiry checks."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_hit_and_miss_counters(clock):
+    """Second lookup of a key is served from the cache."""
+    cache = TTLCache(ttl=10, clock=clock)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("a", lambda: 2) == 1
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_entries_expire(clock):
+    """Entries are recomputed once their time-to-live has passed."""
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.get_or_compute("a", lambda: 1)
+    clock.now = 11
+    assert cache.get_or_compute("a", lambda: 2) == 2
+
+
+def test_lru_eviction(clock):
+    """The least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(ttl=10, max_entries=2, clock=clock)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+    assert len(cache) == 2
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+
+
+def test_invalidate_and_clear(clock):
+    """Invalidated and cleared entries are recomputed."""
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.invalidate("a")
+    assert cache.get_or_compute("a", lambda: 3) == 3
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalidate_during_compute(clock):
+    """A value computed across an invalidation is not stored."""
+    cache = TTLCache(ttl=10, clock=clock)
+
+    def stale_compute():
+        cache.invalidate("a")
+        return "stale"
+
+    def cleared_compute():
+        cache.clear()
+        return "stale"
+
+    assert cache.get_or_compute("a", stale_compute) == "stale"
+    assert cache.get_or_compute("a", lambda: "fresh") == "fresh"
+    cache.invalidate("b")
+    assert cache.get_or_compute("b", cleared_compute) == "stale"
+    assert cache.get_or_compute("b", lambda: "fresh") == "fresh"
+    assert cache.get_or_compute("a", lambda: "other") == "other"
+
+
+def test_bad_settings():
+    """Non-positive ttl or capacity is rejected."""
+    with pytest.raises(ValueError):
+        TTLCache(ttl=0)
+    with pytest.raises(ValueError):
+        TTLCache(ttl=1, max_entries=0)
@@ -1,22 +1,223 @@
+import importlib
+import os
 import subprocess
+import uuid
+
 import pytest
 
+
 @pytest.mark.parametrize("script", ["simple_tune.py", "gpu_tune.py"])
 def test_tuning_scripts(script):
     """Runs tuning scripts and checks for successful execution."""
     result = subprocess.run(
-        ["poetry", "run", "python", f"src/docktuna/{script}", "--n_trials", "1"],
+        [
+            "poetry",
+            "run",
+            "python",
+            f"src/docktuna/{script}",
+            "--n_trials",
+            "1",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert (
+        result.returncode == 0
+    ), f"{script} failed with error:\n{result.stderr}"
+
+
+@pytest.mark.parametrize("script", ["simple_tune.py", "gpu_tune.py"])
+def test_tuning_scripts_workers(script):
+    """Runs tuning scripts with multiple worker processes."""
+    result = subprocess.run(
+        [
+            "poetry",
+            "run",
+            "python",
+            f"src/docktuna/{script}",
+            "--n_trials",
+            "2",
+            "--workers",
+            "2",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert (
+        result.returncode == 0
+    ), f"{script} failed with error:\n{result.stderr}"
+
+
+@pytest.mark.parametrize("script", ["simple_tune.py", "gpu_tune.py"])
+def test_tuning_scripts_batched(script):
+    """Runs tuning scripts with vectorized batch objectives."""
+    result = subprocess.run(
+        [
+            "poetry",
+            "run",
+            "python",
+            f"src/docktuna/{script}",
+            "--n_trials",
+            "4",
+            "--batch_size",
+            "2",
+        ],
         capture_output=True,
         text=True,
     )
-    assert result.returncode == 0, f"{script} failed with error:\n{result.stderr}"
+    assert (
+        result.returncode == 0
+    ), f"{script} failed with error:\n{result.stderr}"
+
+
+@pytest.mark.parametrize("script", ["simple_tune.py", "gpu_tune.py"])
+def test_tuning_scripts_warm_start(script):
+    """Runs tuning scripts warm-started from the script's default study."""
+    source = "simple_study" if script == "simple_tune.py" else "gpu_study"
+    result = subprocess.run(
+        [
+            "poetry",
+            "run",
+            "python",
+            f"src/docktuna/{script}",
+            "--study_name",
+            f"warm_{source}_{uuid.uuid4().hex}",
+            "--n_trials",
+            "2",
+            "--warm_start_from",
+            source,
+            "--warm_start_k",
+            "1",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert (
+        result.returncode == 0
+    ), f"{script} failed with error:\n{result.stderr}"
+
 
 def test_import_simple_tune():
     """Ensure simple_tune.py can be imported without running as a script."""
-    import docktuna.simple_tune  
+    import docktuna.simple_tune
 
 
 def test_import_gpu_tune():
     """Ensure gpu_tune.py can be imported without running as a script."""
     import docktuna.gpu_tune
 
+
+def test_gpu_tune_help_skips_heavy_imports():
+    """Importing gpu_tune and printing --help does not import torch or optuna."""
+    code = (
+        "import sys, docktuna.gpu_tune as g; g.build_parser().format_help(); "
+        "assert 'torch' not in sys.modules and 'optuna' not in sys.modules"
+    )
+    result = subprocess.run(
+        ["poetry", "run", "python", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_gpu_tune_forwards_training_names():
+    """Training names remain available from gpu_tune."""
+    import docktuna.gpu_training
+    import docktuna.gpu_tune
+
+    assert docktuna.gpu_tune.SimpleNet is docktuna.gpu_training.SimpleNet
+
+
+@pytest.mark.parametrize("script", ["simple_tune", "gpu_tune"])
+def test_batch_size_rejects_workers_and_timeout(script):
+    """Batched runs do not silently drop --workers or --timeout."""
+    module = importlib.import_module(f"docktuna.{script}")
+    with pytest.raises(ValueError):
+        module.main(batch_size=2, workers=2)
+    with pytest.raises(ValueError):
+        module.main(batch_size=2, timeout=10)
+
+
+def test_simple_tune_journal_dir_requires_workers(tmp_path):
+    """--journal_dir is rejected where no worker journals are used."""
+    from docktuna.simple_tune import main
+
+    with pytest.raises(ValueError):
+        main(journal_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        main(journal_dir=str(tmp_path), batch_size=2)
+
+
+def test_simple_tune_batch_size_rejects_instrument():
+    """Batched runs cannot be instrumented, as in gpu_tune."""
+    from docktuna.simple_tune import main
+
+    with pytest.raises(ValueError):
+        main(batch_size=2, instrument=True)
+
+
+def test_main_keeps_environment(monkeypatch):
+    """Database settings of a run are not left in the environment."""
+    from docktuna.optuna_db.backends import BACKEND_ENV
+    from docktuna.optuna_db.db_instance import get_optuna_db, reset_optuna_dbs
+    from docktuna.simple_tune import main
+
+    monkeypatch.setenv(BACKEND_ENV, "sqlite")
+    environ = dict(os.environ)
+    reset_optuna_dbs()
+    try:
+        main(study_name="env_study", n_trials=1, instrument=True)
+        assert dict(os.environ) == environ
+        assert not get_optuna_db()._instrument
+        assert get_optuna_db(instrument=True)._instrument
+    finally:
+        reset_optuna_dbs()
+
+
+def test_gpu_tune_reap_stale_requires_criterion(monkeypatch):
+    """--reap_stale needs heartbeats or --max_runtime."""
+    from docktuna.gpu_tune import build_parser, main
+    from docktuna.optuna_db.backends import BACKEND_ENV
+    from docktuna.optuna_db.db_instance import reset_optuna_dbs
+
+    args = build_parser().parse_args(["--reap_stale", "--max_runtime", "60"])
+    assert args.max_runtime == 60
+
+    monkeypatch.setenv(BACKEND_ENV, "sqlite")
+    reset_optuna_dbs()
+    try:
+        with pytest.raises(ValueError):
+            main(study_name="reap_study", n_trials=1, reap_stale=True)
+        main(
+            study_name="reap_study",
+            n_trials=1,
+            epochs=1,
+            reap_stale=True,
+            max_runtime=3600,
+        )
+    finally:
+        reset_optuna_dbs()
+
+
+def test_simple_tune_seed(monkeypatch):
+    """Runs with the same seed sample the same parameters."""
+    from docktuna.optuna_db.backends import BACKEND_ENV
+    from docktuna.optuna_db.db_instance import get_optuna_db, reset_optuna_dbs
+    from docktuna.simple_tune import main
+
+    monkeypatch.setenv(BACKEND_ENV, "sqlite")
+    reset_optuna_dbs()
+    try:
+        for study_name in ("seeded_a", "seeded_b"):
+            main(study_name=study_name, n_trials=3, seed=7)
+        optuna_db = get_optuna_db()
+        assert [
+            trial.params
+            for trial in optuna_db.get_study(study_name="seeded_a").trials
+        ] == [
+            trial.params
+            for trial in optuna_db.get_study(study_name="seeded_b").trials
+        ]
+    finally:
+        reset_optuna_dbs()
@@ -0,0 +1,135 @@
+import optuna
+import pytest
+from optuna.distributions import (
+    CategoricalDistribution,
+    FloatDistribution,
+    IntDistribution,
+)
+from optuna.trial import TrialState
+
+from docktuna.batched import BatchedRunner
+from docktuna.warm_start import SOURCE_ATTR, map_params, warm_start
+
+SEARCH_SPACE = {
+    "x": FloatDistribution(-10, 10),
+    "n": IntDistribution(1, 5),
+    "activation": CategoricalDistribution(["relu", "tanh"]),
+}
+
+
+@pytest.fixture
+def source_db(optuna_db, mixed_objective):
+    """A database holding a `source` study of 20 trials."""
+    optuna_db.get_study(study_name="source").optimize(
+        mixed_objective, n_trials=20
+    )
+    return optuna_db
+
+
+def test_get_top_trials(source_db, mixed_objective):
+    """Top trials are ranked in the study's direction."""
+    study_id = source_db.get_study_id(study_name="source")
+    source_db.storage.create_new_trial(
+        study_id,
+        template_trial=optuna.trial.create_trial(
+            params={"x": 2.0},
+            distributions={"x": SEARCH_SPACE["x"]},
+            value=float("-inf"),
+        ),
+    )
+    expected = sorted(
+        source_db.storage.get_all_trials(
+            study_id, states=(TrialState.COMPLETE,)
+        ),
+        key=lambda trial: trial.value,
+    )[:5]
+
+    top = source_db.get_top_trials(study_name="source", k=5)
+    assert [trial.number for trial in top] == [t.number for t in expected]
+    assert top[0].value == float("-inf")
+    assert top[1].params == expected[1].params
+
+    maximized = optuna.create_study(
+        study_name="maximized",
+        storage=source_db.storage,
+        direction="maximize",
+    )
+    maximized.optimize(mixed_objective, n_trials=5)
+    assert source_db.get_top_trials(study_name="maximized", k=1)[0] == (
+        maximized.best_trial
+    )
+
+
+def test_get_top_trials_multi_objective(optuna_db):
+    """Top trials are undefined with several objectives."""
+    optuna.create_study(
+        study_name="multi",
+        storage=optuna_db.storage,
+        directions=["minimize", "minimize"],
+    )
+    with pytest.raises(ValueError):
+        optuna_db.get_top_trials(study_name="multi", k=1)
+
+
+def test_map_params():
+    """Only values inside a compatible target distribution are kept."""
+    trial = optuna.trial.create_trial(
+        params={"x": 8.0, "n": 4, "activation": "tanh", "extra": 1},
+        distributions={**SEARCH_SPACE, "extra": IntDistribution(0, 1)},
+        value=0.0,
+    )
+    assert map_params(trial, None) == trial.params
+    assert map_params(
+        trial,
+        {
+            "x": FloatDistribution(0, 5),
+            "n": IntDistribution(0, 8, step=2),
+            "activation": CategoricalDistribution(["tanh", "gelu"]),
+            "extra": CategoricalDistribution([0, 1]),
+            "missing": FloatDistribution(0, 1),
+        },
+    ) == {"n": 4, "activation": "tanh"}
+
+
+def test_warm_start(source_db, mixed_objective):
+    """The best source trials are enqueued once and evaluated first."""
+    target = source_db.get_study(study_name="target")
+    enqueued = warm_start(
+        source_db, target, ["source"], k=3, search_space=SEARCH_SPACE
+    )
+    best = source_db.get_top_trials(study_name="source", k=3)
+    assert enqueued == [trial.params for trial in best]
+    assert warm_start(source_db, target, ["source"], k=3) == []
+
+    target.optimize(mixed_objective, n_trials=3)
+    trials = target.get_trials()
+    assert [trial.params for trial in trials] == enqueued
+    assert trials[0].user_attrs[SOURCE_ATTR] == f"source:{best[0].number}"
+    assert target.best_value == best[0].value
+
+
+def test_warm_start_batched(source_db, mixed_objective):
+    """Batched runs take warm-start trials from the shadow study."""
+    target = source_db.get_study(study_name="batched_target")
+    runner = BatchedRunner(study=target, batch_size=2)
+    enqueued = warm_start(
+        source_db,
+        target,
+        ["source"],
+        k=2,
+        search_space=SEARCH_SPACE,
+        queue=runner.shadow_study,
+    )
+    assert (
+        warm_start(
+            source_db,
+            target,
+            ["source"],
+            k=2,
+            search_space=SEARCH_SPACE,
+            queue=runner.shadow_study,
+        )
+        == []
+    )
+    runner.optimize(mixed_objective, n_trials=2)
+    assert [trial.params for trial in target.get_trials()] == enqueued
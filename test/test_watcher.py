@@ -0,0 +1,93 @@
+import datetime
+import time
+
+import pytest
+from optuna.trial import TrialState
+
+from docktuna.optuna_db.watcher import StudyWatcher
+
+
+def test_get_trials_since(optuna_db, objective):
+    """Only trials after the cursor or finished since are returned."""
+    study = optuna_db.get_study(study_name="delta_study")
+    study.optimize(objective, n_trials=3)
+    running = study.ask()
+    trials = study.get_trials(deepcopy=False)
+    cursor = trials[-1]._trial_id
+
+    assert optuna_db.get_trials_since("delta_study", cursor) == []
+    assert [
+        trial.number for trial in optuna_db.get_trials_since("delta_study", -1)
+    ] == [0, 1, 2, 3]
+
+    study.tell(running, 1.0)
+    study.optimize(objective, n_trials=1)
+    assert [
+        trial.number
+        for trial in optuna_db.get_trials_since(
+            "delta_study", cursor, trial_ids=[running._trial_id]
+        )
+    ] == [3, 4]
+
+    finished_since = study.trials[3].datetime_complete
+    assert [
+        trial.number
+        for trial in optuna_db.get_trials_since(
+            "delta_study", cursor, finished_since=finished_since
+        )
+    ] == [3, 4]
+
+
+def test_get_trials_since_missing_study(optuna_db):
+    """Missing studies raise StopIteration like the other lookups."""
+    with pytest.raises(StopIteration):
+        optuna_db.get_trials_since("missing")
+
+
+def test_watcher_follows_study(optuna_db, objective):
+    """The view matches the study after each poll."""
+    study = optuna_db.get_study(study_name="watched_study")
+    study.optimize(objective, n_trials=3)
+    watcher = StudyWatcher(optuna_db, "watched_study")
+
+    assert len(watcher.poll()) == 3
+    assert watcher.poll() == []
+
+    running = study.ask()
+    assert [trial.state for trial in watcher.poll()] == [TrialState.RUNNING]
+    assert watcher.state_counts == {"COMPLETE": 3, "RUNNING": 1}
+
+    study.tell(running, -1.0)
+    study.optimize(objective, n_trials=2)
+    assert [trial.number for trial in watcher.poll()] == [3, 4, 5]
+    assert watcher.state_counts == {"COMPLETE": 6}
+    assert watcher.trials == study.get_trials()
+    assert watcher.best_trial.number == 3
+    assert watcher.last_update_time == max(
+        trial.datetime_complete for trial in study.trials
+    )
+
+
+def test_watcher_waits_for_number_gaps(optuna_db, objective):
+    """A trial seen before a lower-numbered one keeps the cursor back."""
+    study = optuna_db.get_study(study_name="gap_study")
+    study.optimize(objective, n_trials=2)
+    first, second = study.get_trials()
+    watcher = StudyWatcher(optuna_db, "gap_study")
+    watcher._merge(second)
+
+    assert watcher._cursor == -1
+    assert [trial.number for trial in watcher.poll()] == [0]
+    assert watcher._cursor == second._trial_id
+
+
+def test_watcher_background_polling(optuna_db, objective):
+    """The background thread picks up new trials."""
+    study = optuna_db.get_study(study_name="polled_study")
+    with StudyWatcher(optuna_db, "polled_study", poll_interval=0.05) as w:
+        study.optimize(objective, n_trials=2)
+        deadline = datetime.datetime.now() + datetime.timedelta(seconds=5)
+        while len(w.trials) < 2 and datetime.datetime.now() < deadline:
+            time.sleep(0.01)
+    assert len(w.trials) == 2
+    assert w.last_error is None
@@ -0,0 +1,74 @@
+from docktuna.optuna_db.write_behind import WriteBehindJournal
+
+
+def test_trials_reach_shared_study(optuna_db, tmp_path, objective):
+    """Stopping the journal copies every finished trial."""
+    with WriteBehindJournal(
+        optuna_db, "wb_study", tmp_path / "worker.log", sync_interval=60
+    ) as journal:
+        journal.study.optimize(objective, n_trials=5)
+        assert journal.check_consistency()["pending"] == 5
+
+    assert optuna_db.get_study_summary(study_name="wb_study").n_trials == 5
+    assert journal.check_consistency() == {
+        "local": 5,
+        "synced": 5,
+        "pending": 0,
+        "mismatched": [],
+    }
+
+
+def test_restart_does_not_duplicate(optuna_db, tmp_path, objective):
+    """A reopened journal only copies trials that were not copied yet."""
+    journal = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "w.log")
+    journal.study.optimize(objective, n_trials=3)
+    journal.sync()
+    journal.study.optimize(objective, n_trials=2)
+
+    # Simulate a crash: the pending trials are only in the journal
+    reopened = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "w.log")
+    assert reopened.sync()["pushed"] == 2
+    assert reopened.sync()["pushed"] == 0
+    assert optuna_db.get_study_summary(study_name="wb_study").n_trials == 5
+
+
+def test_pull_other_workers(optuna_db, tmp_path, objective):
+    """Trials of other workers are copied into the journal."""
+    first = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "a.log")
+    second = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "b.log")
+    first.study.optimize(objective, n_trials=3)
+    first.sync()
+
+    assert second.sync() == {"pushed": 0, "pulled": 3}
+    assert len(second.study.trials) == 3
+    assert second.check_consistency()["local"] == 0
+    assert optuna_db.get_study_summary(study_name="wb_study").n_trials == 3
+
+
+def test_pull_trial_finished_out_of_order(optuna_db, tmp_path, objective):
+    """A shared trial finishing after a later one is still pulled."""
+    journal = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "w.log")
+    shared = optuna_db.get_study(study_name="wb_study")
+    running = shared.ask()
+    shared.optimize(objective, n_trials=1)
+    assert journal.sync()["pulled"] == 1
+
+    shared.tell(running, 1.0)
+    assert journal.sync()["pulled"] == 1
+    assert len(journal.study.trials) == 2
+
+    reopened = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "w.log")
+    assert reopened.sync()["pulled"] == 0
+
+
+def test_moved_journal_keeps_its_id(optuna_db, tmp_path, objective):
+    """A journal reopened at another path does not copy trials again."""
+    journal = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "w.log")
+    journal.study.optimize(objective, n_trials=3)
+    assert journal.sync()["pushed"] == 3
+
+    (tmp_path / "w.log").rename(tmp_path / "moved.log")
+    moved = WriteBehindJournal(optuna_db, "wb_study", tmp_path / "moved.log")
+    assert moved._journal_id == journal._journal_id
+    assert moved.sync()["pushed"] == 0
+    assert optuna_db.get_study_summary(study_name="wb_study").n_trials == 3